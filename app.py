@@ -1,27 +1,56 @@
+import importlib
+import logging
 import os
+import time
+from datetime import timedelta
 from flask import Flask, request
 from flask_cors import CORS
-from extensions import db, bcrypt, jwt
-from routes.auth import auth_bp
-from routes.profile import profile_bp
-from routes.available import available_bp
-from routes.board import board_bp
-from routes.course import course_bp
-from routes.recruit import recruit_bp
-from routes.schedule import schedule_bp
-from routes.notification import notification_bp
+from extensions import db, bcrypt, jwt, password_hasher, rate_limiter, query_inspector, response_compressor
+from commands import register_commands
+from migrations import check_schema_version
+from db_config import configure_database
+from logging_config import configure_logging, log_metric_samples
+from services.identity import register_user_loader
+from services.json_provider import configure_json
+from services.token_revocation import revocation_store
+from services.metrics import metrics
+from services.cache import shared_cache
+from services.single_flight import single_flight
+from services.pagination import NEXT_CURSOR_HEADER
+from services.ttl_cache import cache_metric_samples
+
+logger = logging.getLogger(__name__)
+
+# 블루프린트 (모듈, 변수 이름) — create_app 안에서 import 해서 app 모듈 import 자체는 가볍게 유지
+BLUEPRINTS = (
+    ("routes.auth", "auth_bp"),
+    ("routes.profile", "profile_bp"),
+    ("routes.available", "available_bp"),
+    ("routes.board", "board_bp"),
+    ("routes.course", "course_bp"),
+    ("routes.recruit", "recruit_bp"),
+    ("routes.schedule", "schedule_bp"),
+    ("routes.notification", "notification_bp"),
+    ("routes.metrics", "metrics_bp"),
+)
 
 def create_app():
+    started = time.perf_counter()
     app = Flask(__name__)
 
+    # 로깅 (JSON 구조화 로그, 요청 ID) — 다른 초기화 로그도 같은 형식으로 남도록 가장 먼저
+    configure_logging(app)
+
     # 데이터베이스 설정
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     DB_PATH = os.path.join(BASE_DIR, "instance", "project.db")
-    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_PATH}"
+    configure_database(app, DB_PATH)
 
     # 기본 설정
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "super-secret-key")
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=1)
+    app.config["JWT_REFRESH_TOKEN_EXPIRES"] = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_DAYS", 14)))
 
     # JWT 설정 (헤더 및 쿠키)
     app.config["JWT_TOKEN_LOCATION"] = ["headers", "cookies"]
@@ -30,10 +59,27 @@ def create_app():
     app.config["JWT_COOKIE_SECURE"] = True
     app.config["JWT_COOKIE_SAMESITE"] = "None"
 
+    # JSON 직렬화 (orjson 이 있으면 사용)
+    configure_json(app)
+
     # 확장 기능 초기화
+    # after_request 는 등록의 역순으로 실행되므로 응답 압축을 먼저 등록해 마지막에 실행되게 한다
+    response_compressor.init_app(app)
     db.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
+    password_hasher.init_app(app)
+    register_user_loader(jwt)
+    revocation_store.init_app(app, jwt)
+    rate_limiter.init_app(app)
+    query_inspector.init_app(app)
+    shared_cache.init_app(app)
+    metrics.init_app(app)
+    metrics.register_collector(password_hasher.metric_samples)
+    metrics.register_collector(cache_metric_samples)
+    metrics.register_collector(log_metric_samples)
+    metrics.register_collector(shared_cache.metric_samples)
+    metrics.register_collector(single_flight.metric_samples)
 
     # CORS allowed_origins 확정
     allowed_origins = [
@@ -43,83 +89,50 @@ def create_app():
     ]
     
     # CORS 설정
-    CORS(app, resources={r"/*": {"origins": allowed_origins}}, supports_credentials=True)
-
-    # 🔥 블루프린트 등록 (prefix는 각 파일에서 설정)
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(profile_bp)
-    app.register_blueprint(available_bp)
-    app.register_blueprint(board_bp)
-    app.register_blueprint(course_bp)
-    app.register_blueprint(recruit_bp)
-    app.register_blueprint(schedule_bp)
-    app.register_blueprint(notification_bp)
+    # 브라우저 스크립트가 페이지네이션 커서 헤더를 읽을 수 있도록 노출
+    CORS(
+        app,
+        resources={r"/*": {"origins": allowed_origins}},
+        supports_credentials=True,
+        expose_headers=[NEXT_CURSOR_HEADER],
+    )
+
+    # 블루프린트 등록 (prefix는 각 파일에서 설정)
+    for module_name, attr in BLUEPRINTS:
+        app.register_blueprint(getattr(importlib.import_module(module_name), attr))
+
+    # flask CLI 관리 명령
+    register_commands(app)
 
+    # 스키마 변경은 'flask db-upgrade' 로 한 번만 실행하고, 부팅 시에는 버전만 확인
     with app.app_context():
-        from models import (
-            User,
-            Course,
-            Enrollment,
-            CourseBoardPost,
-            CourseBoardComment,
-            CourseBoardLike,
-            CourseBoardCommentLike,
-            TeamRecruitment,
-            TeamRecruitmentMember,
-            Schedule,
-            Notification,
-            Poll,
-            PollOption,
-            PollVote,
-            AvailableTime,
-            TeamAvailabilitySubmission,
-        )
-
-        db.create_all()
-        
-        # is_pinned 컬럼 마이그레이션 (기존 데이터베이스 호환성)
-        try:
-            import sqlite3
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            # 기존 컬럼 확인
-            cursor.execute("PRAGMA table_info(course_board_posts)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'is_pinned' not in columns:
-                print("🔄 is_pinned 컬럼을 추가하는 중...")
-                cursor.execute("ALTER TABLE course_board_posts ADD COLUMN is_pinned BOOLEAN DEFAULT 0")
-                conn.commit()
-                print("✅ is_pinned 컬럼이 추가되었습니다!")
-            
-            # available_times 테이블에 team_id 컬럼 추가 마이그레이션
-            cursor.execute("PRAGMA table_info(available_times)")
-            available_times_columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'team_id' not in available_times_columns:
-                print("🔄 available_times 테이블에 team_id 컬럼을 추가하는 중...")
-                cursor.execute("ALTER TABLE available_times ADD COLUMN team_id INTEGER")
-                # 외래 키 제약조건은 SQLite에서 ALTER TABLE로 직접 추가할 수 없으므로,
-                # 필요시 별도로 처리 (일단 컬럼만 추가)
-                conn.commit()
-                print("✅ team_id 컬럼이 추가되었습니다!")
-            
-            conn.close()
-        except Exception as e:
-            print(f"⚠️ 마이그레이션 확인 중 오류 (무시 가능): {e}")
-        
-        print("✅ Database initialized successfully!")
+        check_schema_version(db.engine)
 
     @app.route("/")
     def index():
         return {"message": "✅ Flask backend running!"}
 
+    logger.info("앱 생성 완료 (%.1f ms)", (time.perf_counter() - started) * 1000)
     return app
 
-# gunicorn이 app 변수를 읽을 수 있도록 모듈 레벨에서 생성
-app = create_app()
+
+_app = None
+
+
+def get_app():
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
+def __getattr__(name):
+    # gunicorn 'app:app' / flask --app app 이 app 변수를 처음 읽을 때 생성 (import 만으로는 만들지 않음)
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 5000))
-    app.run(host="0.0.0.0", port=port, debug=os.getenv("FLASK_ENV") == "development")
+    get_app().run(host="0.0.0.0", port=port, debug=os.getenv("FLASK_ENV") == "development")
@@ -0,0 +1,176 @@
+"""
+개발 / 부하 테스트용 가짜 Redis 서버.
+
+CACHE_BACKEND=redis 를 Redis 없이 확인할 때 쓴다. 공유 캐시(services.cache.RedisBackend)가 쓰는 명령만
+메모리에서 처리한다: PING, SELECT, GET, SET [NX] [PX|EX], DEL, SADD, SMEMBERS, PEXPIRE, EXPIRE, SCAN, FLUSHDB, DBSIZE.
+
+    python -m bench.fake_redis --port 6390
+    CACHE_BACKEND=redis CACHE_REDIS_URL=redis://127.0.0.1:6390/0 gunicorn app:app
+"""
+import argparse
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class FakeRedisStore:
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def _alive(self, key):
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline < time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def execute(self, name, args):
+        with self.lock:
+            handler = getattr(self, f"cmd_{name.lower()}", None)
+            if handler is None:
+                raise ValueError(f"ERR unknown command '{name}'")
+            return handler(*args)
+
+    def cmd_ping(self, *args):
+        return "PONG"
+
+    def cmd_select(self, db):
+        return "OK"
+
+    def cmd_get(self, key):
+        return self.data[key] if self._alive(key) else None
+
+    def cmd_set(self, key, value, *options):
+        options = [o.decode().upper() for o in options]
+        if "NX" in options and self._alive(key):
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        for unit, scale in (("PX", 0.001), ("EX", 1)):
+            if unit in options:
+                self.expires[key] = time.time() + int(options[options.index(unit) + 1]) * scale
+        return "OK"
+
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                removed += 1
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return removed
+
+    def cmd_sadd(self, key, *members):
+        current = self.data.get(key) if self._alive(key) else None
+        if not isinstance(current, set):
+            current = set()
+            self.data[key] = current
+        before = len(current)
+        current.update(members)
+        return len(current) - before
+
+    def cmd_smembers(self, key):
+        value = self.data.get(key) if self._alive(key) else None
+        return sorted(value) if isinstance(value, set) else []
+
+    def cmd_pexpire(self, key, ms):
+        if not self._alive(key):
+            return 0
+        self.expires[key] = time.time() + int(ms) / 1000
+        return 1
+
+    def cmd_expire(self, key, seconds):
+        return self.cmd_pexpire(key, int(seconds) * 1000)
+
+    def cmd_scan(self, cursor, *options):
+        pattern = "*"
+        options = list(options)
+        if b"MATCH" in options:
+            pattern = options[options.index(b"MATCH") + 1].decode()
+        keys = [k for k in list(self.data) if self._alive(k) and fnmatch.fnmatchcase(k.decode(), pattern)]
+        return [b"0", keys]
+
+    def cmd_flushdb(self):
+        self.data.clear()
+        self.expires.clear()
+        return "OK"
+
+    def cmd_dbsize(self):
+        return sum(1 for k in list(self.data) if self._alive(k))
+
+
+def encode_reply(value):
+    if isinstance(value, str):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(v) for v in value)
+    raise TypeError(type(value))
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if not args:
+                return
+            try:
+                reply = encode_reply(store.execute(args[0].decode(), args[1:]))
+            except Exception as e:
+                reply = b"-" + str(e).encode() + b"\r\n"
+            self.wfile.write(reply)
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=("127.0.0.1", 0)):
+        super().__init__(address, RespHandler)
+        self.store = FakeRedisStore()
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def start(self):
+        """백그라운드 스레드에서 실행하고 자신을 반환 (같은 프로세스에서 쓸 때)"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Redis 서버 (공유 캐시 확인용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    server = FakeRedisServer((args.host, args.port))
+    print(f"fake redis: {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+팀 모집 참여 동시성 스트레스 테스트.
+
+'flask seed' 데이터의 한 강의에 새 모집글을 만들고, 여러 학생이 동시에 참여 / 취소 토글을 반복한다
+(같은 학생의 연타도 섞는다). 끝나면 다음 불변식을 확인하고, 하나라도 깨지면 종료 코드 1.
+  - 참여자 수 <= 정원, member_count == 실제 참여자 수
+  - 게시판 활성화 여부 == 정원이 찼는지, 활성화 알림은 팀원당 한 번
+  - 5xx 응답 없음
+
+  python -m bench.join_stress                               Flask test client, 스레드 동시 실행
+  python -m bench.join_stress --url http://127.0.0.1:5000   실행 중인 gunicorn 대상 (같은 JWT_SECRET_KEY, 같은 DB)
+  python -m bench.join_stress --attempts 5000 --concurrency 64 --capacity 4
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_target(app, capacity, students):
+    """수강생이 가장 많은 강의에 시험용 모집글 생성 → (모집글 id, 강의 코드, {참여 시도할 사용자 id: 토큰})"""
+    from flask_jwt_extended import create_access_token
+
+    from extensions import db
+    from sqlalchemy import func
+
+    from models import Course, Enrollment, TeamRecruitment, TeamRecruitmentMember, User
+    from services.recruitments import sync_member_counts
+
+    with app.app_context():
+        busiest = (
+            Enrollment.query.with_entities(Enrollment.course_id)
+            .group_by(Enrollment.course_id)
+            .order_by(func.count(Enrollment.id).desc())
+            .first()
+        )
+        if busiest is None:
+            sys.exit("수강 데이터가 없습니다. 먼저 'flask --app app seed' 를 실행하세요.")
+        course = db.session.get(Course, busiest[0])
+
+        user_ids = [
+            uid
+            for (uid,) in Enrollment.query.filter_by(course_id=course.id)
+            .join(User, User.id == Enrollment.student_id)
+            .filter(User.user_type == "student")
+            .with_entities(Enrollment.student_id)
+            .order_by(Enrollment.student_id)
+            .limit(students)
+        ]
+        if len(user_ids) < 2:
+            sys.exit(f"{course.code} 수강생이 부족합니다.")
+
+        author_id, joiners = user_ids[0], user_ids[1:]
+        recruitment = TeamRecruitment(
+            course_id=course.code,
+            author_id=author_id,
+            title="[스트레스] 동시 참여",
+            description="bench.join_stress",
+            team_board_name="스트레스",
+            max_members=capacity,
+        )
+        db.session.add(recruitment)
+        db.session.flush()
+        db.session.add(TeamRecruitmentMember(recruitment_id=recruitment.id, user_id=author_id))
+        db.session.flush()
+        sync_member_counts(recruitment.id)
+        db.session.commit()
+
+        tokens = {uid: create_access_token(identity=str(uid)) for uid in joiners}
+        return recruitment.id, course.code, tokens
+
+
+def make_sender(app, url):
+    if url:
+        from bench.load import make_http_sender
+
+        return make_http_sender(url)
+
+    # test client 는 스레드마다 따로 둔다
+    local = threading.local()
+
+    def send(method, path, body, token):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        started = time.perf_counter()
+        response = client.open(path, method=method, json=body, headers={"Authorization": f"Bearer {token}"})
+        return response.status_code, time.perf_counter() - started, None
+
+    return send
+
+
+def check_invariants(app, recruitment_id):
+    """깨진 불변식 설명 목록 (비어 있으면 통과)"""
+    from models import Notification, TeamRecruitment, TeamRecruitmentMember
+
+    problems = []
+    with app.app_context():
+        recruitment = TeamRecruitment.query.get(recruitment_id)
+        member_ids = [
+            uid
+            for (uid,) in TeamRecruitmentMember.query.filter_by(recruitment_id=recruitment_id).with_entities(
+                TeamRecruitmentMember.user_id
+            )
+        ]
+        count = len(member_ids)
+        if count > recruitment.max_members:
+            problems.append(f"정원 초과: {count} > {recruitment.max_members}")
+        if len(set(member_ids)) != count:
+            problems.append(f"중복 참여자: {sorted(member_ids)}")
+        if recruitment.member_count != count:
+            problems.append(f"member_count 불일치: {recruitment.member_count} != {count}")
+        full = count >= recruitment.max_members
+        if bool(recruitment.is_board_activated) != full:
+            problems.append(f"활성화 상태 불일치: activated={recruitment.is_board_activated}, full={full}")
+
+        activation_notices = Counter(
+            uid
+            for (uid,) in Notification.query.filter_by(
+                type="team_board_activated", related_id=recruitment_id
+            ).with_entities(Notification.user_id)
+        )
+        duplicated = {uid: n for uid, n in activation_notices.items() if n > 1}
+        if duplicated:
+            problems.append(f"활성화 알림 중복: {duplicated}")
+        if full and set(activation_notices) != set(member_ids):
+            problems.append("활성화 알림을 받지 못한 팀원이 있습니다")
+        summary = {
+            "members": count,
+            "max_members": recruitment.max_members,
+            "activated": bool(recruitment.is_board_activated),
+        }
+    return problems, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="팀 모집 참여 동시성 스트레스 테스트")
+    parser.add_argument("--url", help="대상 서버 (없으면 Flask test client)")
+    parser.add_argument("--attempts", type=int, default=2000, help="참여/취소 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=4, help="모집 정원")
+    parser.add_argument("--students", type=int, default=200, help="참여를 시도할 최대 수강생 수")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ.setdefault("RATELIMIT_ENABLED", "0")
+    sys.path.insert(0, ROOT)
+    import logging
+
+    logging.getLogger("services.query_stats").setLevel(logging.ERROR)
+    import app as app_module
+    from bench.load import percentile
+
+    application = app_module.get_app()
+    recruitment_id, course_code, tokens = create_target(application, args.capacity, args.students)
+    send = make_sender(application, args.url)
+
+    rng = random.Random(args.seed)
+    # 앞쪽 몇 명에게 요청을 몰아서 같은 사용자의 연타(동시 중복 요청)도 생기게 한다
+    user_ids = list(tokens)
+    hot_users = user_ids[: max(2, len(user_ids) // 4)]
+    plan = [rng.choice(hot_users if rng.random() < 0.5 else user_ids) for _ in range(args.attempts)]
+
+    def attempt(uid):
+        status, elapsed, _ = send("POST", f"/recruit/{recruitment_id}/join", None, tokens[uid])
+        return status, elapsed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(attempt, plan))
+    wall = time.perf_counter() - started
+
+    statuses = Counter(status for status, _ in results)
+    latencies = [elapsed * 1000 for _, elapsed in results]
+    problems, summary = check_invariants(application, recruitment_id)
+    server_errors = {code: n for code, n in statuses.items() if code >= 500}
+    if server_errors:
+        problems.append(f"5xx 응답: {server_errors}")
+
+    print(f"모집글 {recruitment_id} ({course_code}), 시도 {args.attempts}회, 동시성 {args.concurrency}")
+    print(f"응답 코드: {dict(sorted(statuses.items()))}")
+    print(
+        f"p50 {percentile(latencies, 50):.1f} ms, p99 {percentile(latencies, 99):.1f} ms, "
+        f"{wall:.2f}초 ({args.attempts / wall:.0f} req/s)"
+    )
+    print(f"최종 상태: {summary}")
+    if problems:
+        for problem in problems:
+            print(f"실패: {problem}")
+        sys.exit(1)
+    print("불변식 통과")
+
+
+if __name__ == "__main__":
+    main()
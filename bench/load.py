@@ -0,0 +1,321 @@
+"""
+요청 혼합(request mix) 부하 벤치마크.
+
+'flask seed' 로 만든 데이터베이스를 대상으로 실제 사용 비율에 가까운 요청을 섞어 보내고,
+시나리오별 p50 / p95 / p99 지연 시간과 요청당 쿼리 수(X-DB-Queries 헤더)를 보고한다.
+저장된 기준값(baseline)과 비교해서 허용 범위를 넘게 느려진 항목을 표시한다.
+
+  python -m bench.load                              Flask test client (한 프로세스)
+  python -m bench.load --url http://127.0.0.1:5000  실행 중인 gunicorn 대상
+                                                    (서버도 QUERY_STATS_HEADERS=1, 같은 JWT_SECRET_KEY 로 실행)
+  python -m bench.load --save-baseline              결과를 bench/baseline.json 에 저장
+  python -m bench.load --fail-on-regression         회귀가 있으면 종료 코드 1
+
+토큰은 서버와 같은 설정으로 이 프로세스에서 직접 발급하므로 로그인(bcrypt)은 측정에 포함되지 않는다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+
+# 시나리오: 가중치
+REQUEST_MIX = {
+    "board_list": 30,
+    "post_detail": 20,
+    "like_toggle": 12,
+    "vote": 8,
+    "team_common_times": 10,
+    "notifications": 20,
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+# =====================================================
+# 시나리오 준비
+# =====================================================
+class Fixture:
+    """seed 데이터에서 요청에 쓸 id 와 사용자 토큰을 뽑아 둔다"""
+
+    def __init__(self, app, rng, users=50):
+        from flask_jwt_extended import create_access_token
+
+        from models import (
+            Course,
+            CourseBoardPost,
+            Enrollment,
+            Poll,
+            PollOption,
+            TeamRecruitmentMember,
+            User,
+        )
+        from services.seed import SEED_PREFIX
+
+        with app.app_context():
+            students = (
+                User.query.filter(User.username.like(f"{SEED_PREFIX}student%"))
+                .order_by(User.id)
+                .limit(users)
+                .all()
+            )
+            if not students:
+                sys.exit("seed 데이터가 없습니다. 먼저 'flask --app app seed' 를 실행하세요.")
+
+            self.tokens = {u.id: create_access_token(identity=str(u.id)) for u in students}
+            self.user_ids = list(self.tokens)
+
+            code_by_course = {c.id: c.code for c in Course.query.all()}
+            self.courses_by_user = defaultdict(list)
+            for e in Enrollment.query.filter(Enrollment.student_id.in_(self.user_ids)).all():
+                self.courses_by_user[e.student_id].append(code_by_course[e.course_id])
+
+            self.posts_by_course = defaultdict(list)
+            for post_id, course_code in CourseBoardPost.query.with_entities(
+                CourseBoardPost.id, CourseBoardPost.course_id
+            ):
+                self.posts_by_course[course_code].append(post_id)
+
+            self.poll_options = defaultdict(list)
+            poll_post = dict(Poll.query.with_entities(Poll.id, Poll.post_id))
+            for option_id, poll_id in PollOption.query.with_entities(PollOption.id, PollOption.poll_id):
+                self.poll_options[poll_post[poll_id]].append(option_id)
+            self.poll_posts = sorted(self.poll_options)
+
+            # (user_id, team_id) — 팀 공통 시간은 팀원 본인이 조회
+            self.team_memberships = [
+                (m.user_id, m.recruitment_id)
+                for m in TeamRecruitmentMember.query.filter(
+                    TeamRecruitmentMember.user_id.in_(self.user_ids)
+                ).order_by(TeamRecruitmentMember.id)
+            ]
+
+        self.rng = rng
+
+    def build(self, scenario):
+        """(method, path, json body, user_id)"""
+        rng = self.rng
+        user_id = rng.choice(self.user_ids)
+        courses = self.courses_by_user[user_id] or list(self.posts_by_course)
+        course = rng.choice(courses)
+        posts = self.posts_by_course.get(course) or [rng.choice(self.poll_posts)]
+
+        if scenario == "board_list":
+            return "GET", f"/board/course/{course}", None, user_id
+        if scenario == "post_detail":
+            return "GET", f"/board/post/{rng.choice(posts)}/comments", None, user_id
+        if scenario == "like_toggle":
+            return "POST", f"/board/post/{rng.choice(posts)}/like", None, user_id
+        if scenario == "vote":
+            post_id = rng.choice(self.poll_posts)
+            body = {"option_id": rng.choice(self.poll_options[post_id])}
+            return "POST", f"/board/post/{post_id}/poll/vote", body, user_id
+        if scenario == "team_common_times":
+            user_id, team_id = rng.choice(self.team_memberships)
+            return "GET", f"/available/team/{team_id}", None, user_id
+        if scenario == "notifications":
+            return "GET", "/notification/", None, user_id
+        raise ValueError(scenario)
+
+
+# =====================================================
+# 요청 실행
+# =====================================================
+def make_test_client_sender(app):
+    client = app.test_client()
+
+    def send(method, path, body, token):
+        started = time.perf_counter()
+        response = client.open(path, method=method, json=body, headers={"Authorization": f"Bearer {token}"})
+        elapsed = time.perf_counter() - started
+        return response.status_code, elapsed, response.headers.get("X-DB-Queries")
+
+    return send
+
+
+def make_http_sender(base_url):
+    def send(method, path, body, token):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(base_url.rstrip("/") + path, data=data, method=method)
+        req.add_header("Authorization", f"Bearer {token}")
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                response.read()
+                status, headers = response.status, response.headers
+        except urllib.error.HTTPError as e:
+            e.read()
+            status, headers = e.code, e.headers
+        elapsed = time.perf_counter() - started
+        return status, elapsed, headers.get("X-DB-Queries")
+
+    return send
+
+
+def run(fixture, send, total, concurrency, rng):
+    scenarios = list(REQUEST_MIX)
+    weights = [REQUEST_MIX[s] for s in scenarios]
+    plan = [(s, fixture.build(s)) for s in rng.choices(scenarios, weights=weights, k=total)]
+
+    def execute(item):
+        scenario, (method, path, body, user_id) = item
+        status, elapsed, queries = send(method, path, body, fixture.tokens[user_id])
+        return scenario, status, elapsed, int(queries) if queries is not None else None
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(execute, plan))
+    else:
+        results = [execute(item) for item in plan]
+    wall = time.perf_counter() - started
+    return results, wall
+
+
+def summarize(results):
+    grouped = defaultdict(list)
+    for scenario, status, elapsed, queries in results:
+        grouped[scenario].append((status, elapsed, queries))
+        grouped["all"].append((status, elapsed, queries))
+
+    report = {}
+    for scenario, rows in grouped.items():
+        latencies = [elapsed * 1000 for _, elapsed, _ in rows]
+        queries = [q for _, _, q in rows if q is not None]
+        report[scenario] = {
+            "requests": len(rows),
+            "errors": sum(1 for status, _, _ in rows if status >= 500),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "queries_per_request": round(sum(queries) / len(queries), 1) if queries else None,
+        }
+    return report
+
+
+def compare(report, baseline, tolerance, keys=("p95_ms", "queries_per_request")):
+    """기준값 대비 tolerance 비율 이상 나빠진 항목 [(시나리오, 지표, 기준, 현재)]"""
+    regressions = []
+    for scenario, current in report.items():
+        base = baseline.get(scenario)
+        if not base:
+            continue
+        for key in keys:
+            if base.get(key) is None or current.get(key) is None:
+                continue
+            if current[key] > base[key] * (1 + tolerance) and current[key] - base[key] > 0.5:
+                regressions.append((scenario, key, base[key], current[key]))
+    return regressions
+
+
+def print_report(report, baseline):
+    header = f"{'scenario':20} {'n':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8}"
+    print(header)
+    print("-" * len(header))
+    for scenario in list(REQUEST_MIX) + ["all"]:
+        row = report.get(scenario)
+        if not row:
+            continue
+        line = (
+            f"{scenario:20} {row['requests']:>6} {row['errors']:>4} {row['p50_ms']:>8} "
+            f"{row['p95_ms']:>8} {row['p99_ms']:>8} {str(row['queries_per_request']):>8}"
+        )
+        base = baseline.get(scenario)
+        if base:
+            line += f"   (기준 p95 {base['p95_ms']}, queries {base['queries_per_request']})"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="요청 혼합 부하 벤치마크")
+    parser.add_argument("--url", help="대상 서버 (없으면 Flask test client)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=1, help="--url 사용 시 동시 요청 수")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 악화 비율 (0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QUERY_STATS_HEADERS", "1")
+    os.environ.setdefault("RATELIMIT_ENABLED", "0")
+    sys.path.insert(0, ROOT)
+    import logging
+
+    logging.getLogger("services.query_stats").setLevel(logging.ERROR)
+    import app as app_module
+
+    application = app_module.get_app()
+    rng = random.Random(args.seed)
+    fixture = Fixture(application, rng)
+
+    if args.url:
+        send = make_http_sender(args.url)
+        concurrency = args.concurrency
+    else:
+        send = make_test_client_sender(application)
+        concurrency = 1
+
+    if args.warmup:
+        run(fixture, send, args.warmup, concurrency, rng)
+    results, wall = run(fixture, send, args.requests, concurrency, rng)
+    report = summarize(results)
+
+    target = args.url or "test-client"
+    baseline = {}
+    keys = ("p95_ms", "queries_per_request")
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored.get("scenarios", {})
+        if stored.get("target") != target:
+            # 다른 대상에서 잰 지연 시간은 비교할 수 없으므로 쿼리 수만 비교
+            print(f"기준값 대상({stored.get('target')})이 달라 쿼리 수만 비교합니다.")
+            keys = ("queries_per_request",)
+
+    print_report(report, baseline)
+    print(f"\n{args.requests}개 요청, {wall:.2f}초 ({args.requests / wall:.1f} req/s)")
+
+    regressions = compare(report, baseline, args.tolerance, keys)
+    for scenario, key, base, current in regressions:
+        print(f"회귀: {scenario} {key} {base} → {current}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "target": target,
+                    "requests": args.requests,
+                    "seed": args.seed,
+                    "scenarios": report,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"기준값 저장: {args.baseline}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
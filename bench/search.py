@@ -0,0 +1,180 @@
+"""
+게시판 검색(FTS5) 벤치마크.
+
+임시 SQLite 파일에 마이그레이션을 적용하고, 강의 여러 개에 걸쳐 합성 게시글 / 댓글을 넣은 뒤
+(색인은 실제와 같이 트리거로 채워진다) 검색어 유형별로 /board/course/<code>/search 지연 시간을 잰다.
+
+사용법 (저장소 루트에서):
+    python -m bench.search [--posts 100000] [--courses 20] [--iterations 50] [--json 결과.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 자주 나오는 단어가 앞쪽 (Zipf 분포로 뽑는다)
+VOCABULARY = (
+    "과제 시험 공지 수업 질문 자료 범위 제출 일정 발표 팀 프로젝트 강의 출석 중간고사 기말고사 "
+    "보강 휴강 레포트 실습 퀴즈 정답 해설 피드백 성적 조교 면담 마감 연장 오류 코드 알고리즘 "
+    "데이터 구조 그래프 정렬 탐색 재귀 동적계획법 네트워크 운영체제 메모리 스레드 프로세스 "
+    "python java sqlite index query cache deadline lab homework midterm final"
+).split()
+RARE_WORDS = ["오픈북", "족보", "재시험", "kaggle"]
+
+
+def _zipf_words(rng, count):
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    return rng.choices(VOCABULARY, weights=weights, k=count)
+
+
+def _sentence(rng, low, high):
+    words = _zipf_words(rng, rng.randint(low, high))
+    if rng.random() < 0.002:
+        words.append(rng.choice(RARE_WORDS))
+    return " ".join(words)
+
+
+def populate(application, posts, courses, comments_per_post, rng):
+    """합성 데이터 삽입 → (강의 코드 목록, 토큰)"""
+    from flask_jwt_extended import create_access_token
+
+    from extensions import db
+    from models import Course, User
+
+    with application.app_context():
+        professor = User(
+            student_id="B0000", name="벤치 교수", email="bench-prof@example.com",
+            username="bench_prof", password_hash="-", user_type="professor",
+        )
+        student = User(
+            student_id="B0001", name="벤치 학생", email="bench-student@example.com",
+            username="bench_student", password_hash="-", user_type="student",
+        )
+        db.session.add_all([professor, student])
+        db.session.flush()
+        course_rows = [
+            Course(title=f"벤치 강의 {i}", code=f"BENCH{i:03d}", professor_id=professor.id) for i in range(courses)
+        ]
+        db.session.add_all(course_rows)
+        db.session.commit()
+        codes = [c.code for c in course_rows]
+        course_pks = {c.code: c.id for c in course_rows}
+        token = create_access_token(identity=str(student.id))
+        author_ids = (professor.id, student.id)
+
+        started = datetime.now() - timedelta(days=365)
+        categories = ("notice", "community", "community", "community", "team")
+        post_rows = []
+        for i in range(posts):
+            code = rng.choice(codes)
+            post_rows.append(
+                (
+                    code, course_pks[code], rng.choice(author_ids), _sentence(rng, 2, 8),
+                    _sentence(rng, 10, 80), rng.choice(categories), started + timedelta(minutes=5 * i),
+                )
+            )
+        comment_rows = [
+            (post_id, rng.choice(author_ids), _sentence(rng, 3, 20), started)
+            for post_id in range(1, posts + 1)
+            for _ in range(rng.randint(0, comments_per_post * 2))
+        ]
+
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO course_board_posts (course_id, course_pk, author_id, title, content, category,"
+                " is_pinned, created_at) VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                post_rows,
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO course_board_comments (post_id, author_id, content, created_at) VALUES (?, ?, ?, ?)",
+                comment_rows,
+            )
+            connection.exec_driver_sql("INSERT INTO board_search (board_search) VALUES ('optimize')")
+            connection.exec_driver_sql("ANALYZE")
+        return codes, token, len(comment_rows)
+
+
+def _summary(samples):
+    from bench.load import percentile
+
+    return {"p50_ms": round(percentile(samples, 50), 2), "p95_ms": round(percentile(samples, 95), 2)}
+
+
+def bench_queries(application, codes, token, iterations, rng):
+    cases = {
+        "common_word": {"q": VOCABULARY[0]},
+        "mid_word": {"q": VOCABULARY[20]},
+        "rare_word": {"q": RARE_WORDS[0]},
+        "two_words": {"q": f"{VOCABULARY[1]} {VOCABULARY[6]}"},
+        "prefix_2chars": {"q": VOCABULARY[14][:2]},
+        "category_notice": {"q": VOCABULARY[1], "category": "notice"},
+        "page_3": {"q": VOCABULARY[0], "offset": 40},
+        "no_match": {"q": "존재하지않는단어"},
+    }
+    client = application.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    results = {}
+    for name, params in cases.items():
+        samples, hits = [], 0
+        for _ in range(iterations):
+            code = rng.choice(codes)
+            started = time.perf_counter()
+            response = client.get(f"/board/course/{code}/search", query_string=params, headers=headers)
+            samples.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                sys.exit(f"{name}: 응답 {response.status_code} {response.get_data(as_text=True)[:200]}")
+            hits += len(response.get_json())
+        results[name] = dict(_summary(samples), avg_results=round(hits / iterations, 1))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게시판 검색(FTS5) 벤치마크")
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--comments-per-post", type=int, default=2, help="평균 댓글 수")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="결과를 저장할 파일")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-search-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'search.db')}"
+    os.environ.setdefault("RATELIMIT_ENABLED", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, ROOT)
+    import app as app_module
+    import migrations
+    from extensions import db
+
+    application = app_module.get_app()
+    with application.app_context():
+        migrations.upgrade(db.engine)
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    codes, token, comment_count = populate(application, args.posts, args.courses, args.comments_per_post, rng)
+    load_seconds = time.perf_counter() - started
+    print(f"게시글 {args.posts}개 / 댓글 {comment_count}개 삽입 + 색인: {load_seconds:.1f}초 ({workdir})")
+
+    results = bench_queries(application, codes, token, args.iterations, rng)
+    print(f"\n{'case':18} {'p50':>9} {'p95':>9} {'results':>8}")
+    for name, row in results.items():
+        print(f"{name:18} {row['p50_ms']:>7} ms {row['p95_ms']:>7} ms {row['avg_results']:>8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"posts": args.posts, "comments": comment_count, "courses": args.courses, "cases": results},
+                f, ensure_ascii=False, indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
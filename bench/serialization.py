@@ -0,0 +1,123 @@
+"""
+JSON 직렬화 / 응답 압축 벤치마크.
+
+'flask seed' 데이터에서 게시판 목록(/board/course/<code>)과 팀 공통 시간(/available/team/<id>) 응답을
+실제로 받아 온 뒤, 같은 객체를 대상으로
+  - provider 별 인코딩 시간 (Flask 기본 json vs orjson)
+  - 본문 크기: 압축 없음 / gzip 레벨별 / brotli(설치된 경우), 압축 시간
+를 잰다.
+
+사용법 (저장소 루트에서):
+    python -m bench.serialization [--iterations 200] [--json 결과.json]
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _median_ms(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def fetch_payloads(application, fixture):
+    """[(이름, 파이썬 객체)] — 가장 큰 강의 게시판 목록과 팀 공통 시간"""
+    client = application.test_client()
+    course = max(fixture.posts_by_course, key=lambda code: len(fixture.posts_by_course[code]))
+    user_id = next(
+        (uid for uid, codes in fixture.courses_by_user.items() if course in codes), fixture.user_ids[0]
+    )
+    team_user, team_id = fixture.team_memberships[0]
+
+    payloads = []
+    for name, path, uid in (
+        ("board_list", f"/board/course/{course}", user_id),
+        ("team_common_times", f"/available/team/{team_id}", team_user),
+    ):
+        response = client.get(
+            path, headers={"Authorization": f"Bearer {fixture.tokens[uid]}", "Accept-Encoding": "identity"}
+        )
+        if response.status_code != 200:
+            sys.exit(f"{path} 응답 {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        payloads.append((name, json.loads(response.get_data())))
+    return payloads
+
+
+def bench_payload(application, obj, iterations):
+    from flask.json.provider import DefaultJSONProvider
+
+    from services.compression import brotli
+    from services.json_provider import OrjsonProvider, orjson
+
+    result = {"encode_ms": {}, "bytes": {}, "compress_ms": {}}
+    providers = [("std", DefaultJSONProvider(application))]
+    if orjson is not None:
+        providers.append(("orjson", OrjsonProvider(application)))
+
+    body = None
+    for name, provider in providers:
+        with application.app_context():
+            result["encode_ms"][name] = _median_ms(lambda: provider.response(obj).get_data(), iterations)
+            result["bytes"][f"identity ({name})"] = len(provider.response(obj).get_data())
+            body = provider.response(obj).get_data()
+
+    # 압축은 실제로 나가는 본문(마지막 provider 결과) 기준
+    for level in (1, 6, 9):
+        key = f"gzip-{level}"
+        result["bytes"][key] = len(gzip.compress(body, compresslevel=level, mtime=0))
+        result["compress_ms"][key] = _median_ms(lambda: gzip.compress(body, compresslevel=level, mtime=0), iterations)
+    if brotli is not None:
+        for quality in (4, 11):
+            key = f"br-{quality}"
+            result["bytes"][key] = len(brotli.compress(body, quality=quality))
+            result["compress_ms"][key] = _median_ms(lambda: brotli.compress(body, quality=quality), iterations)
+    return result
+
+
+def print_result(name, result):
+    print(f"\n[{name}]")
+    for provider, ms in result["encode_ms"].items():
+        print(f"  encode {provider:10} {ms:>9.3f} ms")
+    for key, size in result["bytes"].items():
+        extra = f"  ({result['compress_ms'][key]:.3f} ms)" if key in result["compress_ms"] else ""
+        print(f"  {key:20} {size:>9} B{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 직렬화 / 응답 압축 벤치마크")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="결과를 저장할 파일")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RATELIMIT_ENABLED", "0")
+    sys.path.insert(0, ROOT)
+    import app as app_module
+    from bench.load import Fixture
+
+    application = app_module.get_app()
+    fixture = Fixture(application, random.Random(args.seed))
+
+    results = {}
+    for name, obj in fetch_payloads(application, fixture):
+        results[name] = bench_payload(application, obj, args.iterations)
+        print_result(name, results[name])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
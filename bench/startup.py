@@ -0,0 +1,115 @@
+"""
+시작 시간 벤치마크.
+
+  cold    : 새 파이썬 프로세스에서 import app → create_app → 첫 요청 (preload 없이 워커가 뜰 때와 같음)
+  preload : 한 프로세스에서 앱을 만들고 warm_caches 후 fork, 자식에서 reset_after_fork → 첫 요청
+            (gunicorn --preload 에서 워커 하나가 준비되는 데 걸리는 시간)
+
+사용법 (저장소 루트에서, db-upgrade 가 끝난 DB 필요):
+    python -m bench.startup [--runs 5] [--json 결과.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 요청: DB 를 한 번 조회하는 가벼운 엔드포인트 (없는 사용자 로그인)
+FIRST_REQUEST = ("/auth/login", {"username": "__bench__", "password": "__bench__"})
+
+_COLD_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+application = app_module.get_app()
+t2 = time.perf_counter()
+path, body = json.loads(sys.argv[1])
+application.test_client().post(path, json=body)
+t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000,
+                  "first_request_ms": (t3 - t2) * 1000}))
+"""
+
+
+def _summary(values):
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {"median": round(statistics.median(ordered), 1), "p95": round(p95, 1)}
+
+
+def bench_cold(runs):
+    env = dict(os.environ, RATELIMIT_ENABLED="0", PYTHONPATH=ROOT)
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", _COLD_SCRIPT, json.dumps(FIRST_REQUEST)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        sample = json.loads(out.stdout.strip().splitlines()[-1])
+        sample["process_ms"] = (time.perf_counter() - started) * 1000
+        samples.append(sample)
+    return {key: _summary([s[key] for s in samples]) for key in samples[0]}
+
+
+def bench_preload(runs):
+    os.environ["RATELIMIT_ENABLED"] = "0"
+    sys.path.insert(0, ROOT)
+    import app as app_module
+    from startup import reset_after_fork, warm_caches
+
+    started = time.perf_counter()
+    application = app_module.get_app()
+    warm_caches(application)
+    master_ms = (time.perf_counter() - started) * 1000
+
+    samples = []
+    for _ in range(runs):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            t0 = time.perf_counter()
+            reset_after_fork(application)
+            t1 = time.perf_counter()
+            path, body = FIRST_REQUEST
+            application.test_client().post(path, json=body)
+            t2 = time.perf_counter()
+            os.write(write_fd, json.dumps(
+                {"worker_init_ms": (t1 - t0) * 1000, "first_request_ms": (t2 - t1) * 1000}
+            ).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            samples.append(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+
+    result = {key: _summary([s[key] for s in samples]) for key in samples[0]}
+    result["master_ms"] = round(master_ms, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시작 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    result = {"cold": bench_cold(args.runs), "preload": bench_preload(args.runs)}
+    for mode, metrics in result.items():
+        print(f"[{mode}]")
+        for key, value in metrics.items():
+            print(f"  {key:18} {value}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
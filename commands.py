@@ -0,0 +1,127 @@
+import click
+from flask.cli import with_appcontext
+
+
+def register_commands(app):
+    """flask CLI 관리 명령 등록"""
+    app.cli.add_command(compact_available_times_command)
+    app.cli.add_command(purge_revoked_tokens_command)
+    app.cli.add_command(db_upgrade_command)
+    app.cli.add_command(db_version_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(cache_clear_command)
+    app.cli.add_command(search_reindex_command)
+
+
+# 가능한 시간 데이터 정리 (1회성)
+# 사용법: flask --app app compact-available-times [--dry-run]
+@click.command("compact-available-times")
+@click.option("--dry-run", is_flag=True, help="실제로 저장하지 않고 정리 결과만 출력")
+@with_appcontext
+def compact_available_times_command(dry_run):
+    """겹치거나 맞닿은 AvailableTime 구간을 (user_id, team_id, 요일) 단위로 병합"""
+    from services.availability import compact_available_times
+
+    before, after = compact_available_times(dry_run=dry_run)
+    prefix = "[dry-run] " if dry_run else ""
+    click.echo(f"{prefix}available_times: {before}개 → {after}개")
+
+
+# 만료된 토큰 폐기 기록 정리 (주기적으로 실행)
+# 사용법: flask --app app purge-revoked-tokens
+@click.command("purge-revoked-tokens")
+@with_appcontext
+def purge_revoked_tokens_command():
+    """원래 만료 시각이 지난 revoked_tokens 행 삭제"""
+    from services.token_revocation import revocation_store
+
+    deleted = revocation_store.purge_expired()
+    click.echo(f"revoked_tokens: {deleted}개 삭제")
+
+
+# 스키마 마이그레이션 적용 (배포 시 한 번)
+# 사용법: flask --app app db-upgrade [--to N]
+@click.command("db-upgrade")
+@click.option("--to", "target", type=int, default=None, help="이 버전까지만 적용")
+@with_appcontext
+def db_upgrade_command(target):
+    """아직 적용하지 않은 migrations/mNNNN_*.py 를 순서대로 실행"""
+    from extensions import db
+    from migrations import current_version, upgrade
+
+    applied = upgrade(db.engine, target=target)
+    for version, name in applied:
+        click.echo(f"적용: {name}")
+    click.echo(f"schema_version: {current_version(db.engine)}")
+
+
+# 현재 스키마 버전 확인
+# 사용법: flask --app app db-version
+@click.command("db-version")
+@with_appcontext
+def db_version_command():
+    """현재 / 최신 스키마 버전 출력"""
+    from extensions import db
+    from migrations import current_version, latest_version
+
+    click.echo(f"현재 {current_version(db.engine)} / 최신 {latest_version()}")
+
+
+# 벤치마크용 합성 데이터 생성 (새 데이터베이스에서)
+# 사용법: flask --app app seed [--students 300] [--courses 20] [--seed 42]
+@click.command("seed")
+@click.option("--students", type=int, default=300, show_default=True)
+@click.option("--professors", type=int, default=10, show_default=True)
+@click.option("--courses", type=int, default=20, show_default=True)
+@click.option("--posts-per-course", type=int, default=40, show_default=True)
+@click.option("--teams-per-course", type=int, default=6, show_default=True)
+@click.option("--seed", "random_seed", type=int, default=42, show_default=True, help="같은 값이면 같은 데이터")
+@with_appcontext
+def seed_command(students, professors, courses, posts_per_course, teams_per_course, random_seed):
+    """사용자 / 강의 / 수강 / 게시글·투표·댓글·좋아요 / 팀 / 가능한 시간 / 알림 생성"""
+    from services.seed import SeedConfig, SeedError, seed_database
+
+    config = SeedConfig(
+        students=students,
+        professors=professors,
+        courses=courses,
+        posts_per_course=posts_per_course,
+        teams_per_course=teams_per_course,
+        seed=random_seed,
+    )
+    try:
+        counts = seed_database(config)
+    except SeedError as e:
+        raise click.ClickException(str(e))
+    for table, count in counts.items():
+        click.echo(f"{table}: {count}")
+
+
+# 공유 캐시 비우기 (응답 형식이 바뀐 배포 후 등)
+# 사용법: flask --app app cache-clear
+@click.command("cache-clear")
+@with_appcontext
+def cache_clear_command():
+    """CACHE_BACKEND 저장소의 모든 항목 삭제"""
+    from services.cache import shared_cache
+
+    shared_cache.clear()
+    click.echo(f"공유 캐시({shared_cache.backend.name}) 삭제 완료")
+
+
+# 게시판 검색 색인 다시 만들기 (트리거 밖에서 데이터를 직접 고친 뒤 등)
+# 사용법: flask --app app search-reindex
+@click.command("search-reindex")
+@with_appcontext
+def search_reindex_command():
+    """게시글 / 댓글 테이블에서 board_search 색인 재생성"""
+    from extensions import db
+    from services.board_search import create_index, is_supported, rebuild_index
+
+    with db.engine.begin() as connection:
+        if not is_supported(connection):
+            raise click.ClickException("게시판 검색은 SQLite 에서만 지원합니다.")
+        create_index(connection)
+        rebuild_index(connection)
+        count = connection.exec_driver_sql("SELECT COUNT(*) FROM board_search").scalar()
+    click.echo(f"검색 색인 재생성 완료: {count}건")
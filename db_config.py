@@ -0,0 +1,102 @@
+"""
+SQLite 엔진 설정.
+
+여러 gunicorn 워커가 같은 instance/project.db 를 쓰면 기본 설정에서는
+"database is locked" 오류가 나고 쓰기가 심하게 직렬화된다. 여기서
+  - 연결마다 WAL / synchronous=NORMAL / busy_timeout / cache_size / mmap_size / temp_store 설정
+  - 커넥션 풀 설정을 환경 변수로 조정
+  - 쓰기 트랜잭션을 잠금 오류 시 백오프 후 재시도하는 데코레이터
+를 제공한다.
+"""
+import os
+import random
+import sqlite3
+import time
+from functools import wraps
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from extensions import db
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64000)),  # 음수 = KiB 단위 (64MB)
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    # 기존 데이터와 회원탈퇴 경로가 외래 키 검사 없이 동작하던 것을 전제로 해서 기본 OFF.
+    # 그래서 course_pk 의 ON DELETE SET NULL 은 강의 삭제 라우트에서 직접 수행한다.
+    "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "OFF"),
+}
+
+WRITE_RETRY_ATTEMPTS = int(os.getenv("DB_WRITE_RETRY_ATTEMPTS", 5))
+WRITE_RETRY_BASE_DELAY = float(os.getenv("DB_WRITE_RETRY_BASE_DELAY", 0.05))
+
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def engine_options():
+    """SQLALCHEMY_ENGINE_OPTIONS (환경 변수로 풀 설정 조정)"""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", -1)),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "0") == "1",
+        "connect_args": {
+            # pysqlite 자체 잠금 대기 시간 (초) — busy_timeout 과 동일하게 맞춘다
+            "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000,
+            # 요청 스레드와 풀 정리 스레드가 다를 수 있음
+            "check_same_thread": False,
+        },
+    }
+
+
+def configure_database(app, db_path):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL", f"sqlite:///{db_path}")
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options())
+
+
+def _is_lock_error(error):
+    message = str(getattr(error, "orig", error)).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+def retry_on_locked(func=None, attempts=None, base_delay=None):
+    """
+    쓰기 트랜잭션 전체(조회 → 변경 → commit)를 감싸는 데코레이터.
+    SQLite 잠금 오류가 나면 롤백 후 지수 백오프(+지터)로 다시 실행한다.
+    함수 안에서 commit 은 한 번만 하는 경우에만 사용해야 한다.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            max_attempts = attempts or WRITE_RETRY_ATTEMPTS
+            delay = base_delay or WRITE_RETRY_BASE_DELAY
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return fn(*args, **kwargs)
+                except OperationalError as error:
+                    db.session.rollback()
+                    if not _is_lock_error(error) or attempt == max_attempts:
+                        raise
+                    time.sleep(delay * (2 ** (attempt - 1)) * (0.5 + random.random()))
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
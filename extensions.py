@@ -1,7 +1,15 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from services.passwords import PasswordHasher
+from services.rate_limit import RateLimiter
+from services.query_stats import QueryInspector
+from services.compression import ResponseCompressor
 
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 jwt = JWTManager()
+password_hasher = PasswordHasher()
+rate_limiter = RateLimiter()
+query_inspector = QueryInspector()
+response_compressor = ResponseCompressor()
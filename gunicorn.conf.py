@@ -0,0 +1,56 @@
+# gunicorn 설정
+# 사용법: gunicorn app:app  (이 파일은 자동으로 읽힌다)
+# 스키마 변경은 배포 시 'flask --app app db-upgrade' 로 먼저 실행한다.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# 2 이상이면 gthread 워커. bcrypt 프로세스 풀(PASSWORD_HASH_WORKERS)이 처리량을 늘리려면 필요하다 —
+# 스레드가 하나뿐이면 해시를 기다리는 동안 그 워커는 다른 요청을 받지 못한다 (services/passwords.py)
+threads = int(os.getenv("GUNICORN_THREADS", 1))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+
+# master 에서 앱을 한 번만 만들고 워커는 fork 로 물려받는다
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+
+def _metrics_dir():
+    return os.getenv("METRICS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "metrics"))
+
+
+def on_starting(server):
+    # 이전 실행에서 남은 워커별 메트릭 파일 정리
+    from services.metrics import metrics
+
+    metrics.clear_directory(_metrics_dir())
+
+
+def worker_exit(server, worker):
+    # 워커 프로세스에서 실행 — 마지막 flush 이후 값까지 파일에 남긴다
+    from services.metrics import metrics
+
+    metrics.flush()
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 누적값을 보존 — 같은 pid 를 새 워커가 받아도 덮어쓰이지 않게 한다
+    from services.metrics import metrics
+
+    metrics.mark_process_dead(worker.pid, _metrics_dir())
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from startup import warm_caches
+
+    warm_caches(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from startup import reset_after_fork
+
+    reset_after_fork(server.app.wsgi())
@@ -0,0 +1,269 @@
+"""
+로깅 설정 (JSON 구조화 로그 / 요청 ID / 모듈별 레벨 / 비동기 출력).
+
+모든 로그는 루트 로거의 QueueHandler 로 큐에 넣기만 하고, 실제 stdout 쓰기는
+QueueListener 스레드가 한다. 요청 스레드는 I/O 를 기다리지 않고, 큐가 가득 차면 기록을 버리고 개수만 센다.
+
+  LOG_LEVEL               루트 레벨 (기본 INFO)
+  LOG_LEVELS              모듈별 레벨. 예) "routes.available=DEBUG,services.query_stats=WARNING"
+  LOG_FORMAT              json (기본) | text
+  LOG_QUEUE_SIZE          큐 최대 길이 (기본 10000)
+  LOG_DEBUG_SAMPLE_RATE   DEBUG 기록을 남길 비율 (기본 1.0). 요청 ID 기준으로 고르므로
+                          한 요청의 DEBUG 로그는 전부 남거나 전부 빠진다
+
+요청마다 X-Request-ID 헤더(없으면 새로 발급)를 g.request_id 로 두고 응답 헤더와 모든 로그에 넣는다.
+fork 후에는 리스너 스레드가 없으므로 startup.reset_after_fork 에서 다시 시작한다
+(pid 가 바뀐 채 로그가 들어오면 그 자리에서도 다시 시작한다).
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# LogRecord 기본 속성 — 이 밖의 속성은 extra={...} 로 넘긴 값이라 JSON 필드로 내보낸다
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+# =====================================================
+# 요청 ID
+# =====================================================
+def current_request_id():
+    if has_request_context():
+        return g.get("request_id")
+    return None
+
+
+def _assign_request_id():
+    incoming = request.headers.get(REQUEST_ID_HEADER, "")
+    g.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+
+def _add_request_id_header(response):
+    request_id = g.get("request_id")
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+# =====================================================
+# 필터 / 포매터
+# =====================================================
+class RequestContextFilter(logging.Filter):
+    """기록을 만든 스레드에서 요청 정보를 붙인다 (리스너 스레드에는 요청 컨텍스트가 없음)"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get("request_id")
+            record.method = request.method
+            record.path = request.path
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """DEBUG 기록을 rate 비율만 남긴다. 요청 안에서는 요청 ID 해시로 골라 요청 단위로 일관되게 남긴다"""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+        self._threshold = int(rate * 10000)
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            keep = zlib.crc32(request_id.encode()) % 10000 < self._threshold
+        else:
+            keep = random.random() < self.rate
+        if keep:
+            record.sample_rate = self.rate
+        return keep
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_") and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s")
+
+    def format(self, record):
+        text = super().format(record)
+        request_id = getattr(record, "request_id", None)
+        return f"{text} (request_id={request_id})" if request_id else text
+
+
+# =====================================================
+# 큐 핸들러 / 리스너
+# =====================================================
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, pipeline):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record):
+        # 메시지와 예외 문자열은 호출 스레드에서 확정하고 args / exc_info 는 버린다 (큐에 객체를 붙잡아 두지 않음)
+        return _copy_record(record)
+
+    def enqueue(self, record):
+        self.pipeline.ensure_started()
+        try:
+            self.pipeline.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.count_dropped()
+
+    def close(self):
+        # logging.shutdown() 에서 호출 — 큐에 남은 기록을 출력하고 리스너를 멈춘다
+        self.pipeline.stop()
+        super().close()
+
+
+def _copy_record(record):
+    copied = logging.makeLogRecord(vars(record))
+    copied.message = record.getMessage()
+    copied.msg = copied.message
+    copied.args = None
+    if record.exc_info:
+        copied.exc_text = logging.Formatter().formatException(record.exc_info)
+    copied.exc_info = None
+    return copied
+
+
+class LogPipeline:
+    def __init__(self, formatter, stream=None, maxsize=10000):
+        self.formatter = formatter
+        self.stream = stream or sys.stdout
+        self.maxsize = maxsize
+        self.queue = queue.Queue(maxsize)
+        self.listener = None
+        self.dropped = 0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # fork 된 자식: 부모의 큐 잠금 상태를 물려받았을 수 있으므로 큐부터 새로 만든다
+                self.queue = queue.Queue(self.maxsize)
+                self.dropped = 0
+            output = logging.StreamHandler(self.stream)
+            output.setFormatter(self.formatter)
+            self.listener = logging.handlers.QueueListener(self.queue, output, respect_handler_level=False)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self._pid = None
+
+    def count_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def metric_samples(self):
+        """/metrics 용 누적값 [(이름, 라벨, 값)]"""
+        return [("log_records_dropped_total", {}, self.dropped)]
+
+
+def parse_levels(spec):
+    """'a.b=DEBUG,c=WARNING' -> {'a.b': 'DEBUG', 'c': 'WARNING'}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_pipeline = None
+
+
+def configure_logging(app=None):
+    """루트 로거를 큐 기반 핸들러로 교체. 여러 번 호출해도 핸들러는 하나만 유지한다"""
+    global _pipeline
+
+    config = app.config if app is not None else {}
+    level = config.get("LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+    levels = parse_levels(config.get("LOG_LEVELS", os.getenv("LOG_LEVELS")))
+    fmt = config.get("LOG_FORMAT", os.getenv("LOG_FORMAT", "json"))
+    maxsize = int(config.get("LOG_QUEUE_SIZE", os.getenv("LOG_QUEUE_SIZE", 10000)))
+    sample_rate = float(config.get("LOG_DEBUG_SAMPLE_RATE", os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0)))
+
+    if _pipeline is not None:
+        _pipeline.stop()
+    _pipeline = LogPipeline(JsonFormatter() if fmt == "json" else TextFormatter(), maxsize=maxsize)
+
+    handler = NonBlockingQueueHandler(_pipeline)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(DebugSampler(sample_rate))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, NonBlockingQueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _pipeline.ensure_started()
+
+    if app is not None:
+        app.before_request(_assign_request_id)
+        app.after_request(_add_request_id_header)
+    return _pipeline
+
+
+def restart_after_fork():
+    if _pipeline is not None:
+        _pipeline.ensure_started()
+
+
+def log_metric_samples():
+    return _pipeline.metric_samples() if _pipeline is not None else []
+
+
+@atexit.register
+def _stop_pipeline():
+    # 종료 시 큐에 남은 기록까지 출력
+    if _pipeline is not None:
+        _pipeline.stop()
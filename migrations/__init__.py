@@ -0,0 +1,129 @@
+"""
+버전 관리되는 스키마 마이그레이션.
+
+migrations/mNNNN_<설명>.py 모듈을 번호 순서대로 한 번씩 적용하고,
+적용 이력은 schema_version 테이블에 남긴다.
+  - flask --app app db-upgrade [--to N] : 아직 적용하지 않은 마이그레이션 실행 (배포 시 한 번)
+  - flask --app app db-version          : 현재 / 최신 버전 출력
+앱 부팅 시에는 버전 번호만 확인하고(check_schema_version), 스키마는 바꾸지 않는다.
+
+각 모듈은 DESCRIPTION 과 upgrade(connection) 를 정의한다.
+마이그레이션은 그 시점의 DDL / 인덱스 목록을 모듈 안에 고정해 두고 models.py(db.metadata)를 읽지 않는다 —
+모델이 나중에 바뀌어도 예전 마이그레이션이 하는 일은 그대로여야 한다.
+부팅 시 create_all 로 관리되던 기존 DB 에도 적용되므로 has_table / has_column / add_column 헬퍼로
+이미 반영된 DB 에서도 안전하게(멱등) 작성한다.
+"""
+import importlib
+import logging
+import pkgutil
+import re
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+_MODULE_PATTERN = re.compile(r"^m(\d{4})_\w+$")
+
+
+# =====================================================
+# 마이그레이션 작성용 헬퍼
+# =====================================================
+def has_table(connection, table):
+    return inspect(connection).has_table(table)
+
+
+def has_column(connection, table, column):
+    return column in {c["name"] for c in inspect(connection).get_columns(table)}
+
+
+def add_column(connection, table, column, ddl):
+    """컬럼이 없을 때만 ALTER TABLE ... ADD COLUMN. 추가했으면 True"""
+    if has_column(connection, table, column):
+        return False
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+# =====================================================
+# 버전 관리
+# =====================================================
+def discover():
+    """[(버전, 모듈 이름, 모듈)] 버전 순"""
+    found = []
+    for info in pkgutil.iter_modules(__path__):
+        match = _MODULE_PATTERN.match(info.name)
+        if match:
+            module = importlib.import_module(f"{__name__}.{info.name}")
+            found.append((int(match.group(1)), info.name, module))
+    found.sort(key=lambda item: item[0])
+
+    versions = [version for version, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"마이그레이션 번호가 중복되었습니다: {versions}")
+    return found
+
+
+def latest_version():
+    migrations = discover()
+    return migrations[-1][0] if migrations else 0
+
+
+def _ensure_version_table(connection):
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            " version INTEGER PRIMARY KEY,"
+            " name VARCHAR(100) NOT NULL,"
+            " applied_at DATETIME NOT NULL)"
+        )
+    )
+
+
+def current_version(engine):
+    with engine.connect() as connection:
+        if not has_table(connection, "schema_version"):
+            return 0
+        return connection.execute(
+            text("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        ).scalar()
+
+
+def upgrade(engine, target=None):
+    """target 버전까지(없으면 최신까지) 적용. 적용한 [(버전, 이름)] 반환"""
+    applied = []
+    with engine.begin() as connection:
+        _ensure_version_table(connection)
+
+    version = current_version(engine)
+    for migration_version, name, module in discover():
+        if migration_version <= version:
+            continue
+        if target is not None and migration_version > target:
+            break
+        logger.info("마이그레이션 %s 적용 중: %s", name, module.DESCRIPTION)
+        with engine.begin() as connection:
+            module.upgrade(connection)
+            connection.execute(
+                text(
+                    "INSERT INTO schema_version (version, name, applied_at) "
+                    "VALUES (:version, :name, :applied_at)"
+                ),
+                {"version": migration_version, "name": name, "applied_at": datetime.utcnow()},
+            )
+        applied.append((migration_version, name))
+    return applied
+
+
+def check_schema_version(engine):
+    """부팅 시 버전만 확인. 최신이 아니면 경고만 남기고 (current, latest) 반환"""
+    current = current_version(engine)
+    latest = latest_version()
+    if current < latest:
+        logger.warning(
+            "데이터베이스 스키마가 최신이 아닙니다 (현재 %s, 최신 %s). "
+            "'flask --app app db-upgrade' 를 실행하세요.",
+            current,
+            latest,
+        )
+    return current, latest
@@ -0,0 +1,275 @@
+"""
+기본 스키마.
+
+새 데이터베이스: 모든 테이블과 인덱스를 만든다.
+기존 데이터베이스(부팅 시 create_all + 임시 ALTER TABLE 로 관리되던 DB):
+빠진 테이블, 나중에 추가된 컬럼(is_pinned, team_id, start_time/end_time), 인덱스를 채운다.
+
+테이블과 인덱스는 이 마이그레이션 시점의 스키마를 아래에 그대로 고정해 둔 것이다 (models.py 를 읽지 않는다).
+이후 모델에 추가되는 테이블 / 컬럼 / 인덱스는 그것을 추가하는 마이그레이션에서 만든다
+(예: resource_versions 는 m0002, course_pk 와 그 인덱스는 m0004).
+"""
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    Time,
+    UniqueConstraint,
+    text,
+)
+
+from migrations import add_column, has_column
+from services.schema_indexes import ensure_indexes, index
+
+DESCRIPTION = "기본 스키마 + 기존 임시 마이그레이션 컬럼 + 조회 인덱스"
+
+metadata = MetaData()
+
+
+def _id():
+    return Column("id", Integer, primary_key=True)
+
+
+def _fk(name, target, nullable=False):
+    return Column(name, Integer, ForeignKey(target), nullable=nullable)
+
+
+# =====================================================
+# 테이블 (m0001 시점)
+# =====================================================
+Table(
+    "user", metadata,
+    _id(),
+    Column("student_id", String(20), nullable=False),
+    Column("name", String(50), nullable=False),
+    Column("email", String(120), nullable=False, unique=True),
+    Column("username", String(50), nullable=False, unique=True),
+    Column("password_hash", String(255), nullable=False),
+    Column("user_type", String(20), nullable=False),
+    Column("profile_image", String(255)),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "courses", metadata,
+    _id(),
+    Column("title", String(100), nullable=False),
+    Column("code", String(20), nullable=False, unique=True),
+    _fk("professor_id", "user.id"),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "enrollments", metadata,
+    _id(),
+    _fk("student_id", "user.id"),
+    _fk("course_id", "courses.id"),
+    Column("enrolled_at", DateTime),
+)
+
+Table(
+    "team_recruitments", metadata,
+    _id(),
+    Column("course_id", String(20), nullable=False),
+    _fk("author_id", "user.id"),
+    Column("title", String(200), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("team_board_name", String(100)),
+    Column("max_members", Integer, nullable=False),
+    Column("is_board_activated", Boolean),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "team_recruitment_members", metadata,
+    _id(),
+    _fk("recruitment_id", "team_recruitments.id"),
+    _fk("user_id", "user.id"),
+    Column("joined_at", DateTime),
+)
+
+Table(
+    "available_times", metadata,
+    _id(),
+    _fk("user_id", "user.id"),
+    _fk("team_id", "team_recruitments.id", nullable=True),
+    Column("day_of_week", String(10), nullable=False),
+    Column("start_time", Time, nullable=False),
+    Column("end_time", Time, nullable=False),
+)
+
+Table(
+    "team_availability_submissions", metadata,
+    _id(),
+    _fk("team_id", "team_recruitments.id"),
+    _fk("user_id", "user.id"),
+    Column("submitted_at", DateTime),
+    UniqueConstraint("team_id", "user_id", name="uq_team_user_submission"),
+)
+
+Table(
+    "schedules", metadata,
+    _id(),
+    _fk("user_id", "user.id"),
+    Column("title", String(200), nullable=False),
+    Column("date", Integer, nullable=False),
+    Column("month", Integer, nullable=False),
+    Column("year", Integer, nullable=False),
+    Column("start_time", Time),
+    Column("end_time", Time),
+    Column("color", String(20), nullable=False),
+    Column("category", String(50)),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "course_board_posts", metadata,
+    _id(),
+    Column("course_id", String(20), nullable=False),
+    _fk("author_id", "user.id", nullable=True),
+    Column("title", String(200), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("category", String(50), nullable=False),
+    Column("team_board_name", String(100)),
+    Column("files", Text),
+    Column("is_pinned", Boolean, nullable=False),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "course_board_comments", metadata,
+    _id(),
+    _fk("post_id", "course_board_posts.id"),
+    _fk("author_id", "user.id"),
+    _fk("parent_comment_id", "course_board_comments.id", nullable=True),
+    Column("content", Text, nullable=False),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "course_board_likes", metadata,
+    _id(),
+    _fk("post_id", "course_board_posts.id"),
+    _fk("user_id", "user.id"),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "course_board_comment_likes", metadata,
+    _id(),
+    _fk("comment_id", "course_board_comments.id"),
+    _fk("user_id", "user.id"),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "notifications", metadata,
+    _id(),
+    _fk("user_id", "user.id"),
+    Column("type", String(50), nullable=False),
+    Column("content", String(500), nullable=False),
+    Column("related_id", Integer),
+    Column("comment_id", Integer),
+    Column("course_id", String(20)),
+    Column("is_read", Boolean),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "polls", metadata,
+    _id(),
+    _fk("post_id", "course_board_posts.id"),
+    Column("question", String(500), nullable=False),
+    Column("expires_at", DateTime),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "poll_options", metadata,
+    _id(),
+    _fk("poll_id", "polls.id"),
+    Column("text", String(200), nullable=False),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "poll_votes", metadata,
+    _id(),
+    _fk("poll_id", "polls.id"),
+    _fk("option_id", "poll_options.id"),
+    _fk("user_id", "user.id"),
+    Column("created_at", DateTime),
+    UniqueConstraint("poll_id", "user_id", name="unique_poll_user_vote"),
+)
+
+Table(
+    "revoked_tokens", metadata,
+    _id(),
+    Column("jti", String(36), nullable=False),
+    Column("token_type", String(10), nullable=False),
+    Column("user_id", Integer),
+    Column("expires_at", DateTime, nullable=False),
+    Column("revoked_at", DateTime),
+)
+
+# =====================================================
+# 인덱스 (m0001 시점)
+# =====================================================
+INDEXES = (
+    index("ix_available_times_user_team_day", "available_times", "user_id", "team_id", "day_of_week"),
+    index("ix_available_times_team_id", "available_times", "team_id"),
+    index("ix_courses_professor_id", "courses", "professor_id"),
+    index("uq_enrollments_student_course", "enrollments", "student_id", "course_id", unique=True),
+    index("ix_enrollments_course_id", "enrollments", "course_id"),
+    index("ix_course_board_posts_author_id", "course_board_posts", "author_id"),
+    index("ix_posts_course_pinned_id", "course_board_posts", "course_id", "is_pinned", "id"),
+    index("ix_posts_course_category_team", "course_board_posts", "course_id", "category", "team_board_name"),
+    index("ix_comments_post_created", "course_board_comments", "post_id", "created_at"),
+    index("ix_course_board_comments_author_id", "course_board_comments", "author_id"),
+    index("ix_course_board_comments_parent_comment_id", "course_board_comments", "parent_comment_id"),
+    index("uq_post_likes_post_user", "course_board_likes", "post_id", "user_id", unique=True),
+    index("ix_post_likes_user_id", "course_board_likes", "user_id"),
+    index("uq_comment_likes_comment_user", "course_board_comment_likes", "comment_id", "user_id", unique=True),
+    index("ix_comment_likes_user_id", "course_board_comment_likes", "user_id"),
+    index("ix_recruitments_course_id", "team_recruitments", "course_id", "id"),
+    index("ix_team_recruitments_author_id", "team_recruitments", "author_id"),
+    index("uq_team_members_recruitment_user", "team_recruitment_members", "recruitment_id", "user_id", unique=True),
+    index("ix_team_members_user_id", "team_recruitment_members", "user_id"),
+    index("ix_schedules_user_year_month", "schedules", "user_id", "year", "month"),
+    index("ix_notifications_user_created", "notifications", "user_id", "created_at"),
+    index("ix_notifications_user_unread", "notifications", "user_id", "is_read"),
+    index("ix_polls_post_id", "polls", "post_id"),
+    index("ix_poll_options_poll_id", "poll_options", "poll_id"),
+    index("ix_poll_votes_option_id", "poll_votes", "option_id"),
+    index("ix_poll_votes_user_id", "poll_votes", "user_id"),
+    index("ix_revoked_tokens_jti", "revoked_tokens", "jti", unique=True),
+    index("ix_revoked_tokens_expires_at", "revoked_tokens", "expires_at"),
+)
+
+RECOUNT_MEMBERS_SQL = (
+    "UPDATE team_recruitments SET member_count = ("
+    " SELECT COUNT(*) FROM team_recruitment_members m"
+    " WHERE m.recruitment_id = team_recruitments.id)"
+)
+
+
+def upgrade(connection):
+    # 없는 테이블만 만든다 (이미 있는 테이블은 건드리지 않음)
+    metadata.create_all(connection)
+
+    add_column(connection, "course_board_posts", "is_pinned", "BOOLEAN DEFAULT 0")
+    # SQLite 는 ALTER TABLE 로 외래 키를 추가할 수 없으므로 컬럼만 추가
+    add_column(connection, "available_times", "team_id", "INTEGER")
+    add_column(connection, "schedules", "start_time", "TIME")
+    add_column(connection, "schedules", "end_time", "TIME")
+
+    removed = dict(ensure_indexes(connection, INDEXES))
+    # 중복 참여 행을 지웠으면 참여 인원 수도 다시 센다 (member_count 가 이미 있는 DB 만 — 없으면 m0003 이 채움)
+    if removed.get("uq_team_members_recruitment_user") and has_column(connection, "team_recruitments", "member_count"):
+        connection.execute(text(RECOUNT_MEMBERS_SQL))
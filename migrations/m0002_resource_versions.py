@@ -0,0 +1,18 @@
+"""
+조건부 GET(ETag)용 리소스 버전 카운터 테이블.
+"""
+from sqlalchemy import Column, Integer, MetaData, String, Table
+
+DESCRIPTION = "리소스 버전 카운터 (resource_versions)"
+
+metadata = MetaData()
+
+Table(
+    "resource_versions", metadata,
+    Column("name", String(120), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection)
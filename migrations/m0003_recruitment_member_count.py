@@ -0,0 +1,19 @@
+"""
+팀 모집글 참여 인원 수 컬럼 (빈 자리 필터용).
+"""
+from sqlalchemy import text
+
+from migrations import add_column
+
+DESCRIPTION = "team_recruitments.member_count 추가 및 채우기"
+
+
+def upgrade(connection):
+    add_column(connection, "team_recruitments", "member_count", "INTEGER NOT NULL DEFAULT 0")
+    connection.execute(
+        text(
+            "UPDATE team_recruitments SET member_count = ("
+            " SELECT COUNT(*) FROM team_recruitment_members m"
+            " WHERE m.recruitment_id = team_recruitments.id)"
+        )
+    )
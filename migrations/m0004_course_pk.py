@@ -0,0 +1,32 @@
+"""
+게시글 / 팀 모집글 / 알림에 정수 강의 id(course_pk) 추가.
+
+기존 course_id(강의 코드 문자열)는 그대로 두고, courses.code 로 찾아 course_pk 를 채운다.
+목록 조회는 (course_pk, ...) 정수 인덱스를 쓴다.
+"""
+from sqlalchemy import text
+
+from migrations import add_column
+
+DESCRIPTION = "course_pk 정수 외래 키 추가 및 채우기"
+
+TABLES = ("course_board_posts", "team_recruitments", "notifications")
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_posts_course_pk_pinned_id ON course_board_posts (course_pk, is_pinned, id)",
+    "CREATE INDEX IF NOT EXISTS ix_recruitments_course_pk_id ON team_recruitments (course_pk, id)",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_course_pk ON notifications (course_pk)",
+)
+
+
+def upgrade(connection):
+    for table in TABLES:
+        add_column(connection, table, "course_pk", "INTEGER REFERENCES courses (id) ON DELETE SET NULL")
+        connection.execute(
+            text(
+                f"UPDATE {table} SET course_pk = (SELECT courses.id FROM courses WHERE courses.code = {table}.course_id)"
+                " WHERE course_pk IS NULL AND course_id IS NOT NULL"
+            )
+        )
+    for ddl in INDEXES:
+        connection.execute(text(ddl))
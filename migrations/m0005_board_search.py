@@ -0,0 +1,76 @@
+"""
+게시판 전문 검색 색인 (SQLite FTS5 가상 테이블 + 동기화 트리거).
+
+SQLite 가 아닌 DB 에서는 아무것도 하지 않는다 (검색 API 가 501 을 돌려준다).
+DDL 은 이 마이그레이션 시점 그대로 고정해 둔다 (services/board_search.py 를 읽지 않는다).
+"""
+import logging
+
+from sqlalchemy import text
+
+from migrations import has_table
+
+DESCRIPTION = "게시판 전문 검색 색인 (board_search, FTS5)"
+
+logger = logging.getLogger(__name__)
+
+_SCOPE = "'c' || {post}.course_pk || ' k' || {post}.category"
+
+CREATE_TABLE = (
+    "CREATE VIRTUAL TABLE board_search USING fts5("
+    " title, content, scope, post_id UNINDEXED, kind UNINDEXED,"
+    " tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "INSERT INTO board_search (board_search, rank) VALUES ('rank', 'bm25(5.0, 1.0, 0.0)')",
+)
+
+TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_post_ai AFTER INSERT ON course_board_posts BEGIN
+        INSERT INTO board_search (rowid, title, content, scope, post_id, kind)
+        VALUES (new.id * 2, new.title, new.content, {_SCOPE.format(post="new")}, new.id, 'post');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_post_au AFTER UPDATE OF title, content, category, course_pk
+    ON course_board_posts BEGIN
+        DELETE FROM board_search WHERE rowid = old.id * 2;
+        INSERT INTO board_search (rowid, title, content, scope, post_id, kind)
+        VALUES (new.id * 2, new.title, new.content, {_SCOPE.format(post="new")}, new.id, 'post');
+        UPDATE board_search SET scope = {_SCOPE.format(post="new")}
+        WHERE rowid IN (SELECT id * 2 + 1 FROM course_board_comments WHERE post_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS board_search_post_ad AFTER DELETE ON course_board_posts BEGIN
+        DELETE FROM board_search WHERE rowid = old.id * 2
+            OR rowid IN (SELECT id * 2 + 1 FROM course_board_comments WHERE post_id = old.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_comment_ai AFTER INSERT ON course_board_comments BEGIN
+        INSERT INTO board_search (rowid, title, content, scope, post_id, kind)
+        SELECT new.id * 2 + 1, NULL, new.content, {_SCOPE.format(post="p")}, new.post_id, 'comment'
+        FROM course_board_posts p WHERE p.id = new.post_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_comment_au AFTER UPDATE OF content ON course_board_comments BEGIN
+        DELETE FROM board_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO board_search (rowid, title, content, scope, post_id, kind)
+        SELECT new.id * 2 + 1, NULL, new.content, {_SCOPE.format(post="p")}, new.post_id, 'comment'
+        FROM course_board_posts p WHERE p.id = new.post_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS board_search_comment_ad AFTER DELETE ON course_board_comments BEGIN
+        DELETE FROM board_search WHERE rowid = old.id * 2 + 1;
+    END""",
+)
+
+FILL = (
+    f"""INSERT INTO board_search (rowid, title, content, scope, post_id, kind)
+        SELECT p.id * 2, p.title, p.content, {_SCOPE.format(post="p")}, p.id, 'post'
+        FROM course_board_posts p""",
+    f"""INSERT INTO board_search (rowid, title, content, scope, post_id, kind)
+        SELECT c.id * 2 + 1, NULL, c.content, {_SCOPE.format(post="p")}, c.post_id, 'comment'
+        FROM course_board_comments c JOIN course_board_posts p ON p.id = c.post_id""",
+    "INSERT INTO board_search (board_search) VALUES ('optimize')",
+)
+
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        logger.warning("SQLite 가 아니므로 게시판 검색 색인을 만들지 않습니다.")
+        return
+    created = not has_table(connection, "board_search")
+    for sql in (CREATE_TABLE if created else ()) + TRIGGERS + (FILL if created else ()):
+        connection.execute(text(sql))
@@ -0,0 +1,39 @@
+"""
+revoked_tokens.id 를 재사용하지 않도록 (SQLite AUTOINCREMENT).
+
+워커들은 폐기 토큰을 id 증분으로 동기화한다. AUTOINCREMENT 가 없는 SQLite 테이블은 가장 큰 id 의 행이
+지워지면(만료 정리) 그 id 를 다시 쓰므로, 이미 그 id 까지 읽은 다른 워커가 새로 폐기된 토큰을 놓친다.
+SQLite 는 기존 테이블에 AUTOINCREMENT 를 붙일 수 없어서 새 테이블로 옮긴다.
+다른 DB 의 시퀀스는 원래 재사용하지 않으므로 아무것도 하지 않는다.
+"""
+from sqlalchemy import text
+
+DESCRIPTION = "revoked_tokens id 재사용 방지 (SQLite AUTOINCREMENT)"
+
+STATEMENTS = (
+    """CREATE TABLE revoked_tokens_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        jti VARCHAR(36) NOT NULL,
+        token_type VARCHAR(10) NOT NULL,
+        user_id INTEGER,
+        expires_at DATETIME NOT NULL,
+        revoked_at DATETIME)""",
+    """INSERT INTO revoked_tokens_new (id, jti, token_type, user_id, expires_at, revoked_at)
+        SELECT id, jti, token_type, user_id, expires_at, revoked_at FROM revoked_tokens""",
+    "DROP TABLE revoked_tokens",
+    "ALTER TABLE revoked_tokens_new RENAME TO revoked_tokens",
+    "CREATE UNIQUE INDEX ix_revoked_tokens_jti ON revoked_tokens (jti)",
+    "CREATE INDEX ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)",
+)
+
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    ddl = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'revoked_tokens'")
+    ).scalar()
+    if ddl is None or "AUTOINCREMENT" in ddl.upper():
+        return
+    for sql in STATEMENTS:
+        connection.execute(text(sql))
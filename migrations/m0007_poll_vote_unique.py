@@ -0,0 +1,32 @@
+"""
+투표는 (poll, user) 당 한 표 — poll_votes 유니크 인덱스.
+
+unique_poll_user_vote 제약은 테이블을 새로 만들 때만 붙으므로, 그 전에 만들어진 DB 에는 없을 수 있다.
+그런 DB 에만 같은 키로 유니크 인덱스를 만들어 동시에 들어온 첫 투표가 두 행이 되지 않게 한다
+(제약이 이미 있으면 같은 일을 하는 인덱스를 하나 더 두지 않는다).
+이미 쌓인 중복 행은 인덱스를 만들기 전에 정리한다 (id 가 가장 작은 행만 남김, 지운 행은 로그에 남김).
+"""
+from sqlalchemy import inspect
+
+from migrations import has_table
+from services.schema_indexes import ensure_indexes, index
+
+DESCRIPTION = "poll_votes (poll_id, user_id) 유니크 인덱스"
+
+KEY = ["poll_id", "user_id"]
+
+INDEXES = (
+    index("uq_poll_votes_poll_user", "poll_votes", *KEY, unique=True),
+)
+
+
+def _has_unique_key(connection):
+    inspector = inspect(connection)
+    if any(c["column_names"] == KEY for c in inspector.get_unique_constraints("poll_votes")):
+        return True
+    return any(ix["unique"] and ix["column_names"] == KEY for ix in inspector.get_indexes("poll_votes"))
+
+
+def upgrade(connection):
+    if has_table(connection, "poll_votes") and not _has_unique_key(connection):
+        ensure_indexes(connection, INDEXES)
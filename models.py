@@ -1,6 +1,14 @@
+import logging
+
+from sqlalchemy import event
+
 from extensions import db
+from services.availability import format_end_time
+from services.identity import get_user_summaries
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.String(20), nullable=False)
@@ -30,19 +38,27 @@ class AvailableTime(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey("team_recruitments.id"), nullable=True)  # null이면 대시보드용, 값이 있으면 해당 팀용
     day_of_week = db.Column(db.String(10), nullable=False)
     start_time = db.Column(db.Time, nullable=False)
     end_time = db.Column(db.Time, nullable=False)
 
     user = db.relationship("User", backref=db.backref("available_times", lazy=True))
+    team = db.relationship("TeamRecruitment", backref=db.backref("team_available_times", lazy=True))
+
+    __table_args__ = (
+        db.Index("ix_available_times_user_team_day", "user_id", "team_id", "day_of_week"),
+        db.Index("ix_available_times_team_id", "team_id"),
+    )
 
     def to_dict(self):
         return {
             "id": self.id,
             "user_id": self.user_id,
+            "team_id": self.team_id,
             "day_of_week": self.day_of_week,
             "start_time": self.start_time.strftime("%H:%M"),
-            "end_time": self.end_time.strftime("%H:%M"),
+            "end_time": format_end_time(self.end_time),
         }
 
 # 강의
@@ -52,7 +68,7 @@ class Course(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     code = db.Column(db.String(20), nullable=False, unique=True)
-    professor_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    professor_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
 
     professor = db.relationship("User", backref=db.backref("courses", lazy=True))
@@ -79,6 +95,11 @@ class Enrollment(db.Model):
     student = db.relationship("User", backref=db.backref("enrollments", lazy=True))
     course = db.relationship("Course", backref=db.backref("enrollments", lazy=True))
 
+    __table_args__ = (
+        db.Index("uq_enrollments_student_course", "student_id", "course_id", unique=True),
+        db.Index("ix_enrollments_course_id", "course_id"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -94,7 +115,9 @@ class CourseBoardPost(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     course_id = db.Column(db.String(20), nullable=False)
-    author_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    # 강의 정수 id (course_id 코드로 저장 시 자동 채움 — 아래 _fill_course_pk)
+    course_pk = db.Column(db.Integer, db.ForeignKey("courses.id", ondelete="SET NULL"), nullable=True)
+    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), index=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
     category = db.Column(db.String(50), nullable=False)
@@ -105,6 +128,15 @@ class CourseBoardPost(db.Model):
 
     author = db.relationship("User")
 
+    __table_args__ = (
+        # 게시판 목록: course_id 로 거르고 고정 여부 → 최신순 정렬
+        db.Index("ix_posts_course_pinned_id", "course_id", "is_pinned", "id"),
+        # 카테고리/팀 게시판 조회, 카테고리별 고정 해제
+        db.Index("ix_posts_course_category_team", "course_id", "category", "team_board_name"),
+        # 게시판 목록 (정수 강의 id)
+        db.Index("ix_posts_course_pk_pinned_id", "course_pk", "is_pinned", "id"),
+    )
+
     def to_dict(self, user_id=None):
         # 좋아요 개수 계산
         likes_count = CourseBoardLike.query.filter_by(post_id=self.id).count()
@@ -163,33 +195,24 @@ class CourseBoardPost(db.Model):
                     options_data = []
                     total_votes = 0
                     if hasattr(poll, 'options_relation') and PollVote:
+                        all_votes = PollVote.query.filter_by(poll_id=poll.id).all()
+                        voter_summaries = get_user_summaries([v.user_id for v in all_votes])
                         for option in poll.options_relation:
-                            votes = PollVote.query.filter_by(option_id=option.id).all()
+                            votes = [v for v in all_votes if v.option_id == option.id]
                             votes_count = len(votes)
                             total_votes += votes_count
                             
-                            # 투표한 사용자 정보
+                            # 투표한 사용자 정보 (요약에는 학생인 경우에만 student_id 가 들어 있음)
                             voters = []
                             for vote in votes:
-                                user = User.query.get(vote.user_id)
+                                user = voter_summaries.get(vote.user_id)
                                 if user:
-                                    # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
-                                    author_student_id = None
-                                    user_type = getattr(user, "user_type", None)
-                                    if user_type == "student":
-                                        author_student_id = user.student_id
-                                    # 봇 계정의 경우 student_id 숨김
-                                    elif user_type == "bot":
-                                        author_student_id = None
-                                    
-                                    is_professor = user_type == "professor"
-                                    
                                     voters.append({
-                                        "id": user.id,
-                                        "name": user.name,
-                                        "student_id": author_student_id,
-                                        "is_professor": is_professor,
-                                        "profile_image": user.profile_image
+                                        "id": user["id"],
+                                        "name": user["name"],
+                                        "student_id": user["student_id"],
+                                        "is_professor": user["user_type"] == "professor",
+                                        "profile_image": user["profile_image"]
                                     })
                             
                             options_data.append({
@@ -207,10 +230,9 @@ class CourseBoardPost(db.Model):
                         "user_vote": user_vote,
                         "expires_at": poll.expires_at.isoformat() if poll.expires_at else None
                     }
-        except Exception as e:
+        except Exception:
             # Poll 모델이 없거나 오류 발생 시 None 반환
-            import traceback
-            print(f"Poll 데이터 조회 오류 (게시글 ID: {self.id}): {str(e)}")
+            logger.exception("Poll 데이터 조회 오류 (게시글 ID: %s)", self.id)
             poll_data = None
         
         return {
@@ -240,14 +262,16 @@ class CourseBoardComment(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id"), nullable=False)
-    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    parent_comment_id = db.Column(db.Integer, db.ForeignKey("course_board_comments.id"), nullable=True)
+    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    parent_comment_id = db.Column(db.Integer, db.ForeignKey("course_board_comments.id"), nullable=True, index=True)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.now)
 
     author = db.relationship("User")
     post = db.relationship("CourseBoardPost", backref=db.backref("board_comments", lazy=True))
 
+    __table_args__ = (db.Index("ix_comments_post_created", "post_id", "created_at"),)
+
     def to_dict(self, user_id=None):
         # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
         author_student_id = None
@@ -299,6 +323,11 @@ class CourseBoardLike(db.Model):
     user = db.relationship("User")
     post = db.relationship("CourseBoardPost", backref=db.backref("board_likes", lazy=True))
 
+    __table_args__ = (
+        db.Index("uq_post_likes_post_user", "post_id", "user_id", unique=True),
+        db.Index("ix_post_likes_user_id", "user_id"),
+    )
+
 
 # 댓글 좋아요
 class CourseBoardCommentLike(db.Model):
@@ -312,6 +341,11 @@ class CourseBoardCommentLike(db.Model):
     user = db.relationship("User")
     comment = db.relationship("CourseBoardComment", backref=db.backref("comment_likes", lazy=True))
 
+    __table_args__ = (
+        db.Index("uq_comment_likes_comment_user", "comment_id", "user_id", unique=True),
+        db.Index("ix_comment_likes_user_id", "user_id"),
+    )
+
 
 # 팀 모집
 class TeamRecruitment(db.Model):
@@ -320,94 +354,29 @@ class TeamRecruitment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     # 강의 코드 사용 (CourseBoardPost.course_id 와 동일한 형태)
     course_id = db.Column(db.String(20), nullable=False)
-    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    course_pk = db.Column(db.Integer, db.ForeignKey("courses.id", ondelete="SET NULL"), nullable=True)
+    author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     team_board_name = db.Column(db.String(100), nullable=True)
     max_members = db.Column(db.Integer, nullable=False, default=3)
     is_board_activated = db.Column(db.Boolean, default=False)  # 팀 게시판 활성화 여부
+    # 참여 인원 수 (참여자 추가/삭제와 같은 트랜잭션에서 services.recruitments.sync_member_counts 로 갱신)
+    member_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=datetime.now)
 
     author = db.relationship("User")
 
+    __table_args__ = (
+        db.Index("ix_recruitments_course_id", "course_id", "id"),
+        db.Index("ix_recruitments_course_pk_id", "course_pk", "id"),
+    )
+
     def to_dict(self, user_id=None):
-        # 현재 모집에 참여한 멤버들
-        members = TeamRecruitmentMember.query.filter_by(recruitment_id=self.id).all()
-        members_list = [m.user.name for m in members if m.user]
-        members_data = []
-        for m in members:
-            if m.user:
-                # 교수인 경우에는 학번(student_id) 숨기기
-                student_id = None
-                if getattr(m.user, "user_type", None) == "student":
-                    student_id = m.user.student_id
-                
-                # 교수 여부 확인
-                is_professor_member = False
-                if getattr(m.user, "user_type", None) == "professor":
-                    is_professor_member = True
-
-                members_data.append(
-                    {
-                        "user_id": m.user.id,
-                        "name": m.user.name,
-                        "student_id": student_id,
-                        "is_professor": is_professor_member,
-                        "profile_image": m.user.profile_image,
-                    }
-                )
-            else:
-                members_data.append(
-                    {
-                        "user_id": None,
-                        "name": "익명",
-                        "student_id": None,
-                        "is_professor": False,
-                        "profile_image": None,
-                    }
-                )
+        # 목록과 같은 직렬화를 쓴다 (참여자 + 사용자 조인 쿼리 한 번)
+        from services.recruitments import serialize_recruitments
 
-        # 현재 유저가 참여 중인지 확인
-        is_joined = False
-        if user_id is not None:
-            is_joined = TeamRecruitmentMember.query.filter_by(
-                recruitment_id=self.id, user_id=user_id
-            ).first() is not None
-
-        # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
-        author_student_id = None
-        if self.author:
-            user_type = getattr(self.author, "user_type", None)
-            if user_type == "student":
-                author_student_id = self.author.student_id
-            # 봇 계정의 경우 student_id 숨김
-            elif user_type == "bot":
-                author_student_id = None
-        
-        # 교수 여부 확인
-        is_professor = False
-        if self.author and getattr(self.author, "user_type", None) == "professor":
-            is_professor = True
-
-        return {
-            "id": self.id,
-            "course_id": self.course_id,
-            "author_id": self.author_id,
-            "author": self.author.name if self.author else "익명",
-            "author_student_id": author_student_id,
-            "is_professor": is_professor,
-            "author_profile_image": self.author.profile_image if self.author else None,
-            "title": self.title,
-            "description": self.description,
-            "team_board_name": self.team_board_name,
-            "max_members": self.max_members,
-            "current_members": len(members_list),
-            "members_list": members_list,
-            "members": members_data,
-            "is_joined": is_joined,
-            "is_board_activated": self.is_board_activated,
-            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M"),
-        }
+        return serialize_recruitments([self], user_id=user_id)[0]
 
 
 # 팀 모집 참여자
@@ -424,6 +393,11 @@ class TeamRecruitmentMember(db.Model):
         "TeamRecruitment", backref=db.backref("members", lazy=True)
     )
 
+    __table_args__ = (
+        db.Index("uq_team_members_recruitment_user", "recruitment_id", "user_id", unique=True),
+        db.Index("ix_team_members_user_id", "user_id"),
+    )
+
 
 # 개인 일정
 class Schedule(db.Model):
@@ -435,12 +409,16 @@ class Schedule(db.Model):
     date = db.Column(db.Integer, nullable=False)  # 1-31
     month = db.Column(db.Integer, nullable=False)  # 1-12
     year = db.Column(db.Integer, nullable=False)
+    start_time = db.Column(db.Time, nullable=True)  # 시간이 없으면 종일 일정 (가능한 시간에서 빼지 않음)
+    end_time = db.Column(db.Time, nullable=True)
     color = db.Column(db.String(20), nullable=False, default='#a8d5e2')
     category = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
 
     user = db.relationship("User", backref=db.backref("schedules", lazy=True))
 
+    __table_args__ = (db.Index("ix_schedules_user_year_month", "user_id", "year", "month"),)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -449,6 +427,8 @@ class Schedule(db.Model):
             "date": self.date,
             "month": self.month,
             "year": self.year,
+            "start_time": self.start_time.strftime("%H:%M") if self.start_time else None,
+            "end_time": self.end_time.strftime("%H:%M") if self.end_time else None,
             "color": self.color,
             "category": self.category,
             "created_at": self.created_at.strftime("%Y-%m-%d %H:%M")
@@ -466,11 +446,17 @@ class Notification(db.Model):
     related_id = db.Column(db.Integer, nullable=True)  # 관련 게시글 ID
     comment_id = db.Column(db.Integer, nullable=True)  # 관련 댓글 ID (댓글/답글 알림인 경우)
     course_id = db.Column(db.String(20), nullable=True)  # 관련 강의 코드
+    course_pk = db.Column(db.Integer, db.ForeignKey("courses.id", ondelete="SET NULL"), nullable=True, index=True)
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.now)
 
     user = db.relationship("User", backref=db.backref("notifications", lazy=True))
 
+    __table_args__ = (
+        db.Index("ix_notifications_user_created", "user_id", "created_at"),
+        db.Index("ix_notifications_user_unread", "user_id", "is_read"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -488,7 +474,7 @@ class Poll(db.Model):
     __tablename__ = "polls"
 
     id = db.Column(db.Integer, primary_key=True)
-    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id"), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey("course_board_posts.id"), nullable=False, index=True)
     question = db.Column(db.String(500), nullable=False)
     expires_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
@@ -500,7 +486,7 @@ class PollOption(db.Model):
     __tablename__ = "poll_options"
 
     id = db.Column(db.Integer, primary_key=True)
-    poll_id = db.Column(db.Integer, db.ForeignKey("polls.id"), nullable=False)
+    poll_id = db.Column(db.Integer, db.ForeignKey("polls.id"), nullable=False, index=True)
     text = db.Column(db.String(200), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.now)
 
@@ -512,15 +498,18 @@ class PollVote(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     poll_id = db.Column(db.Integer, db.ForeignKey("polls.id"), nullable=False)
-    option_id = db.Column(db.Integer, db.ForeignKey("poll_options.id"), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    option_id = db.Column(db.Integer, db.ForeignKey("poll_options.id"), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
 
     poll = db.relationship("Poll", backref=db.backref("votes_relation", lazy=True))
     option = db.relationship("PollOption", backref=db.backref("votes_relation", lazy=True))
     user = db.relationship("User", backref=db.backref("poll_votes", lazy=True))
 
-    __table_args__ = (db.UniqueConstraint('poll_id', 'user_id', name='unique_poll_user_vote'),)
+    # 예전에 만들어진 DB 에 이 제약이 없으면 m0007 이 같은 키로 유니크 인덱스(uq_poll_votes_poll_user)를 만든다
+    __table_args__ = (
+        db.UniqueConstraint('poll_id', 'user_id', name='unique_poll_user_vote'),
+    )
 
 # 팀 가능 시간 제출 이력
 class TeamAvailabilitySubmission(db.Model):
@@ -536,4 +525,48 @@ class TeamAvailabilitySubmission(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     submitted_at = db.Column(db.DateTime, default=datetime.now)
 
-    __table_args__ = (db.UniqueConstraint("team_id", "user_id", name="uq_team_user_submission"),)
\ No newline at end of file
+    __table_args__ = (db.UniqueConstraint("team_id", "user_id", name="uq_team_user_submission"),)
+
+
+# 폐기된 JWT (로그아웃 / refresh token 회전)
+class RevokedToken(db.Model):
+    """
+    폐기된 토큰의 jti 만 보관하는 테이블.
+    토큰이 원래 만료되는 시각(expires_at)이 지나면 더 이상 검사할 필요가 없으므로 정리 대상이 된다.
+    워커들이 id 증분으로 동기화하므로 id 는 재사용되면 안 된다 (SQLite AUTOINCREMENT, m0006).
+    """
+    __tablename__ = "revoked_tokens"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True, index=True)
+    token_type = db.Column(db.String(10), nullable=False)  # 'access' or 'refresh'
+    user_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.now)
+
+
+# 리소스 버전 (조건부 GET 용 ETag)
+class ResourceVersion(db.Model):
+    """
+    'board:<강의 코드>' 같은 리소스 이름별 변경 카운터.
+    쓰기 경로에서 services.resource_versions.bump_versions 로 올리고, 조회 시 ETag 계산에만 사용한다.
+    """
+    __tablename__ = "resource_versions"
+
+    name = db.Column(db.String(120), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# =====================================================
+# 강의 코드 → 정수 id (course_pk) 자동 채움
+# =====================================================
+def _fill_course_pk(_mapper, connection, target):
+    if target.course_pk is None and target.course_id:
+        from services.course_lookup import course_pk_for
+
+        target.course_pk = course_pk_for(target.course_id, connection)
+
+
+for _model in (CourseBoardPost, TeamRecruitment, Notification):
+    event.listen(_model, "before_insert", _fill_course_pk)
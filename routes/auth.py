@@ -1,8 +1,15 @@
 from flask import Blueprint, request, jsonify
-from extensions import db, bcrypt
+from extensions import db, password_hasher, rate_limiter
 from models import User
-from flask_jwt_extended import create_access_token
-from datetime import timedelta
+from flask_jwt_extended import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_jwt,
+    jwt_required,
+)
+from services.token_revocation import revocation_store
+from sqlalchemy.exc import IntegrityError
 import secrets
 import string
 
@@ -28,7 +35,7 @@ def register():
     if User.query.filter_by(username=data["username"]).first():
         return jsonify({"message": "이미 존재하는 아이디입니다."}), 400
 
-    hashed_pw = bcrypt.generate_password_hash(data["password"]).decode("utf-8")
+    hashed_pw = password_hasher.hash_password(data["password"])
 
     new_user = User(
         student_id=data["studentId"],
@@ -52,6 +59,7 @@ def register():
 # 로그인
 # =====================================================
 @auth_bp.route("/login", methods=["POST"])
+@rate_limiter.limit("login", account_field="email")
 def login():
     data = request.get_json()
     username_or_email = data.get("email")
@@ -61,23 +69,81 @@ def login():
         (User.email == username_or_email) | (User.username == username_or_email)
     ).first()
 
-    if not user or not bcrypt.check_password_hash(user.password_hash, password):
+    if not user:
+        return jsonify({"message": "잘못된 이메일/아이디 또는 비밀번호입니다."}), 401
+
+    # 비밀번호 검증 (cost 설정이 바뀐 경우 자동으로 재해시)
+    is_valid, rehashed = password_hasher.verify_and_upgrade(user, password)
+    if not is_valid:
         return jsonify({"message": "잘못된 이메일/아이디 또는 비밀번호입니다."}), 401
+    if rehashed:
+        db.session.commit()
 
-    access_token = create_access_token(identity=str(user.id), expires_delta=timedelta(hours=1))
+    access_token = create_access_token(identity=str(user.id))
+    refresh_token = create_refresh_token(identity=str(user.id))
 
     return jsonify({
         "message": "로그인 성공",
         "access_token": access_token,
+        "refresh_token": refresh_token,
         "user": user.to_dict(),
         "userType": user.user_type
     }), 200
 
 
+# =====================================================
+# 토큰 재발급 (refresh token 회전)
+# =====================================================
+@auth_bp.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    # 사용한 refresh token 은 즉시 폐기하고 새 access/refresh token 을 발급
+    # (폐기된 refresh token 을 다시 쓰면 token_in_blocklist_loader 에서 거부됨)
+    old_token = get_jwt()
+    identity = old_token["sub"]
+
+    revocation_store.revoke(old_token)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # 같은 refresh token 으로 동시에 재발급 요청이 들어온 경우 하나만 성공
+        db.session.rollback()
+        return jsonify({"message": "이미 사용된 토큰입니다."}), 401
+
+    return jsonify({
+        "access_token": create_access_token(identity=identity),
+        "refresh_token": create_refresh_token(identity=identity),
+    }), 200
+
+
+# =====================================================
+# 로그아웃 (현재 토큰 + 함께 보낸 refresh token 폐기)
+# =====================================================
+@auth_bp.route("/logout", methods=["POST"])
+@jwt_required(verify_type=False)
+def logout():
+    revocation_store.revoke(get_jwt())
+
+    data = request.get_json(silent=True) or {}
+    refresh_token = data.get("refresh_token")
+    if refresh_token:
+        try:
+            payload = decode_token(refresh_token)
+        except Exception:
+            payload = None
+        # 본인 토큰만 폐기
+        if payload and payload.get("sub") == get_jwt().get("sub"):
+            revocation_store.revoke(payload)
+
+    db.session.commit()
+    return jsonify({"message": "로그아웃 되었습니다."}), 200
+
+
 # =====================================================
 # 아이디 찾기
 # =====================================================
 @auth_bp.route("/find-id", methods=["POST"])
+@rate_limiter.limit("find_id", account_field="email")
 def find_id():
     data = request.get_json()
     name = data.get("name")
@@ -101,6 +167,7 @@ def find_id():
 # 비밀번호 찾기 (임시 비밀번호 생성)
 # =====================================================
 @auth_bp.route("/reset-password", methods=["POST"])
+@rate_limiter.limit("reset_password", account_field="username")
 def reset_password():
     data = request.get_json()
     username = data.get("username")
@@ -119,7 +186,7 @@ def reset_password():
     temp_password = ''.join(secrets.choice(characters) for _ in range(8))
 
     # 비밀번호 해시화 및 저장
-    hashed_pw = bcrypt.generate_password_hash(temp_password).decode("utf-8")
+    hashed_pw = password_hasher.hash_password(temp_password)
     user.password_hash = hashed_pw
     db.session.commit()
 
@@ -1,6 +1,8 @@
+import logging
+
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from extensions import db, bcrypt
+from flask_jwt_extended import jwt_required, current_user
+from extensions import db, password_hasher
 from models import (
     AvailableTime,
     User,
@@ -10,13 +12,34 @@ from models import (
     Poll,
     PollOption,
     Notification,
-    Course,
 )
 from models import TeamAvailabilitySubmission
-from datetime import datetime
+from services.availability import (
+    DAY_ORDER,
+    build_slot_mask,
+    end_time_to_minutes,
+    mask_to_slot_keys,
+    save_available_interval,
+    time_to_minutes,
+)
+from services.course_lookup import course_title_for
+from services.effective_availability import busy_masks, parse_week, week_start
+from services.identity import get_user_summaries
+from services.metrics import metrics
+from services.resource_versions import (
+    board_key,
+    bump_user_teams,
+    bump_versions,
+    conditional_get,
+    team_key,
+    versioned_key,
+)
+from services.single_flight import coalesce
+from datetime import datetime, time as dt_time
 from collections import defaultdict
 
 available_bp = Blueprint("available", __name__, url_prefix="/available")
+logger = logging.getLogger(__name__)
 
 # 봇 계정 가져오기 또는 생성
 def get_or_create_bot_user():
@@ -32,7 +55,7 @@ def get_or_create_bot_user():
     if not bot_user:
         # 봇 계정이 없으면 생성
         # 봇은 로그인하지 않으므로 임의의 해시된 비밀번호 사용
-        bot_password_hash = bcrypt.generate_password_hash("bot_password_never_used").decode("utf-8")
+        bot_password_hash = password_hasher.hash_password("bot_password_never_used")
         
         bot_user = User(
             student_id=BOT_STUDENT_ID,
@@ -53,21 +76,15 @@ def get_or_create_bot_user():
 def parse_time_str(time_str):
     return datetime.strptime(time_str, "%H:%M").time()
 
-DAY_ORDER = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+def parse_end_time_str(time_str):
+    """끝 시간 문자열 — "24:00" 은 00:00 으로 저장한다 (services.availability.end_time_to_minutes)"""
+    if time_str == "24:00":
+        return dt_time(0, 0)
+    return parse_time_str(time_str)
 
-def _day_index(day_name):
-    try:
-        return DAY_ORDER.index(day_name)
-    except ValueError:
-        return None
-
-def _time_to_minutes(time_obj):
-    return time_obj.hour * 60 + time_obj.minute
-
-def _slot_key(day_index, minutes):
-    hour = minutes // 60
-    minute = minutes % 60
-    return f"{day_index}-{hour}-{minute}"
+def _parse_minutes(time_str):
+    hour, minute = time_str.split(":")
+    return int(hour) * 60 + int(minute)
 
 def _format_time(minutes):
     hour = minutes // 60
@@ -75,21 +92,8 @@ def _format_time(minutes):
     return f"{hour:02d}:{minute:02d}"
 
 def build_time_slots(times):
-    slots = set()
-
-    for time in times:
-        day_index = _day_index(time.day_of_week)
-        if day_index is None:
-            continue
-
-        start = _time_to_minutes(time.start_time)
-        end = _time_to_minutes(time.end_time)
-        for minute in range(start, end, 30):
-            if minute >= 24 * 60:
-                continue
-            slots.add(_slot_key(day_index, minute))
-
-    return slots
+    # 슬롯 경계 처리(시작 내림 / 끝 올림, 끝 00:00 = 24:00)를 팀 편성·일정 마스크와 같게 하려고 비트 마스크로 계산
+    return mask_to_slot_keys(build_slot_mask(times))
 
 def build_daily_blocks_from_slots(slots):
     per_day = defaultdict(list)
@@ -138,11 +142,9 @@ def find_2hour_continuous_slots(daily_blocks):
     
     for day_name, blocks in daily_blocks.items():
         for block in blocks:
-            start_time = parse_time_str(block["start_time"])
-            end_time = parse_time_str(block["end_time"])
-            
-            start_minutes = _time_to_minutes(start_time)
-            end_minutes = _time_to_minutes(end_time)
+            # 하루 끝 블록의 end_time 은 "24:00" 이라 strptime 으로 읽을 수 없다
+            start_minutes = _parse_minutes(block["start_time"])
+            end_minutes = _parse_minutes(block["end_time"])
             duration = end_minutes - start_minutes
             
             # 1시간(60분) 이상인 경우
@@ -166,11 +168,11 @@ def check_all_members_submitted(team_id):
     """
     team_members = TeamRecruitmentMember.query.filter_by(recruitment_id=team_id).all()
     if not team_members:
-        print(f"[DEBUG] 팀 {team_id} 멤버가 없음")
+        logger.debug("팀 %s 멤버가 없음", team_id)
         return False
 
     member_ids = [m.user_id for m in team_members]
-    print(f"[DEBUG] 팀 {team_id} 멤버 수: {len(member_ids)}, 멤버 IDs: {member_ids}")
+    logger.debug("팀 %s 멤버 수: %s, 멤버 IDs: %s", team_id, len(member_ids), member_ids)
 
     # 이 팀에 대해 제출을 완료한 멤버 목록
     submissions = TeamAvailabilitySubmission.query.filter(
@@ -180,23 +182,24 @@ def check_all_members_submitted(team_id):
     submitted_user_ids = {s.user_id for s in submissions}
 
     # 각 멤버가 최소 1번이라도 제출 버튼을 눌렀는지 확인
-    all_submitted = True
-    for member_id in member_ids:
-        user = User.query.get(member_id)
-        user_name = user.name if user else f"User{member_id}"
-        is_submitted = member_id in submitted_user_ids
-        print(f"[DEBUG]   - 멤버 {user_name} (ID: {member_id}): 팀 제출 여부 = {is_submitted}")
-        if not is_submitted:
-            all_submitted = False
-
-    print(f"[DEBUG] 팀 {team_id} 모든 멤버 제출 완료 여부: {all_submitted}")
+    all_submitted = all(member_id in submitted_user_ids for member_id in member_ids)
+    if logger.isEnabledFor(logging.DEBUG):
+        member_summaries = get_user_summaries(member_ids)
+        for member_id in member_ids:
+            user = member_summaries.get(member_id)
+            user_name = user["name"] if user else f"User{member_id}"
+            logger.debug(
+                "멤버 %s (ID: %s): 팀 제출 여부 = %s", user_name, member_id, member_id in submitted_user_ids
+            )
+
+    logger.debug("팀 %s 모든 멤버 제출 완료 여부: %s", team_id, all_submitted)
     return all_submitted
 
 def create_auto_recommend_post(team_id):
     """자동 추천 게시글 생성 (내부 함수)"""
     team_recruitment = TeamRecruitment.query.get(team_id)
     if not team_recruitment:
-        print(f"[DEBUG] 팀을 찾을 수 없음: team_id={team_id}")
+        logger.debug("팀을 찾을 수 없음: team_id=%s", team_id)
         return None
     
     # 이미 같은 제목의 게시글이 있는지 확인 (중복 방지)
@@ -210,13 +213,13 @@ def create_auto_recommend_post(team_id):
     
     if existing_post:
         # 이미 게시글이 있으면 생성하지 않음
-        print(f"[DEBUG] 이미 게시글이 존재함: team_id={team_id}, post_id={existing_post.id}")
+        logger.debug("이미 게시글이 존재함: team_id=%s, post_id=%s", team_id, existing_post.id)
         return None
     
     # 팀 공통 시간 계산
     team_members = TeamRecruitmentMember.query.filter_by(recruitment_id=team_id).all()
     if not team_members:
-        print(f"[DEBUG] 팀 멤버가 없음: team_id={team_id}")
+        logger.debug("팀 멤버가 없음: team_id=%s", team_id)
         return None
     
     member_ids = [m.user_id for m in team_members]
@@ -240,16 +243,6 @@ def create_auto_recommend_post(team_id):
         AvailableTime.team_id.is_(None)  # team_id가 None인 것 (대시보드용)
     ).all()
     
-    print(f"[DEBUG] 팀 {team_id} 시간 데이터 수집:")
-    print(f"[DEBUG]   - 팀 제출 시간: {len(team_submitted_times)}개")
-    print(f"[DEBUG]   - 대시보드 시간: {len(dashboard_times)}개")
-    for member_id in member_ids:
-        member_team_times = [t for t in team_submitted_times if t.user_id == member_id]
-        member_dashboard_times = [t for t in dashboard_times if t.user_id == member_id]
-        user = User.query.get(member_id)
-        user_name = user.name if user else f"User{member_id}"
-        print(f"[DEBUG]   - {user_name} (ID: {member_id}): 팀 시간 {len(member_team_times)}개, 대시보드 시간 {len(member_dashboard_times)}개")
-    
     # 각 멤버별로 팀 제출 시간 또는 대시보드 시간 매핑
     team_user_times = defaultdict(list)
     dashboard_user_times = defaultdict(list)
@@ -260,12 +253,21 @@ def create_auto_recommend_post(team_id):
     for time_slot in dashboard_times:
         dashboard_user_times[time_slot.user_id].append(time_slot)
     
-    print(f"[DEBUG] 팀 멤버 수: {len(team_members)}, 팀 제출 시간 수: {len(team_submitted_times)}, 대시보드 시간 수: {len(dashboard_times)}")
-    print(f"[DEBUG] 제출한 멤버 수: {len(submitted_user_ids)}, 제출한 멤버 IDs: {submitted_user_ids}")
+    logger.debug(
+        "팀 %s 시간 데이터 수집: 팀 멤버 수 %s, 팀 제출 시간 %s개, 대시보드 시간 %s개, 제출한 멤버 IDs %s",
+        team_id,
+        len(team_members),
+        len(team_submitted_times),
+        len(dashboard_times),
+        sorted(submitted_user_ids),
+    )
     
     # 모든 멤버가 제출했는지 확인
     all_members_submitted = len(submitted_user_ids) == len(member_ids) and all(mid in submitted_user_ids for mid in member_ids)
-    print(f"[DEBUG] 모든 멤버 제출 여부: {all_members_submitted}")
+    logger.debug("모든 멤버 제출 여부: %s", all_members_submitted)
+    
+    # 이번 주 개인 일정(시간 지정)이 있는 시간은 추천에서 제외
+    member_busy_masks = busy_masks(member_ids, week_start())
     
     member_slot_sets = []
     for member in team_members:
@@ -286,38 +288,49 @@ def create_auto_recommend_post(team_id):
             times_for_user = dashboard_user_times.get(user.id, [])
             time_source = "dashboard"
         
-        slot_set = build_time_slots(times_for_user)
+        slot_set = build_time_slots(times_for_user) - mask_to_slot_keys(member_busy_masks.get(user.id, 0))
         member_slot_sets.append(slot_set)
-        print(f"[DEBUG] 멤버 {user.name} (ID: {user.id})의 시간 슬롯 수: {len(slot_set)}, 시간 소스: {time_source}, 제출 여부: {member.user_id in submitted_user_ids}, 대시보드 시간: {len(dashboard_user_times.get(user.id, []))}, 팀 시간: {len(team_user_times.get(user.id, []))}")
+        logger.debug(
+            "멤버 %s (ID: %s)의 시간 슬롯 수: %s, 시간 소스: %s, 대시보드 시간: %s, 팀 시간: %s",
+            user.name,
+            user.id,
+            len(slot_set),
+            time_source,
+            len(dashboard_user_times.get(user.id, [])),
+            len(team_user_times.get(user.id, [])),
+        )
     
     if len(member_slot_sets) == 0:
-        print(f"[DEBUG] 멤버 슬롯 세트가 없음: team_id={team_id}")
+        logger.debug("멤버 슬롯 세트가 없음: team_id=%s", team_id)
         return None
     
     # 시간이 있는 멤버만 필터링 (시간이 없는 멤버는 제외하고 공통 시간 계산)
     member_slot_sets_with_time = [s for s in member_slot_sets if len(s) > 0]
     
-    print(f"[DEBUG] 전체 멤버 슬롯 세트 수: {len(member_slot_sets)}, 시간이 있는 멤버 슬롯 세트 수: {len(member_slot_sets_with_time)}")
+    logger.debug("전체 멤버 슬롯 세트 수: %s, 시간이 있는 멤버 슬롯 세트 수: %s", len(member_slot_sets), len(member_slot_sets_with_time))
     
     if len(member_slot_sets_with_time) == 0:
-        print(f"[DEBUG] 시간이 있는 멤버가 없음: team_id={team_id}")
+        logger.debug("시간이 있는 멤버가 없음: team_id=%s", team_id)
         return None
     
     if len(member_slot_sets_with_time) < len(member_slot_sets):
-        print(f"[DEBUG] ⚠️ 일부 멤버({len(member_slot_sets) - len(member_slot_sets_with_time)}명)에게 시간 데이터가 없음. 시간이 있는 멤버들만으로 공통 시간 계산 진행.")
+        logger.debug(
+            "일부 멤버(%s명)에게 시간 데이터가 없음. 시간이 있는 멤버들만으로 공통 시간 계산 진행.",
+            len(member_slot_sets) - len(member_slot_sets_with_time),
+        )
     
     # 공통 시간 계산 (시간이 있는 멤버들 간의 공통 시간)
     member_slot_sets_with_time.sort(key=len)
     base_slots = member_slot_sets_with_time[0]
-    print(f"[DEBUG] 기준 슬롯 세트 크기: {len(base_slots)}")
+    logger.debug("기준 슬롯 세트 크기: %s", len(base_slots))
     
     optimal_slots = {slot for slot in base_slots if all(slot in slots for slots in member_slot_sets_with_time)}
     
-    print(f"[DEBUG] 공통 시간 슬롯 수: {len(optimal_slots)}")
+    logger.debug("공통 시간 슬롯 수: %s", len(optimal_slots))
     
     if len(optimal_slots) == 0:
-        print(f"[DEBUG] 공통 시간이 없음: team_id={team_id}")
-        print(f"[DEBUG] 각 멤버의 슬롯 세트 크기: {[len(s) for s in member_slot_sets_with_time]}")
+        logger.debug("공통 시간이 없음: team_id=%s", team_id)
+        logger.debug("각 멤버의 슬롯 세트 크기: %s", [len(s) for s in member_slot_sets_with_time])
         return None
     
     daily_blocks = build_daily_blocks_from_slots(optimal_slots)
@@ -325,10 +338,10 @@ def create_auto_recommend_post(team_id):
     # 1시간 연속 가능한 시간 찾기
     two_hour_slots = find_2hour_continuous_slots(daily_blocks)
     
-    print(f"[DEBUG] 1시간 연속 가능한 시간 수: {len(two_hour_slots)}")
+    logger.debug("1시간 연속 가능한 시간 수: %s", len(two_hour_slots))
     
     if not two_hour_slots:
-        print(f"[DEBUG] 1시간 연속 가능한 시간이 없음: team_id={team_id}")
+        logger.debug("1시간 연속 가능한 시간이 없음: team_id=%s", team_id)
         return None
     
     # 게시글 작성자: 봇 계정 사용
@@ -336,8 +349,7 @@ def create_auto_recommend_post(team_id):
     post_author_id = bot_user.id
     
     # 게시글 제목 및 내용 생성
-    course = Course.query.filter_by(code=team_recruitment.course_id).first()
-    course_title = course.title if course else team_recruitment.course_id
+    course_title = course_title_for(team_recruitment.course_id)
     
     title = title_pattern
     
@@ -405,7 +417,9 @@ def create_auto_recommend_post(team_id):
         )
         db.session.add(notification)
     
+    bump_versions(board_key(team_recruitment.course_id))
     db.session.commit()
+    metrics.observe("notification_fanout_size", len(team_members), type="team_post")
     
     return post
 
@@ -413,31 +427,33 @@ def create_auto_recommend_post(team_id):
 @available_bp.route("/", methods=["POST"])
 @jwt_required()
 def add_available_time():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     data = request.get_json()
 
     # 팀 게시판에서의 제출인지 여부 (대시보드에서는 team_id 를 보내지 않음)
     team_id_from_request = data.get("team_id")
 
-    existing = AvailableTime.query.filter_by(
-        user_id=user_id,
+    start_time = parse_time_str(data["start_time"])
+    end_time = parse_end_time_str(data["end_time"])
+    if end_time_to_minutes(end_time) <= time_to_minutes(start_time):
+        return jsonify({"msg": "종료 시간은 시작 시간보다 늦어야 합니다."}), 400
+
+    # 시간은 팀 게시판에서 제출해도 대시보드 시간(team_id 없음)으로 저장한다 (팀별 제출 여부는
+    # TeamAvailabilitySubmission 에만 기록). (user_id, 요일) 단위로 겹치거나 맞닿은 구간을 병합한다.
+    result = save_available_interval(
+        user_id=int(user_id),
+        team_id=None,
         day_of_week=data["day_of_week"],
-        start_time=parse_time_str(data["start_time"]),
-        end_time=parse_time_str(data["end_time"])
-    ).first()
+        start_time=start_time,
+        end_time=end_time,
+    )
 
     is_new_time = False
-    if existing:
-        print(f"[DEBUG] 이미 같은 시간이 존재함 (ID: {existing.id})")
+    if result == "exists":
+        logger.debug("이미 같은 시간이 존재함")
         response_msg = "이미 같은 시간이 존재합니다."
     else:
-        new_time = AvailableTime(
-            user_id=user_id,
-            day_of_week=data["day_of_week"],
-            start_time=parse_time_str(data["start_time"]),
-            end_time=parse_time_str(data["end_time"]),
-        )
-        db.session.add(new_time)
+        bump_user_teams(user_id)
         db.session.commit()  # 먼저 커밋하여 시간이 저장되도록 함
         is_new_time = True
         response_msg = "시간 저장 완료"
@@ -460,7 +476,7 @@ def add_available_time():
                 ).first()
                 is not None
             )
-            print(f"[DEBUG] team_id={team_id_int} 에 대한 제출, 팀 멤버 여부: {is_member}")
+            logger.debug("team_id=%s 에 대한 제출, 팀 멤버 여부: %s", team_id_int, is_member)
 
             if is_member:
                 # 제출 이력 기록 (이미 있으면 무시)
@@ -473,13 +489,9 @@ def add_available_time():
                     )
                     db.session.add(submission)
                     db.session.commit()
-                    print(
-                        f"[DEBUG] 팀 {team_id_int} 에 대한 제출 이력 생성 (user_id={user_id})"
-                    )
+                    logger.debug("팀 %s 에 대한 제출 이력 생성 (user_id=%s)", team_id_int, user_id)
                 else:
-                    print(
-                        f"[DEBUG] 팀 {team_id_int} 에 대한 제출 이력 이미 존재 (user_id={user_id})"
-                    )
+                    logger.debug("팀 %s 에 대한 제출 이력 이미 존재 (user_id=%s)", team_id_int, user_id)
 
                 # 이 팀에 대해 모든 멤버가 제출을 완료했는지 확인
                 team_recruitment = TeamRecruitment.query.get(team_id_int)
@@ -488,18 +500,14 @@ def add_available_time():
                 )
 
                 all_submitted = check_all_members_submitted(team_id_int)
-                print(
-                    f"[DEBUG] 팀 {team_id_int} ({team_name}) 모든 멤버 제출 여부: {all_submitted}"
-                )
+                logger.debug("팀 %s (%s) 모든 멤버 제출 여부: %s", team_id_int, team_name, all_submitted)
 
                 if all_submitted:
                     # 자동 추천 게시글 생성
-                    print(f"[DEBUG] 팀 {team_id_int} 자동 추천 게시글 생성 시도...")
+                    logger.debug("팀 %s 자동 추천 게시글 생성 시도...", team_id_int)
                     post = create_auto_recommend_post(team_id_int)
                     if post:
-                        print(
-                            f"[DEBUG] ✅ 팀 {team_id_int} 자동 추천 게시글 생성 성공! post_id={post.id}"
-                        )
+                        logger.debug("팀 %s 자동 추천 게시글 생성 성공! post_id=%s", team_id_int, post.id)
                         created_posts.append(
                             {
                                 "team_id": team_id_int,
@@ -508,19 +516,17 @@ def add_available_time():
                             }
                         )
                     else:
-                        print(
-                            f"[DEBUG] ❌ 팀 {team_id_int} 자동 추천 게시글 생성 실패 (create_auto_recommend_post가 None 반환)"
+                        logger.debug(
+                            "팀 %s 자동 추천 게시글 생성 실패 (create_auto_recommend_post가 None 반환)", team_id_int
                         )
                 else:
-                    print(
-                        f"[DEBUG] ⏳ 팀 {team_id_int} 아직 모든 멤버가 시간을 제출하지 않음"
-                    )
+                    logger.debug("팀 %s 아직 모든 멤버가 시간을 제출하지 않음", team_id_int)
             else:
-                print(
-                    f"[DEBUG] team_id={team_id_int} 에 대해 제출 요청이 왔지만, 사용자 {user_id} 는 이 팀의 멤버가 아님"
+                logger.debug(
+                    "team_id=%s 에 대해 제출 요청이 왔지만, 사용자 %s 는 이 팀의 멤버가 아님", team_id_int, user_id
                 )
         else:
-            print(f"[DEBUG] 잘못된 team_id 값: {team_id_from_request}")
+            logger.debug("잘못된 team_id 값: %s", team_id_from_request)
 
     if created_posts:
         response_msg += f" (자동 추천 게시글 {len(created_posts)}개 생성됨)"
@@ -535,7 +541,7 @@ def add_available_time():
 @available_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_my_available_times():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     times = (
         AvailableTime.query
         .filter_by(user_id=user_id)
@@ -548,27 +554,23 @@ def get_my_available_times():
 @available_bp.route("/<int:time_id>", methods=["DELETE"])
 @jwt_required()
 def delete_available_time(time_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     time = AvailableTime.query.filter_by(id=time_id, user_id=user_id).first()
 
     if not time:
         return jsonify({"msg": "해당 시간이 존재하지 않거나 권한이 없습니다."}), 404
 
     db.session.delete(time)
+    bump_user_teams(user_id)
     db.session.commit()
     return jsonify({"msg": "시간이 삭제되었습니다."}), 200
 
-# 팀 전체의 공통 가능한 시간대 계산
-@available_bp.route("/team/<int:team_id>", methods=["GET"])
-@jwt_required()
-def get_team_common_times(team_id):
-    team_recruitment = TeamRecruitment.query.get(team_id)
-    if not team_recruitment:
-        return jsonify({"msg": "해당 팀을 찾을 수 없습니다."}), 404
-
+def build_team_common_times(team_recruitment, week=None):
+    """팀 공통 가능 시간 응답 본문 (week='YYYY-MM-DD' 가 속한 주, 없으면 이번 주의 개인 일정을 뺀다)"""
+    team_id = team_recruitment.id
     team_members = TeamRecruitmentMember.query.filter_by(recruitment_id=team_id).all()
     if not team_members:
-        return jsonify({
+        return {
             "team_id": team_id,
             "team_board_name": team_recruitment.team_board_name,
             "course_id": team_recruitment.course_id,
@@ -576,7 +578,7 @@ def get_team_common_times(team_id):
             "members": [],
             "optimal_slots": [],
             "daily_blocks": {},
-        })
+        }
 
     member_ids = [m.user_id for m in team_members]
     all_times = AvailableTime.query.filter(AvailableTime.user_id.in_(member_ids)).all()
@@ -585,6 +587,10 @@ def get_team_common_times(team_id):
     for time_slot in all_times:
         user_times[time_slot.user_id].append(time_slot)
 
+    # 그 주(?week=YYYY-MM-DD, 없으면 이번 주)의 개인 일정을 뺀 실제 가능한 시간으로 계산
+    target_week = parse_week(week) or week_start()
+    member_busy_masks = busy_masks(member_ids, target_week)
+
     members_payload = []
     member_slot_sets = []
     slot_counts = {}
@@ -605,7 +611,7 @@ def get_team_common_times(team_id):
         }
         members_payload.append(payload)
 
-        slot_set = build_time_slots(times_for_user)
+        slot_set = build_time_slots(times_for_user) - mask_to_slot_keys(member_busy_masks.get(user.id, 0))
         member_slot_sets.append(slot_set)
 
         for slot in slot_set:
@@ -625,7 +631,7 @@ def get_team_common_times(team_id):
 
     daily_blocks = build_daily_blocks_from_slots(optimal_slots)
 
-    return jsonify({
+    return {
         "team_id": team_id,
         "team_board_name": team_recruitment.team_board_name,
         "course_id": team_recruitment.course_id,
@@ -634,13 +640,33 @@ def get_team_common_times(team_id):
         "optimal_slots": sorted(optimal_slots),
         "slot_counts": slot_counts,
         "daily_blocks": daily_blocks,
-    })
+        "week": target_week.isoformat(),
+    }
+
+
+# 팀 전체의 공통 가능한 시간대 계산
+@available_bp.route("/team/<int:team_id>", methods=["GET"])
+@jwt_required()
+# ?week= 가 없으면 이번 주 기준이라 주가 바뀌면 같은 경로·버전이라도 응답이 달라진다
+@conditional_get(lambda team_id: team_key(team_id), vary=lambda: week_start().isoformat())
+def get_team_common_times(team_id):
+    team_recruitment = TeamRecruitment.query.get(team_id)
+    if not team_recruitment:
+        return jsonify({"msg": "해당 팀을 찾을 수 없습니다."}), 404
+
+    # 팀 게시판을 열면 팀원 모두가 동시에 요청하므로 한 번만 계산해 공유한다 (키에 팀 버전, ?week=, 이번 주가 들어 있음)
+    payload = coalesce(
+        versioned_key("team_common_times"),
+        lambda: build_team_common_times(team_recruitment, request.args.get("week")),
+        tags=[team_key(team_id)],
+    )
+    return jsonify(payload)
 
 # 2시간 연속 가능한 시간을 자동 추천하고 봇이 게시글 올리기
 @available_bp.route("/team/<int:team_id>/auto-recommend", methods=["POST"])
 @jwt_required()
 def auto_recommend_and_post(team_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     team_recruitment = TeamRecruitment.query.get(team_id)
     
     if not team_recruitment:
@@ -666,13 +692,16 @@ def auto_recommend_and_post(team_id):
     for time_slot in all_times:
         user_times[time_slot.user_id].append(time_slot)
     
+    # 이번 주 개인 일정(시간 지정)이 있는 시간은 추천에서 제외
+    member_busy_masks = busy_masks(member_ids, week_start())
+    
     member_slot_sets = []
     for member in team_members:
         user = member.user
         if not user:
             continue
         times_for_user = user_times.get(user.id, [])
-        slot_set = build_time_slots(times_for_user)
+        slot_set = build_time_slots(times_for_user) - mask_to_slot_keys(member_busy_masks.get(user.id, 0))
         member_slot_sets.append(slot_set)
     
     if len(member_slot_sets) == 0:
@@ -699,8 +728,7 @@ def auto_recommend_and_post(team_id):
     post_author_id = bot_user.id
     
     # 게시글 제목 및 내용 생성
-    course = Course.query.filter_by(code=team_recruitment.course_id).first()
-    course_title = course.title if course else team_recruitment.course_id
+    course_title = course_title_for(team_recruitment.course_id)
     
     title = f"🤖 자동 추천: {team_recruitment.team_board_name} 팀 만남 시간 추천"
     
@@ -768,7 +796,9 @@ def auto_recommend_and_post(team_id):
         )
         db.session.add(notification)
     
+    bump_versions(board_key(team_recruitment.course_id))
     db.session.commit()
+    metrics.observe("notification_fanout_size", len(team_members), type="team_post")
     
     return jsonify({
         "msg": "자동 추천 게시글이 작성되었습니다.",
@@ -1,12 +1,25 @@
 import os
 import json
+import logging
 from werkzeug.utils import secure_filename
 from flask import Blueprint, request, jsonify, send_from_directory
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy.exc import IntegrityError
 from extensions import db
-from models import CourseBoardPost, CourseBoardComment, CourseBoardLike, CourseBoardCommentLike, User, Course, Enrollment, Notification, TeamRecruitment, TeamRecruitmentMember, Poll, PollOption, PollVote
+from db_config import retry_on_locked
+from services import board_search, comment_tree
+from services.course_lookup import course_title_for, get_course_by_code
+from services.identity import get_user_summaries
+from services.metrics import metrics
+from services.pagination import MAX_LIMIT, paginated_response, parse_page_args
+from services.resource_versions import board_key, bump_versions, conditional_get, versioned_key
+from services.single_flight import coalesce
+from models import CourseBoardPost, CourseBoardComment, CourseBoardLike, CourseBoardCommentLike, User, Enrollment, Notification, TeamRecruitment, TeamRecruitmentMember, Poll, PollOption, PollVote
 
 board_bp = Blueprint("board", __name__, url_prefix="/board")
+logger = logging.getLogger(__name__)
+
+SEARCH_PAGE_SIZE = 20
 
 # =====================================================
 # 게시물 존재 확인 (알림용)
@@ -99,6 +112,8 @@ def upload_file():
     # 파일 저장
     file_path = os.path.join(UPLOAD_FOLDER, filename)
     file.save(file_path)
+    metrics.inc("upload_bytes_total", file_size, type=file_type)
+    metrics.inc("uploads_total", type=file_type)
     
     return jsonify({
         "message": "파일 업로드 완료",
@@ -144,7 +159,7 @@ def download_file(filename):
 @board_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_post():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     data = request.get_json()
 
     # 파일 정보 처리
@@ -191,12 +206,13 @@ def create_post():
                 )
                 db.session.add(poll_option)
     
+    bump_versions(board_key(post.course_id))
     db.session.commit()
 
     # 🔔 공지사항인 경우 수강생 전원에게 알림
     if data["category"] == "notice":
         # 해당 강의를 수강하는 모든 학생 찾기
-        course = Course.query.filter_by(code=data["course_id"]).first()
+        course = get_course_by_code(data["course_id"])
         if course:
             enrollments = Enrollment.query.filter_by(course_id=course.id).all()
             
@@ -212,6 +228,7 @@ def create_post():
                 db.session.add(notification)
             
             db.session.commit()
+            metrics.observe("notification_fanout_size", len(enrollments), type="notice")
 
     # 🔔 팀 게시판인 경우 팀 멤버들에게만 알림
     if data["category"] == "team" and data.get("team_board_name"):
@@ -228,12 +245,13 @@ def create_post():
             ).all()
             
             # 강의 정보 가져오기
-            course = Course.query.filter_by(code=data["course_id"]).first()
-            course_title = course.title if course else data["course_id"]
+            course_title = course_title_for(data["course_id"])
             
             # 각 팀 멤버에게 알림 전송 (작성자 본인 제외)
+            recipients = 0
             for member in team_members:
                 if member.user_id != int(user_id):  # 작성자 본인은 제외
+                    recipients += 1
                     notification = Notification(
                         user_id=member.user_id,
                         type="team_post",
@@ -244,6 +262,7 @@ def create_post():
                     db.session.add(notification)
             
             db.session.commit()
+            metrics.observe("notification_fanout_size", recipients, type="team_post")
 
     return jsonify({"msg": "글 작성 완료", "post": post.to_dict(user_id=int(user_id))}), 201
 
@@ -251,21 +270,88 @@ def create_post():
 # 글 목록 조회
 @board_bp.route("/course/<string:course_id>", methods=["GET"])
 @jwt_required()
+@conditional_get(lambda course_id: board_key(course_id), per_user=True)
 def get_posts(course_id):
-    user_id = get_jwt_identity()
-    # 고정된 게시물을 먼저, 그 다음 최신순으로 정렬
-    posts = CourseBoardPost.query.filter_by(course_id=course_id).order_by(
-        CourseBoardPost.is_pinned.desc(),  # 고정된 게시물이 먼저
-        CourseBoardPost.id.desc()  # 그 다음 최신순
-    ).all()
-    return jsonify([p.to_dict(user_id=int(user_id)) for p in posts])
+    course = get_course_by_code(course_id)
+    if course is None:
+        return jsonify([])
+
+    def load():
+        # 고정된 게시물을 먼저, 그 다음 최신순으로 정렬
+        posts = CourseBoardPost.query.filter_by(course_pk=course.id).order_by(
+            CourseBoardPost.is_pinned.desc(),  # 고정된 게시물이 먼저
+            CourseBoardPost.id.desc()  # 그 다음 최신순
+        ).all()
+        return [p.to_dict() for p in posts]
+
+    # 사용자와 무관한 부분은 동시 요청끼리 한 번만 만들어 공유하고, 좋아요 여부 / 내 투표만 사용자별로 얹는다
+    posts = coalesce(versioned_key("board_posts"), load, tags=[board_key(course_id)])
+    return jsonify(apply_user_overlay(posts, course.id, int(current_user.id)))
+
+
+def apply_user_overlay(posts, course_pk, user_id):
+    """공유된 글 목록에 사용자별 필드(is_liked, poll.user_vote)를 채운 사본 (쿼리 2번)"""
+    liked = {
+        post_id
+        for (post_id,) in CourseBoardLike.query.join(CourseBoardPost)
+        .filter(CourseBoardPost.course_pk == course_pk, CourseBoardLike.user_id == user_id)
+        .with_entities(CourseBoardLike.post_id)
+    }
+    votes = dict(
+        PollVote.query.join(Poll, Poll.id == PollVote.poll_id).join(CourseBoardPost, CourseBoardPost.id == Poll.post_id)
+        .filter(CourseBoardPost.course_pk == course_pk, PollVote.user_id == user_id)
+        .with_entities(PollVote.poll_id, PollVote.option_id)
+    )
+
+    result = []
+    for post in posts:
+        post = dict(post, is_liked=post["id"] in liked)
+        if post.get("poll"):
+            post["poll"] = dict(post["poll"], user_vote=votes.get(post["poll"]["id"]))
+        result.append(post)
+    return result
+
+
+# 게시판 검색 (제목 / 본문 / 댓글)
+@board_bp.route("/course/<string:course_id>/search", methods=["GET"])
+@jwt_required()
+@conditional_get(lambda course_id: board_key(course_id))
+def search_posts(course_id):
+    """
+    ?q=검색어 [&category=notice] [&limit=20&offset=0]
+    관련도 순 결과, title / snippet 은 HTML 이스케이프 후 일치 구간을 <mark> 로 감싼다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더에 다음 offset.
+    """
+    if not board_search.is_available():
+        return jsonify({"message": "이 데이터베이스에서는 검색을 지원하지 않습니다."}), 501
+
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"message": "검색어를 입력해주세요."}), 400
+    try:
+        limit = min(max(int(request.args.get("limit", SEARCH_PAGE_SIZE)), 1), MAX_LIMIT)
+        offset = max(int(request.args.get("offset", 0)), 0)
+    except ValueError:
+        return jsonify({"message": "limit/offset은 숫자여야 합니다."}), 400
+    category = request.args.get("category") or None
+    if category is not None and category not in board_search.CATEGORIES:
+        return jsonify({"message": f"알 수 없는 카테고리입니다. ({', '.join(board_search.CATEGORIES)})"}), 400
+
+    course = get_course_by_code(course_id)
+    if course is None:
+        return jsonify([])
+
+    results, next_offset = board_search.search_board(
+        course.id, query, category=category, limit=limit, offset=offset
+    )
+    return paginated_response(results, next_offset)
 
 
 # 글 수정 및 삭제 (같은 경로, 다른 메서드)
 @board_bp.route("/post/<int:post_id>", methods=["PUT", "DELETE"])
 @jwt_required()
 def update_or_delete_post(post_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     post = CourseBoardPost.query.get(post_id)
     
     if not post:
@@ -287,9 +373,9 @@ def update_or_delete_post(post_id):
                         file_path = os.path.join(UPLOAD_FOLDER, filename)
                         if os.path.exists(file_path):
                             os.remove(file_path)
-                            print(f"파일 삭제됨: {filename}")
-            except Exception as e:
-                print(f"파일 삭제 중 오류: {e}")
+                            logger.debug("파일 삭제됨: %s", filename)
+            except Exception:
+                logger.exception("게시글 %s 첨부파일 삭제 중 오류", post_id)
                 # 파일 삭제 실패해도 게시글은 삭제 진행
 
         # 관련된 댓글과 좋아요 먼저 삭제
@@ -305,6 +391,7 @@ def update_or_delete_post(post_id):
         
         # 게시글 삭제
         db.session.delete(post)
+        bump_versions(board_key(post.course_id))
         db.session.commit()
         return jsonify({"msg": "삭제 완료"})
     
@@ -370,6 +457,7 @@ def update_or_delete_post(post_id):
             PollOption.query.filter_by(poll_id=existing_poll.id).delete()
             db.session.delete(existing_poll)
     
+    bump_versions(board_key(post.course_id))
     db.session.commit()
     
     return jsonify({"message": "글 수정 완료", "post": post.to_dict(user_id=int(user_id))}), 200
@@ -379,16 +467,55 @@ def update_or_delete_post(post_id):
 @board_bp.route("/post/<int:post_id>/comments", methods=["GET"])
 @jwt_required()
 def get_comments(post_id):
-    user_id = int(get_jwt_identity())
-    comments = CourseBoardComment.query.filter_by(post_id=post_id).order_by(CourseBoardComment.created_at.asc()).all()
-    return jsonify([c.to_dict(user_id=user_id) for c in comments]), 200
+    return jsonify(comment_tree.list_post_comments(post_id, current_user.id)), 200
+
+
+# 댓글 트리 조회 (최상위 댓글 페이지 + 스레드별 답글 미리보기)
+@board_bp.route("/post/<int:post_id>/comments/tree", methods=["GET"])
+@jwt_required()
+def get_comment_tree(post_id):
+    """
+    ?limit=20&after=<최상위 댓글 id>&replies=3
+    최상위 댓글을 작성 순으로, 각 댓글의 replies 에 중첩된 답글을 스레드별 앞쪽 replies 개까지 담는다.
+    남은 답글은 replies_next_cursor 를 after 로 /comments/<id>/replies 에서 받는다.
+    다음 최상위 페이지가 있으면 X-Next-Cursor 헤더에 다음 after 값.
+    """
+    if not db.session.query(CourseBoardPost.query.filter_by(id=post_id).exists()).scalar():
+        return jsonify({"error": "게시글을 찾을 수 없습니다"}), 404
+    try:
+        page = parse_page_args(default_limit=comment_tree.COMMENT_PAGE_SIZE)
+        reply_limit = min(max(int(request.args.get("replies", comment_tree.REPLY_PREVIEW_SIZE)), 0), MAX_LIMIT)
+    except ValueError:
+        return jsonify({"message": "limit / after / replies 값이 올바르지 않습니다."}), 400
+
+    nodes, next_cursor = comment_tree.comment_tree(
+        post_id, current_user.id, limit=page.limit, after=page.after, reply_limit=reply_limit
+    )
+    return paginated_response(nodes, next_cursor)
+
+
+# 답글 더 보기
+@board_bp.route("/comments/<int:comment_id>/replies", methods=["GET"])
+@jwt_required()
+def get_comment_replies(comment_id):
+    """?limit=20&after=<답글 id> — comment_id 아래 모든 답글을 작성 순으로, 다음 페이지는 X-Next-Cursor"""
+    comment = CourseBoardComment.query.get(comment_id)
+    if not comment:
+        return jsonify({"message": "존재하지 않는 댓글입니다."}), 404
+    try:
+        page = parse_page_args(default_limit=comment_tree.REPLY_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"message": "limit / after 값이 올바르지 않습니다."}), 400
+
+    nodes, next_cursor = comment_tree.replies_page(comment, current_user.id, limit=page.limit, after=page.after)
+    return paginated_response(nodes, next_cursor)
 
 
 # 댓글 작성
 @board_bp.route("/post/<int:post_id>/comments", methods=["POST"])
 @jwt_required()
 def create_comment(post_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     data = request.get_json()
     
     if not data.get("content"):
@@ -408,12 +535,11 @@ def create_comment(post_id):
     )
     
     db.session.add(comment)
+    bump_versions(board_key(post.course_id))
     db.session.commit()
     
     # 🔔 알림 생성
-    current_user = User.query.get(user_id)
-    course = Course.query.filter_by(code=post.course_id).first()
-    course_title = course.title if course else post.course_id
+    course_title = course_title_for(post.course_id)
     
     # 카테고리 한글 변환
     base_category_names = {
@@ -491,7 +617,7 @@ def create_comment(post_id):
 @board_bp.route("/comments/<int:comment_id>", methods=["DELETE"])
 @jwt_required()
 def delete_comment(comment_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     comment = CourseBoardComment.query.get(comment_id)
     
     if not comment:
@@ -508,6 +634,7 @@ def delete_comment(comment_id):
     
     # 알림은 삭제하지 않음 (사용자가 "삭제된 댓글" 메시지를 볼 수 있도록)
     
+    bump_versions(board_key(comment.post.course_id))
     db.session.delete(comment)
     db.session.commit()
     
@@ -517,8 +644,9 @@ def delete_comment(comment_id):
 # 좋아요 토글
 @board_bp.route("/post/<int:post_id>/like", methods=["POST"])
 @jwt_required()
+@retry_on_locked
 def toggle_like(post_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     
     # 게시글 존재 확인
     post = CourseBoardPost.query.get(post_id)
@@ -531,6 +659,7 @@ def toggle_like(post_id):
     if existing_like:
         # 좋아요 취소
         db.session.delete(existing_like)
+        bump_versions(board_key(post.course_id))
         db.session.commit()
         likes_count = CourseBoardLike.query.filter_by(post_id=post_id).count()
         return jsonify({
@@ -542,7 +671,12 @@ def toggle_like(post_id):
         # 좋아요 추가
         new_like = CourseBoardLike(post_id=post_id, user_id=user_id)
         db.session.add(new_like)
-        db.session.commit()
+        bump_versions(board_key(post.course_id))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # 같은 좋아요 요청이 동시에 들어온 경우 (유니크 인덱스) — 이미 좋아요 상태
+            db.session.rollback()
         
         likes_count = CourseBoardLike.query.filter_by(post_id=post_id).count()
         return jsonify({
@@ -555,8 +689,9 @@ def toggle_like(post_id):
 # 댓글 좋아요 토글
 @board_bp.route("/comment/<int:comment_id>/like", methods=["POST"])
 @jwt_required()
+@retry_on_locked
 def toggle_comment_like(comment_id):
-    user_id = int(get_jwt_identity())
+    user_id = current_user.id
     comment = CourseBoardComment.query.get(comment_id)
     
     if not comment:
@@ -582,7 +717,11 @@ def toggle_comment_like(comment_id):
         # 좋아요 추가
         new_like = CourseBoardCommentLike(comment_id=comment_id, user_id=user_id)
         db.session.add(new_like)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # 같은 좋아요 요청이 동시에 들어온 경우 (유니크 인덱스) — 이미 좋아요 상태
+            db.session.rollback()
         likes_count = CourseBoardCommentLike.query.filter_by(comment_id=comment_id).count()
         return jsonify({
             "message": "좋아요",
@@ -593,8 +732,9 @@ def toggle_comment_like(comment_id):
 # 투표하기
 @board_bp.route("/post/<int:post_id>/poll/vote", methods=["POST"])
 @jwt_required()
+@retry_on_locked
 def vote_poll(post_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     data = request.get_json()
     option_id = data.get("option_id")
     
@@ -626,6 +766,7 @@ def vote_poll(post_id):
     if existing_vote:
         # 기존 투표 수정
         existing_vote.option_id = option_id
+        bump_versions(board_key(post.course_id))
         db.session.commit()
     else:
         # 새 투표 추가
@@ -635,34 +776,37 @@ def vote_poll(post_id):
             user_id=user_id
         )
         db.session.add(new_vote)
-        db.session.commit()
+        bump_versions(board_key(post.course_id))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # 같은 사용자의 첫 투표가 동시에 들어온 경우 (유니크 인덱스) — 먼저 들어간 행을 이번 선택으로 수정
+            db.session.rollback()
+            PollVote.query.filter_by(poll_id=poll.id, user_id=user_id).update({"option_id": option_id})
+            bump_versions(board_key(post.course_id))
+            db.session.commit()
     
     # 업데이트된 투표 결과 반환
     options_data = []
     total_votes = 0
+    all_votes = PollVote.query.filter_by(poll_id=poll.id).all()
+    voter_summaries = get_user_summaries([v.user_id for v in all_votes])
     for opt in poll.options_relation:
-        votes = PollVote.query.filter_by(option_id=opt.id).all()
+        votes = [v for v in all_votes if v.option_id == opt.id]
         votes_count = len(votes)
         total_votes += votes_count
         
-        # 투표한 사용자 정보
+        # 투표한 사용자 정보 (요약에는 학생인 경우에만 student_id 가 들어 있음)
         voters = []
         for vote in votes:
-            user = User.query.get(vote.user_id)
+            user = voter_summaries.get(vote.user_id)
             if user:
-                # 교수 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
-                author_student_id = None
-                if getattr(user, "user_type", None) == "student":
-                    author_student_id = user.student_id
-                
-                is_professor = getattr(user, "user_type", None) == "professor"
-                
                 voters.append({
-                    "id": user.id,
-                    "name": user.name,
-                    "student_id": author_student_id,
-                    "is_professor": is_professor,
-                    "profile_image": user.profile_image
+                    "id": user["id"],
+                    "name": user["name"],
+                    "student_id": user["student_id"],
+                    "is_professor": user["user_type"] == "professor",
+                    "profile_image": user["profile_image"]
                 })
         
         options_data.append({
@@ -694,7 +838,7 @@ def vote_poll(post_id):
 @jwt_required()
 def toggle_pin_post(post_id):
     try:
-        user_id = int(get_jwt_identity())
+        user_id = current_user.id
         post = CourseBoardPost.query.get(post_id)
         
         if not post:
@@ -706,10 +850,6 @@ def toggle_pin_post(post_id):
         #     return jsonify({"message": "강의를 찾을 수 없습니다."}), 404
         
         # 사용자 정보 가져오기
-        current_user = User.query.get(user_id)
-        if not current_user:
-            return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
-        
         user_type = getattr(current_user, "user_type", None)
         
         # 카테고리별 권한 체크
@@ -740,10 +880,11 @@ def toggle_pin_post(post_id):
             # 다른 고정된 게시물들 모두 고정 해제 (계정 상관 없이)
             for other_post in other_pinned_posts:
                 other_post.is_pinned = False
-                print(f"게시물 {other_post.id} 고정 해제됨 (새 게시물 {post_id} 고정으로 인해)")
+                logger.debug("게시물 %s 고정 해제됨 (새 게시물 %s 고정으로 인해)", other_post.id, post_id)
         
         # 현재 게시물 고정 상태 토글
         post.is_pinned = not post.is_pinned
+        bump_versions(board_key(post.course_id))
         db.session.commit()
         
         return jsonify({
@@ -753,7 +894,5 @@ def toggle_pin_post(post_id):
         }), 200
     except Exception as e:
         db.session.rollback()
-        import traceback
-        print(f"게시물 고정 오류: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("게시물 %s 고정 오류", post_id)
         return jsonify({"message": f"게시물 고정 중 오류가 발생했습니다: {str(e)}"}), 500
\ No newline at end of file
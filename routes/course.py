@@ -1,7 +1,12 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy.exc import IntegrityError
 from extensions import db
-from models import Course, User, Enrollment, Notification
+from models import Course, CourseBoardPost, User, Enrollment, Notification, TeamRecruitment
+from services.course_catalog import course_catalog
+from services.course_lookup import forget_course
+from services.pagination import paginated_response, parse_page_args
+from services.resource_versions import COURSES_KEY, board_key, bump_versions, conditional_get, recruit_key
 
 course_bp = Blueprint("course", __name__, url_prefix="/course")
 
@@ -9,8 +14,8 @@ course_bp = Blueprint("course", __name__, url_prefix="/course")
 @course_bp.route("/my", methods=["GET"])
 @jwt_required()
 def get_my_courses():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user_id = current_user.id
+    user = current_user
     
     if not user or user.user_type != 'professor':
         return jsonify({"message": "교수만 접근 가능합니다."}), 403
@@ -23,8 +28,8 @@ def get_my_courses():
 @course_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_course():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user_id = current_user.id
+    user = current_user
     
     if not user or user.user_type != 'professor':
         return jsonify({"message": "교수만 강의를 생성할 수 있습니다."}), 403
@@ -49,6 +54,7 @@ def create_course():
     )
     
     db.session.add(new_course)
+    bump_versions(COURSES_KEY)
     db.session.commit()
     
     return jsonify({
@@ -61,7 +67,7 @@ def create_course():
 @course_bp.route("/<int:course_id>", methods=["DELETE"])
 @jwt_required()
 def delete_course(course_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     course = Course.query.get(course_id)
     
     if not course:
@@ -72,9 +78,16 @@ def delete_course(course_id):
     
     # 강의에 연결된 수강 신청 데이터를 먼저 삭제
     Enrollment.query.filter_by(course_id=course_id).delete()
-    
+
+    # 게시글 / 모집글 / 알림은 남기고 정수 강의 id 만 비운다. 스키마의 ON DELETE SET NULL 은
+    # PRAGMA foreign_keys=ON 일 때만 동작하므로 (기본 OFF — db_config 참고) 여기서 직접 처리한다.
+    for model in (CourseBoardPost, TeamRecruitment, Notification):
+        model.query.filter_by(course_pk=course.id).update({"course_pk": None}, synchronize_session=False)
+
     db.session.delete(course)
+    bump_versions(COURSES_KEY, board_key(course.code), recruit_key(course.code))
     db.session.commit()
+    forget_course(course_id, course.code)
     
     return jsonify({"message": "강의가 삭제되었습니다."}), 200
 
@@ -82,17 +95,31 @@ def delete_course(course_id):
 # 모든 강의 조회 (학생이 강의 참여할 때 사용)
 @course_bp.route("/all", methods=["GET"])
 @jwt_required()
+@conditional_get(COURSES_KEY)
 def get_all_courses():
-    courses = Course.query.order_by(Course.created_at.desc()).all()
-    return jsonify([c.to_dict() for c in courses]), 200
+    """
+    파라미터가 없으면 전체 목록(최근 생성 순).
+    ?q=<코드 또는 강의명 앞부분>, ?limit=N&before=<id> 를 주면 id 내림차순 페이지 (X-Next-Cursor 헤더)
+    """
+    query = (request.args.get("q") or "").strip()
+    try:
+        page = parse_page_args()
+    except ValueError:
+        return jsonify({"message": "limit/before는 숫자여야 합니다."}), 400
+
+    if not query and page.limit is None and page.before is None:
+        return jsonify(course_catalog.all_courses()), 200
+
+    courses, next_cursor = course_catalog.browse(query or None, page.limit, page.before)
+    return paginated_response(courses, next_cursor), 200
 
 
 # 강의 참여 (학생)
 @course_bp.route("/enroll/<int:course_id>", methods=["POST"])
 @jwt_required()
 def enroll_course(course_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user_id = current_user.id
+    user = current_user
     
     if not user or user.user_type != 'student':
         return jsonify({"message": "학생만 강의에 참여할 수 있습니다."}), 403
@@ -110,7 +137,12 @@ def enroll_course(course_id):
     # 수강 신청
     enrollment = Enrollment(student_id=user_id, course_id=course_id)
     db.session.add(enrollment)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # 동시에 들어온 중복 신청 (student_id, course_id 유니크 인덱스)
+        db.session.rollback()
+        return jsonify({"message": "이미 수강 중인 강의입니다."}), 400
     
     # 🔔 교수에게 알림 전송
     notification = Notification(
@@ -133,14 +165,17 @@ def enroll_course(course_id):
 @course_bp.route("/enrolled", methods=["GET"])
 @jwt_required()
 def get_enrolled_courses():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user_id = current_user.id
+    user = current_user
     
     if not user or user.user_type != 'student':
         return jsonify({"message": "학생만 접근 가능합니다."}), 403
     
-    enrollments = Enrollment.query.filter_by(student_id=user_id).order_by(Enrollment.enrolled_at.desc()).all()
-    courses = [e.course.to_dict() for e in enrollments if e.course]
-    
-    return jsonify(courses), 200
+    course_ids = [
+        course_id
+        for (course_id,) in Enrollment.query.filter_by(student_id=user_id)
+        .order_by(Enrollment.enrolled_at.desc())
+        .with_entities(Enrollment.course_id)
+    ]
+    return jsonify(course_catalog.get_many(course_ids)), 200
 
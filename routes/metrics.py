@@ -0,0 +1,26 @@
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from services.metrics import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+# =====================================================
+# Prometheus 메트릭 (모든 gunicorn 워커 합산)
+# =====================================================
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token and not current_app.debug:
+        # 토큰 없이 운영 환경에 노출하지 않는다 (경로 / 테이블 / 사용자 수 등이 드러남)
+        return jsonify({"message": "METRICS_TOKEN 이 설정되지 않아 메트릭을 제공하지 않습니다."}), 404
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, token):
+            return jsonify({"message": "권한이 없습니다."}), 401
+
+    if not metrics.enabled:
+        return jsonify({"message": "메트릭이 비활성화되어 있습니다."}), 404
+
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
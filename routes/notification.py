@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from extensions import db
+from db_config import retry_on_locked
 from models import Notification
 
 notification_bp = Blueprint("notification", __name__, url_prefix="/notification")
@@ -9,7 +10,7 @@ notification_bp = Blueprint("notification", __name__, url_prefix="/notification"
 @notification_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_notifications():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     
     # 읽지 않은 알림만 또는 최근 30개
     limit = request.args.get("limit", 30, type=int)
@@ -23,8 +24,9 @@ def get_notifications():
 # 알림 읽음 처리
 @notification_bp.route("/<int:notification_id>/read", methods=["PUT"])
 @jwt_required()
+@retry_on_locked
 def mark_as_read(notification_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     
     notification = Notification.query.filter_by(id=notification_id, user_id=user_id).first()
     if not notification:
@@ -38,8 +40,9 @@ def mark_as_read(notification_id):
 # 모든 알림 읽음 처리
 @notification_bp.route("/read-all", methods=["PUT"])
 @jwt_required()
+@retry_on_locked
 def mark_all_as_read():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     
     Notification.query.filter_by(user_id=user_id, is_read=False)\
         .update({"is_read": True})
@@ -50,8 +53,9 @@ def mark_all_as_read():
 # 알림 삭제
 @notification_bp.route("/<int:notification_id>", methods=["DELETE"])
 @jwt_required()
+@retry_on_locked
 def delete_notification(notification_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     
     notification = Notification.query.filter_by(id=notification_id, user_id=user_id).first()
     if not notification:
@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from extensions import db, bcrypt
+from flask_jwt_extended import jwt_required, current_user
+from extensions import db, password_hasher
+from services.recruitments import sync_member_counts
+from services.resource_versions import USERS_KEY, bump_versions
 from models import (
     User,
     AvailableTime,
@@ -24,11 +26,7 @@ profile_bp = Blueprint("profile", __name__, url_prefix="/profile")
 @profile_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_profile():
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
+    user = current_user
 
     return jsonify({"profile": user.to_dict()})
 
@@ -39,10 +37,7 @@ def get_profile():
 @profile_bp.route("/", methods=["PUT"])
 @jwt_required()
 def update_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
+    user = current_user
 
     data = request.get_json()
 
@@ -53,6 +48,8 @@ def update_profile():
     if "profileImage" in data: 
         user.profile_image = data["profileImage"]
 
+    # 이름 / 프로필 이미지는 게시판·모집·팀 응답 곳곳에 들어가므로 모든 ETag 를 무효화
+    bump_versions(USERS_KEY)
     db.session.commit()
 
     return jsonify({"message": "프로필이 수정되었습니다.", "profile": user.to_dict()})
@@ -63,10 +60,7 @@ def update_profile():
 @profile_bp.route("/password", methods=["PUT"])
 @jwt_required()
 def change_password():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
+    user = current_user
 
     data = request.get_json()
     current_pw = data.get("currentPassword")
@@ -77,11 +71,11 @@ def change_password():
         return jsonify({"error": "비밀번호를 모두 입력해주세요."}), 400
 
     # 현재 비밀번호 검증(bcrypt)
-    if not bcrypt.check_password_hash(user.password_hash, current_pw):
+    if not password_hasher.check_password(user.password_hash, current_pw):
         return jsonify({"error": "현재 비밀번호가 올바르지 않습니다."}), 400
 
     # 새 비밀번호 해시 후 저장(bcrypt)
-    user.password_hash = bcrypt.generate_password_hash(new_pw).decode("utf-8")
+    user.password_hash = password_hasher.hash_password(new_pw)
     db.session.commit()
 
     return jsonify({"message": "비밀번호가 성공적으로 변경되었습니다."})
@@ -93,11 +87,8 @@ def change_password():
 @profile_bp.route("/delete", methods=["DELETE"])
 @jwt_required()
 def delete_account():
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
+    user_id = current_user.id
+    user = current_user
 
     data = request.get_json() or {}
     identifier = data.get("identifier", "").strip()
@@ -111,7 +102,7 @@ def delete_account():
         return jsonify({"error": "아이디 또는 이메일이 현재 계정 정보와 일치하지 않습니다."}), 400
 
     # 비밀번호 검증
-    if not bcrypt.check_password_hash(user.password_hash, password):
+    if not password_hasher.check_password(user.password_hash, password):
         return jsonify({"error": "비밀번호가 올바르지 않습니다."}), 400
 
     # 교수 계정인 경우: 담당 강의가 남아 있으면 탈퇴 불가 처리
@@ -137,8 +128,15 @@ def delete_account():
     # 수강 정보(학생)
     Enrollment.query.filter_by(student_id=user_id).delete()
 
-    # 팀 모집 참여자
+    # 팀 모집 참여자 (참여했던 모집글의 인원 수도 다시 계산)
+    joined_ids = [
+        rid
+        for (rid,) in TeamRecruitmentMember.query.filter_by(user_id=user_id).with_entities(
+            TeamRecruitmentMember.recruitment_id
+        )
+    ]
     TeamRecruitmentMember.query.filter_by(user_id=user_id).delete()
+    sync_member_counts(*joined_ids)
 
     # 내가 작성한 팀 모집 글과 그 참여자
     my_recruits = TeamRecruitment.query.filter_by(author_id=user_id).all()
@@ -164,6 +162,7 @@ def delete_account():
 
     # 마지막으로 사용자 삭제
     db.session.delete(user)
+    bump_versions(USERS_KEY)
     db.session.commit()
 
     return jsonify({"message": "회원탈퇴가 완료되었습니다."}), 200
\ No newline at end of file
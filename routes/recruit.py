@@ -1,7 +1,26 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy.orm import joinedload
 from extensions import db
-from models import TeamRecruitment, TeamRecruitmentMember, User, Notification, Course, CourseBoardPost
+from db_config import retry_on_locked
+from models import TeamRecruitment, TeamRecruitmentMember, User, Notification, CourseBoardPost
+from services.availability import mask_to_slot_keys
+from services.team_formation import load_course_masks, propose_teams, team_common_mask
+from services.course_lookup import course_pk_for, course_title_for, get_course_by_code
+from services.metrics import metrics
+from services.pagination import keyset_page, paginated_response, parse_page_args
+from services.recruitments import (
+    BOARD_ACTIVATED,
+    FULL,
+    JOINED,
+    NOT_MEMBER,
+    activate_if_full,
+    join_recruitment,
+    leave_recruitment,
+    serialize_recruitments,
+    sync_member_counts,
+)
+from services.resource_versions import bump_versions, conditional_get, recruit_key, team_key
 
 recruit_bp = Blueprint("recruit", __name__, url_prefix="/recruit")
 
@@ -9,25 +28,44 @@ recruit_bp = Blueprint("recruit", __name__, url_prefix="/recruit")
 # 모집 글 목록 조회
 @recruit_bp.route("/<string:course_id>", methods=["GET"])
 @jwt_required()
+@conditional_get(lambda course_id: recruit_key(course_id), per_user=True)
 def list_recruitments(course_id):
-    user_id = int(get_jwt_identity())
-    recruitments = (
-        TeamRecruitment.query.filter_by(course_id=course_id)
+    """
+    ?limit=N&before=<id> 로 페이지 단위 조회 (services.pagination),
+    ?open_only=1 이면 빈 자리가 남은 모집글만.
+    """
+    user_id = current_user.id
+    try:
+        page = parse_page_args()
+    except ValueError:
+        return jsonify({"message": "limit/before는 숫자여야 합니다."}), 400
+
+    # 없는 강의 코드면 course_pk == NULL 조건이 되어 강의가 지워진 모집글이 전부 나오므로 바로 빈 목록
+    course_pk = course_pk_for(course_id)
+    if course_pk is None:
+        return jsonify([]), 200
+
+    query = (
+        TeamRecruitment.query.options(joinedload(TeamRecruitment.author))
+        .filter(TeamRecruitment.course_pk == course_pk)
         .order_by(TeamRecruitment.id.desc())
-        .all()
     )
-    return jsonify([r.to_dict(user_id=user_id) for r in recruitments]), 200
+    if request.args.get("open_only", type=int):
+        query = query.filter(TeamRecruitment.member_count < TeamRecruitment.max_members)
+
+    recruitments, next_cursor = keyset_page(query, TeamRecruitment.id, page)
+    return paginated_response(serialize_recruitments(recruitments, user_id=user_id), next_cursor), 200
 
 
 # 모집 글 작성
 @recruit_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_recruitment():
-    user_id = int(get_jwt_identity())
+    user_id = current_user.id
     data = request.get_json() or {}
 
     # 교수는 모집글 작성 불가
-    user = User.query.get(user_id)
+    user = current_user
     if user and user.user_type == "professor":
         return jsonify({"message": "교수는 모집글을 작성할 수 없습니다."}), 403
 
@@ -48,6 +86,9 @@ def create_recruitment():
     if max_members < 2:
         return jsonify({"message": "인원수는 최소 2명 이상이어야 합니다."}), 400
 
+    if get_course_by_code(course_id) is None:
+        return jsonify({"message": "존재하지 않는 강의입니다."}), 404
+
     recruitment = TeamRecruitment(
         course_id=course_id,
         author_id=user_id,
@@ -62,6 +103,9 @@ def create_recruitment():
     # 작성자는 자동으로 멤버로 추가
     member = TeamRecruitmentMember(recruitment_id=recruitment.id, user_id=user_id)
     db.session.add(member)
+    db.session.flush()
+    sync_member_counts(recruitment.id)
+    bump_versions(recruit_key(course_id))
     db.session.commit()
 
     return (
@@ -79,7 +123,7 @@ def create_recruitment():
 @recruit_bp.route("/<int:recruitment_id>", methods=["DELETE"])
 @jwt_required()
 def delete_recruitment(recruitment_id):
-    user_id = int(get_jwt_identity())
+    user_id = current_user.id
     recruitment = TeamRecruitment.query.get(recruitment_id)
 
     if not recruitment:
@@ -92,6 +136,7 @@ def delete_recruitment(recruitment_id):
     TeamRecruitmentMember.query.filter_by(recruitment_id=recruitment_id).delete()
 
     db.session.delete(recruitment)
+    bump_versions(recruit_key(recruitment.course_id), team_key(recruitment_id))
     db.session.commit()
 
     return jsonify({"message": "모집글 삭제 완료"}), 200
@@ -100,8 +145,13 @@ def delete_recruitment(recruitment_id):
 # 모집 참여 / 취소 토글
 @recruit_bp.route("/<int:recruitment_id>/join", methods=["POST"])
 @jwt_required()
+@retry_on_locked
 def toggle_join(recruitment_id):
-    user_id = int(get_jwt_identity())
+    """
+    정원 검사와 인원 증가는 조건부 UPDATE 한 문장(services.recruitments.join_recruitment)이라
+    동시에 몰려도 정원을 넘지 않는다. 참여 / 자동 활성화 / 알림은 한 트랜잭션으로 커밋한다.
+    """
+    user_id = current_user.id
 
     recruitment = TeamRecruitment.query.get(recruitment_id)
     if not recruitment:
@@ -113,73 +163,64 @@ def toggle_join(recruitment_id):
     ).first()
 
     if existing:
-        # 참여 취소 - 팀 게시판이 활성화된 경우 취소 불가
-        if recruitment.is_board_activated:
+        # 참여 취소 - 팀 게시판이 활성화된 경우 취소 불가 (그 사이 활성화된 경우도 포함)
+        status = BOARD_ACTIVATED if recruitment.is_board_activated else leave_recruitment(recruitment_id, user_id)
+        if status == BOARD_ACTIVATED:
             return jsonify({"message": "팀 게시판이 활성화되어 참여 취소할 수 없습니다."}), 400
-        
-        # 참여 취소
-        db.session.delete(existing)
+        if status == NOT_MEMBER:
+            # 같은 사용자의 다른 취소 요청이 먼저 처리됐다
+            return jsonify({"message": "이미 참여 취소된 모집글입니다."}), 409
+
+        bump_versions(recruit_key(recruitment.course_id), team_key(recruitment_id))
         db.session.commit()
     else:
-        # 정원 체크
-        current_count = TeamRecruitmentMember.query.filter_by(
-            recruitment_id=recruitment_id
-        ).count()
-        if current_count >= recruitment.max_members:
+        status = join_recruitment(recruitment_id, user_id)
+        if status == FULL:
             return jsonify({"message": "이미 인원이 가득 찼습니다."}), 400
 
-        new_member = TeamRecruitmentMember(
-            recruitment_id=recruitment_id, user_id=user_id
-        )
-        db.session.add(new_member)
-        db.session.commit()
-        
-        # 🔔 모집 작성자에게 알림 (본인이 아닌 경우에만)
-        if recruitment.author_id != int(user_id):
-            joiner = User.query.get(user_id)
-            course = Course.query.filter_by(code=recruitment.course_id).first()
-            course_title = course.title if course else recruitment.course_id
-            
-            notification = Notification(
-                user_id=recruitment.author_id,
-                type="recruitment_join",
-                content=f"[{course_title}] 모집 \"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}\" 에 {joiner.name}님이 참여했습니다.",
-                related_id=recruitment_id,
-                course_id=recruitment.course_id
-            )
-            db.session.add(notification)
-            db.session.commit()
-        
-        # ✨ 인원이 다 차면 자동으로 팀 게시판 활성화
-        current_count = TeamRecruitmentMember.query.filter_by(
-            recruitment_id=recruitment_id
-        ).count()
-        
-        if current_count >= recruitment.max_members and not recruitment.is_board_activated:
-            # 팀 게시판 자동 활성화
-            recruitment.is_board_activated = True
-            db.session.commit()
-            
-            # 🔔 팀원 전체에게 활성화 알림 전송
-            course = Course.query.filter_by(code=recruitment.course_id).first()
-            course_title = course.title if course else recruitment.course_id
-            
-            # 모든 팀원에게 알림 전송
-            all_members = TeamRecruitmentMember.query.filter_by(
-                recruitment_id=recruitment_id
-            ).all()
-            
-            for member in all_members:
-                notification = Notification(
-                    user_id=member.user_id,
-                    type="team_board_activated",
-                    content=f"[{course_title}] 모집 \"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}\"의 인원이 마감되어 팀 게시판이 활성화되었습니다!",
-                    related_id=recruitment_id,
-                    course_id=recruitment.course_id
+        if status == JOINED:
+            # ✨ 인원이 다 차면 자동으로 팀 게시판 활성화 (동시에 마지막 자리를 채워도 한 요청만 성공)
+            activated = activate_if_full(recruitment_id)
+            bump_versions(recruit_key(recruitment.course_id), team_key(recruitment_id))
+
+            course_title = course_title_for(recruitment.course_id)
+            short_title = f"{recruitment.title[:20]}{'...' if len(recruitment.title) > 20 else ''}"
+
+            # 🔔 모집 작성자에게 알림 (본인이 아닌 경우에만)
+            if recruitment.author_id != int(user_id):
+                db.session.add(
+                    Notification(
+                        user_id=recruitment.author_id,
+                        type="recruitment_join",
+                        content=f"[{course_title}] 모집 \"{short_title}\" 에 {current_user.name}님이 참여했습니다.",
+                        related_id=recruitment_id,
+                        course_id=recruitment.course_id,
+                    )
                 )
-                db.session.add(notification)
-            
+
+            # 🔔 활성화되었으면 팀원 전체에게 알림
+            member_ids = []
+            if activated:
+                member_ids = [
+                    uid
+                    for (uid,) in TeamRecruitmentMember.query.filter_by(recruitment_id=recruitment_id).with_entities(
+                        TeamRecruitmentMember.user_id
+                    )
+                ]
+                db.session.add_all(
+                    Notification(
+                        user_id=uid,
+                        type="team_board_activated",
+                        content=f"[{course_title}] 모집 \"{short_title}\"의 인원이 마감되어 팀 게시판이 활성화되었습니다!",
+                        related_id=recruitment_id,
+                        course_id=recruitment.course_id,
+                    )
+                    for uid in member_ids
+                )
+
             db.session.commit()
+            if activated:
+                metrics.observe("notification_fanout_size", len(member_ids), type="team_board_activated")
 
     # 최신 상태 다시 계산해서 내려주기
     updated = TeamRecruitment.query.get(recruitment_id)
@@ -199,7 +240,10 @@ def toggle_join(recruitment_id):
 @jwt_required()
 def list_team_boards(course_id):
     """현재 사용자가 참여한 활성화된 팀 게시판 목록 반환"""
-    user_id = int(get_jwt_identity())
+    user_id = current_user.id
+    course_pk = course_pk_for(course_id)
+    if course_pk is None:
+        return jsonify([]), 200
     
     # 사용자가 참여한 모집글의 ID들 가져오기
     member_recruitments = (
@@ -211,8 +255,9 @@ def list_team_boards(course_id):
     
     # 활성화되고 사용자가 참여한 팀 게시판만 조회
     team_boards = (
-        TeamRecruitment.query.filter(
-            TeamRecruitment.course_id == course_id,
+        TeamRecruitment.query.options(joinedload(TeamRecruitment.author))
+        .filter(
+            TeamRecruitment.course_pk == course_pk,
             TeamRecruitment.is_board_activated == True,
             TeamRecruitment.id.in_(recruitment_ids)
         )
@@ -220,14 +265,14 @@ def list_team_boards(course_id):
         .all()
     )
     
-    return jsonify([tb.to_dict(user_id=user_id) for tb in team_boards]), 200
+    return jsonify(serialize_recruitments(team_boards, user_id=user_id)), 200
 
 
 # 팀 게시판 활성화
 @recruit_bp.route("/<int:recruitment_id>/activate-team-board", methods=["POST"])
 @jwt_required()
 def activate_team_board(recruitment_id):
-    user_id = int(get_jwt_identity())
+    user_id = current_user.id
     recruitment = TeamRecruitment.query.get(recruitment_id)
 
     if not recruitment:
@@ -252,11 +297,11 @@ def activate_team_board(recruitment_id):
     recruitment.max_members = current_members_count
     recruitment.is_board_activated = True
     
+    bump_versions(recruit_key(recruitment.course_id))
     db.session.commit()
     
     # 🔔 팀원 전체에게 활성화 알림 전송 (수동 활성화)
-    course = Course.query.filter_by(code=recruitment.course_id).first()
-    course_title = course.title if course else recruitment.course_id
+    course_title = course_title_for(recruitment.course_id)
     
     # 모든 팀원에게 알림 전송 (리더 포함)
     all_members = TeamRecruitmentMember.query.filter_by(
@@ -274,6 +319,7 @@ def activate_team_board(recruitment_id):
         db.session.add(notification)
     
     db.session.commit()
+    metrics.observe("notification_fanout_size", len(all_members), type="team_board_activated")
 
     return (
         jsonify(
@@ -286,3 +332,116 @@ def activate_team_board(recruitment_id):
     )
 
 
+# 가능한 시간 기반 자동 팀 편성 (교수 전용)
+@recruit_bp.route("/<string:course_id>/auto-form", methods=["POST"])
+@jwt_required()
+def auto_form_teams(course_id):
+    """
+    수강생들의 가능한 시간을 분석해 공통 시간이 최대가 되도록 팀 구성을 제안.
+    create=true 로 요청하면 제안된 팀을 초안 모집글(TeamRecruitment)로 생성한다.
+    """
+    from routes.available import build_daily_blocks_from_slots
+
+    user_id = current_user.id
+    data = request.get_json() or {}
+
+    course = get_course_by_code(course_id)
+    if not course:
+        return jsonify({"message": "존재하지 않는 강의입니다."}), 404
+
+    if course.professor_id != user_id:
+        return jsonify({"message": "담당 교수만 팀을 자동 편성할 수 있습니다."}), 403
+
+    try:
+        team_size = int(data.get("team_size", 3))
+    except (TypeError, ValueError):
+        return jsonify({"message": "team_size는 숫자여야 합니다."}), 400
+
+    if team_size < 2:
+        return jsonify({"message": "인원수는 최소 2명 이상이어야 합니다."}), 400
+
+    exclude_joined = data.get("exclude_joined", True)
+    create = data.get("create", False)
+    if not isinstance(exclude_joined, bool) or not isinstance(create, bool):
+        return jsonify({"message": "exclude_joined, create는 true 또는 false여야 합니다."}), 400
+
+    masks, users = load_course_masks(course, exclude_joined=exclude_joined)
+    if len(masks) < 2:
+        return jsonify({"message": "편성할 수 있는 학생이 부족합니다."}), 400
+
+    teams = propose_teams(masks, team_size)
+
+    teams_payload = []
+    for index, team in enumerate(teams, start=1):
+        common = team_common_mask([masks[uid] for uid in team])
+        teams_payload.append(
+            {
+                "team_no": index,
+                "members": [
+                    {
+                        "user_id": uid,
+                        "name": users[uid].name,
+                        "student_id": users[uid].student_id,
+                        "profile_image": users[uid].profile_image,
+                    }
+                    for uid in team
+                ],
+                "common_slot_count": common.bit_count(),
+                "daily_blocks": build_daily_blocks_from_slots(mask_to_slot_keys(common)),
+            }
+        )
+
+    created = []
+    if create:
+        # 초안 모집글 생성: 편성한 교수를 작성자로(교수는 팀원이 아님), 편성된 인원으로 정원 고정
+        # 게시판 활성화는 하지 않으므로 학생들이 확인 후 직접 활성화한다.
+        # 팀 게시판 이름은 이 강의의 기존 팀 게시판과 겹치지 않게 정한다 ("1팀" 이 있으면 "1팀 (2)")
+        taken = {
+            name
+            for (name,) in TeamRecruitment.query.filter(
+                TeamRecruitment.course_pk == course.id, TeamRecruitment.team_board_name.isnot(None)
+            ).with_entities(TeamRecruitment.team_board_name)
+        }
+        for payload, team in zip(teams_payload, teams):
+            board_name = f"{payload['team_no']}팀"
+            suffix = 2
+            while board_name in taken:
+                board_name = f"{payload['team_no']}팀 ({suffix})"
+                suffix += 1
+            taken.add(board_name)
+
+            recruitment = TeamRecruitment(
+                course_id=course.code,
+                author_id=user_id,
+                title=f"[자동 편성] {board_name}",
+                description=f"가능한 시간을 기준으로 자동 편성된 팀입니다. (공통 시간 {payload['common_slot_count'] * 30}분/주)",
+                team_board_name=board_name,
+                max_members=len(team),
+            )
+            db.session.add(recruitment)
+            db.session.flush()
+
+            for uid in team:
+                db.session.add(TeamRecruitmentMember(recruitment_id=recruitment.id, user_id=uid))
+
+            payload["recruitment_id"] = recruitment.id
+            payload["team_board_name"] = board_name
+            created.append(recruitment.id)
+
+        db.session.flush()
+        sync_member_counts(*created)
+        bump_versions(recruit_key(course.code))
+        db.session.commit()
+
+    return (
+        jsonify(
+            {
+                "course_id": course.code,
+                "team_size": team_size,
+                "student_count": len(masks),
+                "teams": teams_payload,
+                "created_recruitment_ids": created,
+            }
+        ),
+        201 if created else 200,
+    )
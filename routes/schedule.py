@@ -1,16 +1,25 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from extensions import db
 from models import Schedule
+from services.resource_versions import bump_user_teams, bump_versions, schedule_key
+from datetime import datetime
 
 schedule_bp = Blueprint("schedule", __name__, url_prefix="/schedule")
 
 
+def parse_optional_time(value):
+    """'HH:MM' 문자열을 Time 으로 변환 (비어 있으면 None → 종일 일정)"""
+    if not value:
+        return None
+    return datetime.strptime(value, "%H:%M").time()
+
+
 # 사용자의 모든 일정 조회 (년/월 필터링)
 @schedule_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_schedules():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     
     year = request.args.get("year", type=int)
     month = request.args.get("month", type=int)
@@ -28,12 +37,21 @@ def get_schedules():
 @schedule_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_schedule():
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     data = request.get_json()
     
     if not data.get("title") or not data.get("date") or not data.get("month") or not data.get("year"):
         return jsonify({"message": "제목, 날짜, 월, 년도는 필수입니다."}), 400
     
+    try:
+        start_time = parse_optional_time(data.get("start_time"))
+        end_time = parse_optional_time(data.get("end_time"))
+    except ValueError:
+        return jsonify({"message": "시간 형식이 올바르지 않습니다. (HH:MM)"}), 400
+    
+    if (start_time is None) != (end_time is None) or (start_time and end_time <= start_time):
+        return jsonify({"message": "시작/종료 시간을 올바르게 입력해주세요."}), 400
+    
     try:
         new_schedule = Schedule(
             user_id=int(user_id),
@@ -41,11 +59,16 @@ def create_schedule():
             date=data["date"],
             month=data["month"],
             year=data["year"],
+            start_time=start_time,
+            end_time=end_time,
             color=data.get("color", "#a8d5e2"),
             category=data.get("category", "")
         )
         
         db.session.add(new_schedule)
+        # 팀 공통 시간은 팀원의 개인 일정을 뺀 값이므로 팀 버전도 올린다 (일정 버전은 일정 마스크 캐시 키)
+        bump_versions(schedule_key(user_id))
+        bump_user_teams(user_id)
         db.session.commit()
         
         return jsonify(new_schedule.to_dict()), 201
@@ -59,7 +82,7 @@ def create_schedule():
 @schedule_bp.route("/<int:schedule_id>", methods=["PUT"])
 @jwt_required()
 def update_schedule(schedule_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     schedule = Schedule.query.get(schedule_id)
     
     if not schedule:
@@ -70,7 +93,19 @@ def update_schedule(schedule_id):
     
     data = request.get_json()
     
+    if "start_time" in data or "end_time" in data:
+        try:
+            start_time = parse_optional_time(data.get("start_time", schedule.start_time and schedule.start_time.strftime("%H:%M")))
+            end_time = parse_optional_time(data.get("end_time", schedule.end_time and schedule.end_time.strftime("%H:%M")))
+        except (TypeError, ValueError):
+            return jsonify({"message": "시간 형식이 올바르지 않습니다. (HH:MM)"}), 400
+        if (start_time is None) != (end_time is None) or (start_time and end_time <= start_time):
+            return jsonify({"message": "시작/종료 시간을 올바르게 입력해주세요."}), 400
+
     try:
+        if "start_time" in data or "end_time" in data:
+            schedule.start_time = start_time
+            schedule.end_time = end_time
         if "title" in data:
             schedule.title = data["title"]
         if "date" in data:
@@ -84,6 +119,8 @@ def update_schedule(schedule_id):
         if "category" in data:
             schedule.category = data["category"]
         
+        bump_versions(schedule_key(user_id))
+        bump_user_teams(user_id)
         db.session.commit()
         
         return jsonify(schedule.to_dict()), 200
@@ -97,7 +134,7 @@ def update_schedule(schedule_id):
 @schedule_bp.route("/<int:schedule_id>", methods=["DELETE"])
 @jwt_required()
 def delete_schedule(schedule_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.id
     schedule = Schedule.query.get(schedule_id)
     
     if not schedule:
@@ -108,6 +145,8 @@ def delete_schedule(schedule_id):
     
     try:
         db.session.delete(schedule)
+        bump_versions(schedule_key(user_id))
+        bump_user_teams(user_id)
         db.session.commit()
         return jsonify({"message": "일정이 삭제되었습니다."}), 200
     
@@ -0,0 +1,209 @@
+"""
+가능한 시간(AvailableTime)을 비트셋으로 다루기 위한 공통 유틸.
+
+일주일을 30분 단위 슬롯(7 * 48 = 336개)으로 나누고,
+슬롯 하나를 정수의 비트 하나로 표현한다.
+  - bit index = 요일 인덱스 * 48 + (분 // 30)
+  - 공통 시간 = 멤버 마스크들의 AND
+  - 공통 슬롯 수 = mask.bit_count()
+
+또한 (user_id, team_id, 요일) 단위로 겹치거나 맞닿은 구간을 하나로 합치는
+구간 정규화(normalize) 로직도 이곳에 둔다.
+"""
+from datetime import time as dt_time
+
+DAY_ORDER = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+SLOT_MINUTES = 30
+END_OF_DAY = 24 * 60
+SLOTS_PER_DAY = END_OF_DAY // SLOT_MINUTES
+FULL_WEEK_MASK = (1 << (SLOTS_PER_DAY * len(DAY_ORDER))) - 1
+
+
+def day_index(day_name):
+    try:
+        return DAY_ORDER.index(day_name)
+    except ValueError:
+        return None
+
+
+def time_to_minutes(time_obj):
+    return time_obj.hour * 60 + time_obj.minute
+
+
+def end_time_to_minutes(time_obj):
+    """
+    구간 끝 시간 → 분. 24:00 은 Time 으로 표현할 수 없어 00:00 으로 저장하므로 끝 시간 00:00 은 24:00 으로 읽는다
+    (끝은 시작보다 늦어야 하므로 그날 0시에 끝나는 구간은 없다).
+    """
+    return time_to_minutes(time_obj) or END_OF_DAY
+
+
+def minutes_to_time(minutes):
+    # 24:00 은 00:00 으로 저장 — 끝 시간을 end_time_to_minutes 로 읽으면 다시 24:00 이 된다
+    return dt_time((minutes // 60) % 24, minutes % 60)
+
+
+def format_end_time(time_obj):
+    """끝 시간 "HH:MM" (00:00 은 "24:00")"""
+    minutes = end_time_to_minutes(time_obj)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def interval_mask(day_idx, start_minutes, end_minutes):
+    """
+    하루 안의 [start, end) 구간을 슬롯 비트 마스크로 변환.
+    30분 단위로 떨어지지 않는 시간은 시작은 내림, 끝은 올림해서 구간에 걸친 슬롯을 모두 포함한다 (09:10~10:10 → 09:00~10:30).
+    """
+    start_minutes = max(0, start_minutes)
+    end_minutes = min(END_OF_DAY, end_minutes)
+    if end_minutes <= start_minutes:
+        return 0
+
+    first = start_minutes // SLOT_MINUTES
+    last = -(-end_minutes // SLOT_MINUTES)
+    width = last - first
+    return ((1 << width) - 1) << (day_idx * SLOTS_PER_DAY + first)
+
+
+def build_slot_mask(times):
+    """AvailableTime 목록을 하나의 주간 비트 마스크로 변환"""
+    mask = 0
+    for time in times:
+        idx = day_index(time.day_of_week)
+        if idx is None:
+            continue
+        mask |= interval_mask(
+            idx,
+            time_to_minutes(time.start_time),
+            end_time_to_minutes(time.end_time),
+        )
+    return mask
+
+
+def mask_to_slot_keys(mask):
+    """비트 마스크를 기존 슬롯 키("요일-시-분") 집합으로 변환"""
+    slots = set()
+    while mask:
+        low_bit = mask & -mask
+        bit = low_bit.bit_length() - 1
+        idx, slot = divmod(bit, SLOTS_PER_DAY)
+        minutes = slot * SLOT_MINUTES
+        slots.add(f"{idx}-{minutes // 60}-{minutes % 60}")
+        mask ^= low_bit
+    return slots
+
+
+# =====================================================
+# 구간 정규화
+# =====================================================
+def merge_intervals(intervals):
+    """(start, end) 분 단위 구간 목록에서 겹치거나 맞닿은 구간을 합쳐 정렬된 목록으로 반환"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def _apply_intervals(rows, intervals, make_row):
+    """
+    기존 행(rows)을 재사용해서 정규화된 구간(intervals)을 반영.
+    남는 행은 삭제하고, 부족하면 make_row 로 새로 만든다.
+    변경된 행이 있으면 True 반환.
+    """
+    from extensions import db
+
+    changed = False
+    rows = sorted(rows, key=lambda r: (time_to_minutes(r.start_time), r.id or 0))
+
+    for index, (start, end) in enumerate(intervals):
+        start_time = minutes_to_time(start)
+        end_time = minutes_to_time(end)
+        if index < len(rows):
+            row = rows[index]
+            if row.start_time != start_time or row.end_time != end_time:
+                row.start_time = start_time
+                row.end_time = end_time
+                changed = True
+        else:
+            db.session.add(make_row(start_time, end_time))
+            changed = True
+
+    for row in rows[len(intervals):]:
+        db.session.delete(row)
+        changed = True
+
+    return changed
+
+
+def save_available_interval(user_id, team_id, day_of_week, start_time, end_time):
+    """
+    새 가능한 시간을 (user_id, team_id, 요일) 기준으로 정규화하여 저장 (커밋은 호출자가).
+    반환: "exists" (이미 포함된 구간), "saved" (추가/병합됨)
+    """
+    from models import AvailableTime
+
+    rows = AvailableTime.query.filter_by(
+        user_id=user_id, team_id=team_id, day_of_week=day_of_week
+    ).all()
+
+    start = time_to_minutes(start_time)
+    end = end_time_to_minutes(end_time)
+    for row in rows:
+        if time_to_minutes(row.start_time) <= start and end <= end_time_to_minutes(row.end_time):
+            return "exists"
+
+    intervals = merge_intervals(
+        [(time_to_minutes(r.start_time), end_time_to_minutes(r.end_time)) for r in rows]
+        + [(start, end)]
+    )
+
+    _apply_intervals(
+        rows,
+        intervals,
+        lambda s, e: AvailableTime(
+            user_id=user_id,
+            team_id=team_id,
+            day_of_week=day_of_week,
+            start_time=s,
+            end_time=e,
+        ),
+    )
+    return "saved"
+
+
+def compact_available_times(dry_run=False):
+    """
+    기존 AvailableTime 데이터 전체를 (user_id, team_id, 요일) 단위로 정규화.
+    반환: (정규화 전 행 수, 정규화 후 행 수)
+    """
+    from collections import defaultdict
+    from extensions import db
+    from models import AvailableTime
+
+    groups = defaultdict(list)
+    rows = AvailableTime.query.order_by(AvailableTime.id).all()
+    for row in rows:
+        groups[(row.user_id, row.team_id, row.day_of_week)].append(row)
+
+    after = 0
+    for (user_id, team_id, day_of_week), group in groups.items():
+        intervals = merge_intervals(
+            [(time_to_minutes(r.start_time), end_time_to_minutes(r.end_time)) for r in group]
+        )
+        # 시작 >= 끝인 잘못된 구간은 정규화 과정에서 제거
+        intervals = [(s, e) for s, e in intervals if e > s]
+        after += len(intervals)
+        if not dry_run:
+            _apply_intervals(group, intervals, None)
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    return len(rows), after
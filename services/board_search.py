@@ -0,0 +1,229 @@
+"""
+게시판 전문 검색 (SQLite FTS5).
+
+board_search 가상 테이블 하나에 게시글(제목·본문)과 댓글(본문)을 함께 색인한다.
+  rowid      게시글 = id * 2, 댓글 = id * 2 + 1 (트리거가 삭제·수정할 때 rowid 로 바로 찾는다)
+  scope      'c<course_pk> k<category>' 토큰 — 강의 / 카테고리 범위를 FTS 안에서 교집합으로 거른다
+  post_id, kind  결과 조립용 (색인하지 않음)
+색인은 course_board_posts / course_board_comments 의 트리거로 같은 트랜잭션에서 갱신된다 (m0005).
+
+토크나이저는 unicode61 이라 한국어는 어절 단위로 쪼개진다. 검색어마다 접두어 검색("시험"*)을 쓰므로
+'시험' 으로 '시험은', '시험범위' 는 찾지만 어절 중간('중간시험')은 찾지 않는다.
+
+SQLite 가 아닌 DB 에서는 색인을 만들지 않고 is_available() 이 False 다.
+"""
+import re
+
+from markupsafe import escape
+from sqlalchemy import text
+
+from extensions import db
+
+TABLE = "board_search"
+MAX_TERMS = 8
+SNIPPET_TOKENS = 24
+
+# 하이라이트 구간 표시 — 본문을 HTML 이스케이프한 뒤 <mark> 로 바꾼다
+_MARK_START, _MARK_END = "\x02", "\x03"
+_TERM = re.compile(r"\w+")
+
+# 게시판 카테고리 — scope 토큰(k<category>)으로 색인되므로 검색 범위도 이 값만 받는다
+CATEGORIES = ("notice", "question", "free", "community", "team")
+
+_SCOPE_SQL = "'c' || {post}.course_pk || ' k' || {post}.category"
+
+CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+    " title, content, scope, post_id UNINDEXED, kind UNINDEXED,"
+    " tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    # ORDER BY rank 의 기준: 제목 가중치 5, 본문 1, scope 0
+    f"INSERT INTO {TABLE} ({TABLE}, rank) VALUES ('rank', 'bm25(5.0, 1.0, 0.0)')",
+)
+
+TRIGGERS = (
+    # ---------------- 게시글 ----------------
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_post_ai AFTER INSERT ON course_board_posts BEGIN
+        INSERT INTO {TABLE} (rowid, title, content, scope, post_id, kind)
+        VALUES (new.id * 2, new.title, new.content, {_SCOPE_SQL.format(post="new")}, new.id, 'post');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_post_au AFTER UPDATE OF title, content, category, course_pk
+    ON course_board_posts BEGIN
+        DELETE FROM {TABLE} WHERE rowid = old.id * 2;
+        INSERT INTO {TABLE} (rowid, title, content, scope, post_id, kind)
+        VALUES (new.id * 2, new.title, new.content, {_SCOPE_SQL.format(post="new")}, new.id, 'post');
+        UPDATE {TABLE} SET scope = {_SCOPE_SQL.format(post="new")}
+        WHERE rowid IN (SELECT id * 2 + 1 FROM course_board_comments WHERE post_id = new.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_post_ad AFTER DELETE ON course_board_posts BEGIN
+        DELETE FROM {TABLE} WHERE rowid = old.id * 2
+            OR rowid IN (SELECT id * 2 + 1 FROM course_board_comments WHERE post_id = old.id);
+    END""",
+    # ---------------- 댓글 ----------------
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_comment_ai AFTER INSERT ON course_board_comments BEGIN
+        INSERT INTO {TABLE} (rowid, title, content, scope, post_id, kind)
+        SELECT new.id * 2 + 1, NULL, new.content, {_SCOPE_SQL.format(post="p")}, new.post_id, 'comment'
+        FROM course_board_posts p WHERE p.id = new.post_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_comment_au AFTER UPDATE OF content ON course_board_comments BEGIN
+        DELETE FROM {TABLE} WHERE rowid = old.id * 2 + 1;
+        INSERT INTO {TABLE} (rowid, title, content, scope, post_id, kind)
+        SELECT new.id * 2 + 1, NULL, new.content, {_SCOPE_SQL.format(post="p")}, new.post_id, 'comment'
+        FROM course_board_posts p WHERE p.id = new.post_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS board_search_comment_ad AFTER DELETE ON course_board_comments BEGIN
+        DELETE FROM {TABLE} WHERE rowid = old.id * 2 + 1;
+    END""",
+)
+
+REBUILD = (
+    f"DELETE FROM {TABLE}",
+    f"""INSERT INTO {TABLE} (rowid, title, content, scope, post_id, kind)
+        SELECT p.id * 2, p.title, p.content, {_SCOPE_SQL.format(post="p")}, p.id, 'post'
+        FROM course_board_posts p""",
+    f"""INSERT INTO {TABLE} (rowid, title, content, scope, post_id, kind)
+        SELECT c.id * 2 + 1, NULL, c.content, {_SCOPE_SQL.format(post="p")}, c.post_id, 'comment'
+        FROM course_board_comments c JOIN course_board_posts p ON p.id = c.post_id""",
+    f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')",
+)
+
+_SEARCH_SQL = text(
+    f"""SELECT rowid, kind, post_id,
+               highlight({TABLE}, 0, :mark_start, :mark_end) AS title_hl,
+               snippet({TABLE}, 1, :mark_start, :mark_end, '…', :snippet_tokens) AS snippet_hl
+        FROM {TABLE} WHERE {TABLE} MATCH :match
+        ORDER BY rank LIMIT :limit OFFSET :offset"""
+)
+
+
+# =====================================================
+# 색인 관리 (마이그레이션 / CLI)
+# =====================================================
+def is_supported(connection):
+    return connection.dialect.name == "sqlite"
+
+
+def create_index(connection):
+    """색인 테이블과 트리거 생성 (이미 있으면 건너뜀). 새로 만들었으면 True"""
+    from migrations import has_table
+
+    created = not has_table(connection, TABLE)
+    for ddl in (CREATE_TABLE if created else ()) + TRIGGERS:
+        connection.execute(text(ddl))
+    return created
+
+
+def rebuild_index(connection):
+    """게시글 / 댓글 테이블에서 색인을 다시 만든다"""
+    for sql in REBUILD:
+        connection.execute(text(sql))
+
+
+def is_available():
+    return is_supported(db.session.connection())
+
+
+# =====================================================
+# 검색
+# =====================================================
+def build_match_query(query, course_pk, category=None):
+    """사용자 입력 → FTS5 MATCH 식. 검색어가 없으면 None, CATEGORIES 에 없는 카테고리는 ValueError"""
+    if category and category not in CATEGORIES:
+        raise ValueError(f"unknown category: {category!r}")
+    terms = _TERM.findall(query or "")[:MAX_TERMS]
+    if not terms:
+        return None
+    parts = [f'scope : "c{int(course_pk)}"']
+    if category:
+        parts.append(f'scope : "k{category}"')
+    parts.append("{title content} : (" + " ".join(f'"{term}"*' for term in terms) + ")")
+    return " AND ".join(parts)
+
+
+def _highlight(fragment):
+    if not fragment:
+        return None
+    return str(escape(fragment)).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def _post_rows(post_ids):
+    """{게시글 id: (id, title, category, team_board_name, created_at, author)} — 쿼리 한 번"""
+    from models import CourseBoardPost, User
+
+    if not post_ids:
+        return {}
+    rows = (
+        db.session.query(
+            CourseBoardPost.id,
+            CourseBoardPost.title,
+            CourseBoardPost.category,
+            CourseBoardPost.team_board_name,
+            CourseBoardPost.created_at,
+            User.name.label("author"),
+        )
+        .outerjoin(User, User.id == CourseBoardPost.author_id)
+        .filter(CourseBoardPost.id.in_(post_ids))
+    )
+    return {row.id: row for row in rows}
+
+
+def _comment_rows(comment_ids):
+    from models import CourseBoardComment, User
+
+    if not comment_ids:
+        return {}
+    rows = (
+        db.session.query(CourseBoardComment.id, CourseBoardComment.created_at, User.name.label("author"))
+        .outerjoin(User, User.id == CourseBoardComment.author_id)
+        .filter(CourseBoardComment.id.in_(comment_ids))
+    )
+    return {row.id: row for row in rows}
+
+
+def search_board(course_pk, query, category=None, limit=20, offset=0):
+    """
+    (결과 목록, 다음 offset 또는 None). 결과는 관련도 순이며 title / snippet 은
+    HTML 이스케이프 후 일치 구간을 <mark> 로 감싼 문자열이다.
+    """
+    match = build_match_query(query, course_pk, category)
+    if match is None:
+        return [], None
+
+    hits = db.session.execute(
+        _SEARCH_SQL,
+        {
+            "match": match,
+            "mark_start": _MARK_START,
+            "mark_end": _MARK_END,
+            "snippet_tokens": SNIPPET_TOKENS,
+            "limit": limit + 1,
+            "offset": offset,
+        },
+    ).all()
+    next_offset = offset + limit if len(hits) > limit else None
+    hits = hits[:limit]
+
+    posts = _post_rows({hit.post_id for hit in hits})
+    comments = _comment_rows([hit.rowid // 2 for hit in hits if hit.kind == "comment"])
+
+    results = []
+    for hit in hits:
+        post = posts.get(hit.post_id)
+        if post is None:
+            continue
+        is_comment = hit.kind == "comment"
+        source = comments.get(hit.rowid // 2) if is_comment else post
+        results.append(
+            {
+                "type": hit.kind,
+                "post_id": post.id,
+                "comment_id": hit.rowid // 2 if is_comment else None,
+                "post_title": post.title,
+                "title": str(escape(post.title)) if is_comment else _highlight(hit.title_hl),
+                "snippet": _highlight(hit.snippet_hl),
+                "category": post.category,
+                "team_board_name": post.team_board_name,
+                "author": source.author if source else None,
+                "created_at": source.created_at.strftime("%Y-%m-%d %H:%M") if source and source.created_at else None,
+            }
+        )
+    return results, next_offset
@@ -0,0 +1,496 @@
+"""
+워커 간 공유 캐시.
+
+gunicorn 워커마다 메모리가 따로라 ttl_cache 같은 프로세스 내부 캐시는 워커 수만큼 중복되고 무효화도 제각각이다.
+여기서는 저장소를 바꿔 끼울 수 있는 캐시를 제공한다.
+
+  CACHE_BACKEND   local  : 프로세스 내부 LRU (워커 간 공유 없음, 개발용)
+                  sqlite : instance/cache.db 파일 하나를 모든 워커가 공유 (기본, WAL + mmap)
+                  redis  : Redis 프로토콜(RESP) 서버 (CACHE_REDIS_URL=redis://host:port/db)
+  CACHE_DEFAULT_TTL     기본 TTL 초 (60)
+  CACHE_LOCK_TIMEOUT    재계산 잠금 유지 / 대기 최대 초 (10)
+  CACHE_KEY_PREFIX      공유 저장소 키 접두어 ("allmeet:")
+
+  cache.get_or_set(key, producer, ttl=None, tags=())   없으면 producer() 로 계산해 저장
+  cache.invalidate_tags("team:3", "board:CS101")      태그가 붙은 항목 삭제
+
+get_or_set 은 캐시 미스가 동시에 몰려도(stampede) 한 요청만 계산한다.
+같은 워커의 스레드는 키별 잠금으로, 다른 워커는 저장소의 'lock:<키>' (없을 때만 쓰기, 값은 임의 token)로 막고,
+나머지는 값이 채워질 때까지 기다렸다가 그 값을 쓴다. 잠금은 값이 자기 token 일 때만 지운다(compare-and-delete).
+저장소 오류는 캐시 미스로 취급한다(fail-open).
+"""
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+# =====================================================
+# 저장소
+# =====================================================
+class LocalBackend:
+    """프로세스 내부 LRU + TTL. 값은 객체 그대로 보관한다"""
+
+    name = "local"
+    stores_objects = True
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, tags=()):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key, value, ttl):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] >= time.time():
+                return False
+            self._data[key] = (value, time.time() + ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def release(self, key, token):
+        """값이 token 일 때만 삭제 (내가 잡은 잠금만 푼다)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != token:
+                return False
+            del self._data[key]
+            return True
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+
+
+class SQLiteBackend:
+    """
+    모든 워커가 같은 SQLite 파일을 쓰는 공유 캐시.
+    캐시는 잃어도 되는 데이터이므로 synchronous=OFF, 문장마다 자동 커밋한다.
+    """
+
+    name = "sqlite"
+    stores_objects = False
+    PURGE_EVERY = 500
+
+    def __init__(self, path, mmap_size=64 * 1024 * 1024, busy_timeout_ms=2000):
+        self.path = path
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self):
+        # 스레드마다, fork 후에는 프로세스마다 새 연결
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_tags ("
+            " tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)")
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else MISSING
+
+    def set(self, key, value, ttl, tags=()):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+        if tags:
+            conn.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)", [(t, key) for t in tags])
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def add(self, key, value, ttl):
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE cache_entries.expires_at < ?",
+            (key, value, now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def release(self, key, token):
+        cursor = self._connect().execute("DELETE FROM cache_entries WHERE key = ? AND value = ?", (key, token))
+        return cursor.rowcount == 1
+
+    def invalidate_tags(self, tags):
+        tags = list(tags)
+        if not tags:
+            return
+        marks = ",".join("?" * len(tags))
+        conn = self._connect()
+        conn.execute(
+            f"DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_tags WHERE tag IN ({marks}))", tags
+        )
+        conn.execute(f"DELETE FROM cache_tags WHERE tag IN ({marks})", tags)
+
+    def purge_expired(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),))
+        conn.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM cache_entries")
+        conn.execute("DELETE FROM cache_tags")
+
+
+class RespError(Exception):
+    pass
+
+
+class RespConnection:
+    """Redis 직렬화 프로토콜(RESP2) 최소 구현 — 명령 전송과 응답 파싱만"""
+
+    def __init__(self, host, port, db=0, timeout=1.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        if db:
+            self.execute("SELECT", db)
+
+    @staticmethod
+    def _encode(args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis 연결이 끊어졌습니다.")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RespError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read() for _ in range(count)]
+        raise RespError(f"알 수 없는 응답: {line!r}")
+
+    def execute(self, *args):
+        self.sock.sendall(self._encode(args))
+        return self._read()
+
+    def pipeline(self, commands):
+        """여러 명령을 한 번에 보내고 응답 목록을 받는다"""
+        self.sock.sendall(b"".join(self._encode(args) for args in commands))
+        return [self._read() for _ in commands]
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisBackend:
+    name = "redis"
+    stores_objects = False
+    # 값이 내 token 일 때만 삭제 (GET 과 DEL 사이에 다른 워커가 잠금을 잡는 경합이 없도록 서버에서 한 번에)
+    RELEASE_SCRIPT = (
+        "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(self, url, prefix="allmeet:", timeout=1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = RespConnection(self.host, self.port, self.db, self.timeout)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _call(self, method, *args):
+        try:
+            return getattr(self._conn(), method)(*args)
+        except (OSError, ConnectionError):
+            # 끊어진 연결은 버리고 다음 호출에서 다시 연결
+            conn = getattr(self._local, "conn", None)
+            if conn is not None:
+                conn.close()
+            self._local.conn = None
+            raise
+
+    def _key(self, key):
+        return self.prefix + key
+
+    def _tag(self, tag):
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key):
+        value = self._call("execute", "GET", self._key(key))
+        return MISSING if value is None else value
+
+    def set(self, key, value, ttl, tags=()):
+        ttl_ms = int(ttl * 1000)
+        commands = [("SET", self._key(key), value, "PX", ttl_ms)]
+        for tag in tags:
+            commands.append(("SADD", self._tag(tag), key))
+            commands.append(("PEXPIRE", self._tag(tag), ttl_ms * 2))
+        self._call("pipeline", commands)
+
+    def add(self, key, value, ttl):
+        return self._call("execute", "SET", self._key(key), value, "NX", "PX", int(ttl * 1000)) == "OK"
+
+    def delete(self, key):
+        self._call("execute", "DEL", self._key(key))
+
+    def release(self, key, token):
+        return self._call("execute", "EVAL", self.RELEASE_SCRIPT, 1, self._key(key), token) == 1
+
+    def invalidate_tags(self, tags):
+        tags = list(tags)
+        if not tags:
+            return
+        members = self._call("pipeline", [("SMEMBERS", self._tag(tag)) for tag in tags])
+        keys = {self._key(m.decode()) for group in members for m in (group or [])}
+        self._call("execute", "DEL", *(list(keys) + [self._tag(tag) for tag in tags]))
+
+    def clear(self):
+        cursor = "0"
+        while True:
+            cursor, keys = self._call("execute", "SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+            if keys:
+                self._call("execute", "DEL", *keys)
+            if cursor == "0":
+                break
+
+
+# =====================================================
+# 캐시
+# =====================================================
+class SharedCache:
+    LOCK_STRIPES = 64
+
+    def __init__(self, app=None):
+        self.backend = LocalBackend()
+        self.default_ttl = 60
+        self.lock_timeout = 10.0
+        self.poll_interval = 0.02
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        # 같은 워커 안의 스레드끼리 키별 재계산을 막는 잠금 (키 해시로 나눠 씀)
+        self._stripes = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("CACHE_BACKEND", os.getenv("CACHE_BACKEND", "sqlite"))
+        app.config.setdefault(
+            "CACHE_SQLITE_PATH", os.getenv("CACHE_SQLITE_PATH", os.path.join(app.instance_path, "cache.db"))
+        )
+        app.config.setdefault("CACHE_REDIS_URL", os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0"))
+        app.config.setdefault("CACHE_KEY_PREFIX", os.getenv("CACHE_KEY_PREFIX", "allmeet:"))
+        app.config.setdefault("CACHE_LOCAL_MAXSIZE", int(os.getenv("CACHE_LOCAL_MAXSIZE", 1024)))
+        app.config.setdefault("CACHE_DEFAULT_TTL", float(os.getenv("CACHE_DEFAULT_TTL", 60)))
+        app.config.setdefault("CACHE_LOCK_TIMEOUT", float(os.getenv("CACHE_LOCK_TIMEOUT", 10)))
+
+        self.backend = self.create_backend(app.config)
+        self.default_ttl = app.config["CACHE_DEFAULT_TTL"]
+        self.lock_timeout = app.config["CACHE_LOCK_TIMEOUT"]
+
+    @staticmethod
+    def create_backend(config):
+        kind = config["CACHE_BACKEND"]
+        if kind == "local":
+            return LocalBackend(config["CACHE_LOCAL_MAXSIZE"])
+        if kind == "sqlite":
+            return SQLiteBackend(config["CACHE_SQLITE_PATH"])
+        if kind == "redis":
+            return RedisBackend(config["CACHE_REDIS_URL"], prefix=config["CACHE_KEY_PREFIX"])
+        raise ValueError(f"알 수 없는 CACHE_BACKEND: {kind}")
+
+    # ---------------------------------------------
+    # 직렬화 (공유 저장소는 bytes 만 보관)
+    # ---------------------------------------------
+    def _dump(self, value):
+        if self.backend.stores_objects:
+            return value
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _load(self, raw):
+        if self.backend.stores_objects:
+            return raw
+        return pickle.loads(raw)
+
+    def _safe(self, operation, *args, default=None):
+        try:
+            return getattr(self.backend, operation)(*args)
+        except Exception:
+            self.errors += 1
+            logger.warning("캐시 저장소 오류 (%s %s)", self.backend.name, operation, exc_info=True)
+            return default
+
+    # ---------------------------------------------
+    # API
+    # ---------------------------------------------
+    def get(self, key, default=None):
+        raw = self._safe("get", key, default=MISSING)
+        if raw is MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self._load(raw)
+
+    def set(self, key, value, ttl=None, tags=()):
+        self._safe("set", key, self._dump(value), ttl or self.default_ttl, tuple(tags))
+
+    def delete(self, key):
+        self._safe("delete", key)
+
+    def invalidate_tags(self, *tags):
+        if tags:
+            self._safe("invalidate_tags", tags)
+
+    def clear(self):
+        self._safe("clear")
+
+    def get_or_set(self, key, producer, ttl=None, tags=()):
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        stripe = self._stripes[zlib.crc32(key.encode()) % self.LOCK_STRIPES]
+        with stripe:
+            # 잠금을 기다리는 동안 같은 워커의 다른 스레드가 채웠을 수 있음
+            raw = self._safe("get", key, default=MISSING)
+            if raw is not MISSING:
+                return self._load(raw)
+
+            lock_key = f"lock:{key}"
+            token = uuid.uuid4().hex.encode()
+            if self._safe("add", lock_key, token, self.lock_timeout, default=True):
+                try:
+                    value = producer()
+                    self.set(key, value, ttl, tags)
+                    return value
+                finally:
+                    # 계산이 lock_timeout 을 넘겨 다른 워커가 잠금을 새로 잡았으면 그 잠금은 두고 간다
+                    self._safe("release", lock_key, token)
+
+        # 다른 워커가 계산 중: 스트라이프 잠금을 놓고(같은 스트라이프의 다른 키를 막지 않도록) 값을 기다린다
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            raw = self._safe("get", key, default=MISSING)
+            if raw is not MISSING:
+                return self._load(raw)
+
+        # 잠금을 잡은 워커가 죽었거나 너무 느림 — 직접 계산
+        logger.warning("캐시 재계산 대기 시간 초과: %s", key)
+        value = producer()
+        self.set(key, value, ttl, tags)
+        return value
+
+    def metric_samples(self):
+        """/metrics 용 누적값 [(이름, 라벨, 값)]"""
+        labels = {"cache": f"shared_{self.backend.name}"}
+        return [
+            ("cache_hits_total", labels, self.hits),
+            ("cache_misses_total", labels, self.misses),
+            ("cache_errors_total", labels, self.errors),
+        ]
+
+
+shared_cache = SharedCache()
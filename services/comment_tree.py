@@ -0,0 +1,203 @@
+"""
+게시글 댓글 직렬화와 답글 트리.
+
+CourseBoardComment.to_dict 는 댓글마다 author 와 comment_likes 전체를 lazy load 한다.
+여기서는 한 페이지의 댓글을 다음 쿼리로 만든다.
+  1. 트리 엔드포인트에서만: 최상위 댓글 한 페이지의 id (LIMIT), 그 아래 답글 id 는 재귀 CTE 한 번
+     (parent_comment_id 인덱스로 페이지에 든 스레드만 내려간다 — 게시글의 댓글 전체를 읽지 않음)
+  2. 응답에 들어갈 댓글 + 작성자 조인 한 번
+  3. 좋아요 수와 현재 사용자의 좋아요 여부를 comment_id 별 GROUP BY 한 번
+
+스레드는 최상위 댓글(parent_comment_id 가 NULL) 하나와 그 아래 모든 답글이다.
+답글은 항상 부모보다 id 가 크므로 id 순서로 한 번 훑으면 부모가 먼저 나온다.
+부모가 삭제되어 이어지지 않는 답글은 트리에서 빠진다 (기존 flat 목록에는 그대로 나온다).
+"""
+from sqlalchemy import case, func, select
+
+from extensions import db
+
+COMMENT_PAGE_SIZE = 20  # 최상위 댓글
+REPLY_PREVIEW_SIZE = 3  # 트리 응답에 미리 싣는 스레드별 답글
+REPLY_PAGE_SIZE = 20  # 답글 더 보기
+
+
+def load_like_stats(comment_ids, user_id=None):
+    """{댓글 id: (좋아요 수, 현재 사용자가 눌렀는지)} — GROUP BY 쿼리 한 번"""
+    from models import CourseBoardCommentLike
+
+    if not comment_ids:
+        return {}
+    liked = func.max(case((CourseBoardCommentLike.user_id == user_id, 1), else_=0)) if user_id else func.max(0)
+    rows = (
+        db.session.query(CourseBoardCommentLike.comment_id, func.count(CourseBoardCommentLike.id), liked)
+        .filter(CourseBoardCommentLike.comment_id.in_(list(comment_ids)))
+        .group_by(CourseBoardCommentLike.comment_id)
+    )
+    return {comment_id: (count, bool(is_liked)) for comment_id, count, is_liked in rows}
+
+
+def _comment_entry(comment, author, likes):
+    # CourseBoardComment.to_dict 와 같은 형식 (학번은 학생인 경우에만)
+    user_type = author.user_type if author else None
+    count, is_liked = likes
+    return {
+        "id": comment.id,
+        "post_id": comment.post_id,
+        "author_id": comment.author_id,
+        "author": author.name if author else "익명",
+        "author_student_id": author.student_id if user_type == "student" else None,
+        "is_professor": user_type == "professor",
+        "author_profile_image": author.profile_image if author else None,
+        "parent_comment_id": comment.parent_comment_id,
+        "content": comment.content,
+        "likes": count,
+        "is_liked": is_liked,
+        "created_at": comment.created_at.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def serialize_comments(comments, user_id=None):
+    """
+    [(CourseBoardComment, User 또는 None)] → to_dict 형식 목록 (입력 순서 유지).
+    작성자는 호출한 쪽 쿼리에서 조인해 두고, 좋아요는 여기서 한 번에 읽는다.
+    """
+    likes = load_like_stats({comment.id for comment, _ in comments}, user_id)
+    return [_comment_entry(comment, author, likes.get(comment.id, (0, False))) for comment, author in comments]
+
+
+def _load_comments(ids):
+    """id 오름차순 [(CourseBoardComment, User 또는 None)]"""
+    from models import CourseBoardComment, User
+
+    if not ids:
+        return []
+    return (
+        db.session.query(CourseBoardComment, User)
+        .outerjoin(User, User.id == CourseBoardComment.author_id)
+        .filter(CourseBoardComment.id.in_(list(ids)))
+        .order_by(CourseBoardComment.id)
+        .all()
+    )
+
+
+def list_post_comments(post_id, user_id=None):
+    """기존 flat 목록 (작성 순)"""
+    from models import CourseBoardComment, User
+
+    rows = (
+        db.session.query(CourseBoardComment, User)
+        .outerjoin(User, User.id == CourseBoardComment.author_id)
+        .filter(CourseBoardComment.post_id == post_id)
+        .order_by(CourseBoardComment.created_at.asc(), CourseBoardComment.id.asc())
+        .all()
+    )
+    return serialize_comments(rows, user_id)
+
+
+# =====================================================
+# 트리
+# =====================================================
+def _root_page(post_id, limit, after=None):
+    """(최상위 댓글 id 한 페이지, 다음 after 커서 또는 None) — id 오름차순, limit + 1 개만 읽는다"""
+    from models import CourseBoardComment
+
+    query = db.session.query(CourseBoardComment.id).filter(
+        CourseBoardComment.post_id == post_id, CourseBoardComment.parent_comment_id.is_(None)
+    )
+    if after is not None:
+        query = query.filter(CourseBoardComment.id > after)
+    ids = [comment_id for (comment_id,) in query.order_by(CourseBoardComment.id).limit(limit + 1)]
+    return _slice(ids, limit)
+
+
+def _descendants(root_ids):
+    """
+    root_ids 각각의 아래 모든 답글 (id, 스레드 루트 id) select — 재귀 CTE.
+    부모가 삭제되어 이어지지 않는 답글은 닿지 않으므로 빠진다.
+    """
+    from models import CourseBoardComment
+
+    comments = CourseBoardComment.__table__
+    thread = (
+        select(comments.c.id, comments.c.id.label("root_id"))
+        .where(comments.c.id.in_(list(root_ids)))
+        .cte("thread", recursive=True)
+    )
+    thread = thread.union_all(
+        select(comments.c.id, thread.c.root_id).where(comments.c.parent_comment_id == thread.c.id)
+    )
+    return select(thread.c.id, thread.c.root_id).where(thread.c.id != thread.c.root_id)
+
+
+def _threads(root_ids):
+    """{최상위 id: 스레드 답글 id 목록 (id 오름차순)}"""
+    threads = {root_id: [] for root_id in root_ids}
+    if root_ids:
+        query = _descendants(root_ids)
+        for comment_id, root_id in db.session.execute(query.order_by(query.selected_columns.id)):
+            threads[root_id].append(comment_id)
+    return threads
+
+
+def _build_forest(rows, user_id):
+    """
+    id 오름차순 rows 를 한 번 훑어 중첩 트리로 — 부모가 rows 안에 있으면 그 replies 에,
+    없으면 최상위 목록에 둔다. 반환: (최상위 노드 목록, {id: 노드})
+    """
+    nodes, forest = {}, []
+    for entry in serialize_comments(rows, user_id):
+        node = nodes[entry["id"]] = dict(entry, replies=[])
+        parent = nodes.get(entry["parent_comment_id"])
+        (parent["replies"] if parent is not None else forest).append(node)
+    return forest, nodes
+
+
+def _slice(ids, limit, start=None):
+    """(앞쪽 limit 개, 다음 after 커서 또는 None). 빈 페이지면 커서는 start"""
+    if len(ids) <= limit:
+        return ids, None
+    page = ids[:limit]
+    return page, page[-1] if page else start
+
+
+def comment_tree(post_id, user_id=None, limit=COMMENT_PAGE_SIZE, after=None, reply_limit=REPLY_PREVIEW_SIZE):
+    """
+    (최상위 댓글 노드 목록, 다음 after 커서). 각 노드에는
+      replies               중첩된 답글 노드 (스레드 전체에서 앞쪽 reply_limit 개까지)
+      reply_count           스레드 전체 답글 수
+      replies_next_cursor   더 있으면 replies_page() 에 넘길 after 값
+    """
+    page_roots, next_cursor = _root_page(post_id, limit, after)
+    threads = _threads(page_roots)
+
+    previews = {}
+    ids = list(page_roots)
+    for root_id in page_roots:
+        previews[root_id] = _slice(threads[root_id], reply_limit, start=root_id)
+        ids.extend(previews[root_id][0])
+
+    _, nodes = _build_forest(_load_comments(ids), user_id)
+    result = []
+    for root_id in page_roots:
+        node = nodes.get(root_id)
+        if node is None:  # 사이에 삭제됨
+            continue
+        node["reply_count"] = len(threads[root_id])
+        node["replies_next_cursor"] = previews[root_id][1]
+        result.append(node)
+    return result, next_cursor
+
+
+def replies_page(comment, user_id=None, limit=REPLY_PAGE_SIZE, after=None):
+    """
+    comment 아래 답글(모든 단계)을 id 순으로 limit 개 → (노드 목록, 다음 after 커서).
+    부모가 이전 페이지에 있는 답글은 최상위에 오며, parent_comment_id 로 이미 받은 노드에 붙이면 된다.
+    """
+    query = _descendants([comment.id])
+    column = query.selected_columns.id
+    if after is not None:
+        query = query.where(column > after)
+    ids = [comment_id for comment_id, _ in db.session.execute(query.order_by(column).limit(limit + 1))]
+    page_ids, next_cursor = _slice(ids, limit)
+    forest, _ = _build_forest(_load_comments(page_ids), user_id)
+    return forest, next_cursor
@@ -0,0 +1,115 @@
+"""
+응답 압축 (gzip / brotli).
+
+after_request 에서 JSON / 텍스트 응답 본문이 COMPRESS_MIN_SIZE 바이트 이상이면
+Accept-Encoding 의 q 값에 따라 brotli(설치된 경우) 또는 gzip 으로 압축한다.
+압축 대상 응답에는 항상 Vary: Accept-Encoding 을 붙이고, 강한 ETag 는 약한 ETag 로 바꾼다.
+
+  COMPRESS_ENABLED     기본 1
+  COMPRESS_MIN_SIZE    이보다 작은 본문은 그대로 (기본 500 바이트)
+  COMPRESS_LEVEL       gzip 레벨 (기본 6)
+  COMPRESS_BR_QUALITY  brotli 품질 (기본 4 — 동적 응답용으로 속도 우선)
+"""
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    ["application/json", "text/html", "text/plain", "text/css", "text/csv", "application/javascript"]
+)
+
+
+def parse_accept_encoding(header):
+    """'gzip;q=0.8, br' -> {'gzip': 0.8, 'br': 1.0}"""
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header, available):
+    """available 순서(선호 순) 중 클라이언트가 받는 인코딩, 없으면 None"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data, encoding, level=6, br_quality=4):
+    if encoding == "br":
+        return brotli.compress(data, quality=br_quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class ResponseCompressor:
+    def __init__(self, app=None):
+        self.enabled = True
+        self.min_size = 500
+        self.level = 6
+        self.br_quality = 4
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("COMPRESS_ENABLED", os.getenv("COMPRESS_ENABLED", "1") != "0")
+        app.config.setdefault("COMPRESS_MIN_SIZE", int(os.getenv("COMPRESS_MIN_SIZE", 500)))
+        app.config.setdefault("COMPRESS_LEVEL", int(os.getenv("COMPRESS_LEVEL", 6)))
+        app.config.setdefault("COMPRESS_BR_QUALITY", int(os.getenv("COMPRESS_BR_QUALITY", 4)))
+
+        self.enabled = app.config["COMPRESS_ENABLED"]
+        self.min_size = app.config["COMPRESS_MIN_SIZE"]
+        self.level = app.config["COMPRESS_LEVEL"]
+        self.br_quality = app.config["COMPRESS_BR_QUALITY"]
+
+        if self.enabled:
+            app.after_request(self._compress_response)
+
+    def _compress_response(self, response):
+        if (
+            response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or request.method == "HEAD"
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"), self.encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding, self.level, self.br_quality))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # 압축 전후 본문이 달라지므로 바이트 단위 동일성을 뜻하는 강한 ETag 는 쓸 수 없다
+            response.set_etag(etag, weak=True)
+        return response
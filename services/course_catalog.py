@@ -0,0 +1,107 @@
+"""
+강의 카탈로그 (전체 강의 목록 / 수강 강의 목록 / 코드·이름 앞부분 검색).
+
+전체 강의를 교수 이름과 조인한 쿼리 한 번으로 읽어 워커 메모리에 스냅샷으로 둔다.
+스냅샷은 리소스 버전(courses, users)에 묶여 있어서 강의 생성·삭제(courses)나
+이름 변경(users)으로 버전이 오르면 다음 요청에서 다시 만든다 — 다른 워커에서 바뀐 것도 바로 반영된다.
+버전 확인은 resource_versions 기본 키 조회 한 번이다.
+
+페이지 / 검색 결과는 services.pagination 규칙(id 내림차순, before 커서)을 따른다.
+"""
+import bisect
+import threading
+
+from services.resource_versions import COURSES_KEY, USERS_KEY, current_versions
+
+
+def _fold(text):
+    return (text or "").casefold()
+
+
+class CatalogSnapshot:
+    def __init__(self, version, courses):
+        self.version = version
+        # 기존 /course/all 순서 (최근 생성 순)
+        self.courses = courses
+        self.by_id = {course["id"]: course for course in courses}
+        # 페이지 단위 조회용 id 오름차순 (뒤에서부터 읽으면 내림차순)
+        self.ids = sorted(self.by_id)
+        # 앞부분 검색용 정렬 인덱스 [(접은 문자열, id)]
+        self.code_index = sorted((_fold(c["code"]), c["id"]) for c in self.courses)
+        self.title_index = sorted((_fold(c["title"]), c["id"]) for c in self.courses)
+
+    @staticmethod
+    def _prefix_ids(index, prefix):
+        start = bisect.bisect_left(index, (prefix,))
+        ids = []
+        for key, course_id in index[start:]:
+            if not key.startswith(prefix):
+                break
+            ids.append(course_id)
+        return ids
+
+    def search(self, prefix):
+        """강의 코드 또는 강의명이 prefix 로 시작하는 강의 id 집합"""
+        prefix = _fold(prefix)
+        return set(self._prefix_ids(self.code_index, prefix)) | set(self._prefix_ids(self.title_index, prefix))
+
+
+class CourseCatalog:
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_courses():
+        from extensions import db
+        from models import Course, User
+
+        rows = (
+            db.session.query(Course, User.name)
+            .outerjoin(User, User.id == Course.professor_id)
+            .order_by(Course.created_at.desc(), Course.id.desc())
+        )
+        # Course.to_dict 와 같은 형식
+        return [
+            {
+                "id": course.id,
+                "title": course.title,
+                "code": course.code,
+                "professor_id": course.professor_id,
+                "professor_name": professor_name,
+                "created_at": course.created_at.strftime("%Y-%m-%d %H:%M"),
+            }
+            for course, professor_name in rows
+        ]
+
+    def snapshot(self):
+        versions = current_versions([COURSES_KEY, USERS_KEY])
+        version = (versions[COURSES_KEY], versions[USERS_KEY])
+        current = self._snapshot
+        if current is not None and current.version == version:
+            return current
+        with self._lock:
+            current = self._snapshot
+            if current is None or current.version != version:
+                current = self._snapshot = CatalogSnapshot(version, self._load_courses())
+        return current
+
+    def all_courses(self):
+        return self.snapshot().courses
+
+    def get_many(self, course_ids):
+        """주어진 id 순서대로 강의 dict (없는 강의는 건너뜀)"""
+        by_id = self.snapshot().by_id
+        return [by_id[cid] for cid in course_ids if cid in by_id]
+
+    def browse(self, prefix=None, limit=None, before=None):
+        """(강의 목록, 다음 before 커서) — id 내림차순, prefix 는 코드/강의명 앞부분"""
+        snap = self.snapshot()
+        ids = sorted(snap.search(prefix)) if prefix else snap.ids
+        end = bisect.bisect_left(ids, before) if before is not None else len(ids)
+        start = 0 if limit is None else max(0, end - limit)
+        page = ids[start:end][::-1]
+        next_cursor = page[-1] if page and start > 0 else None
+        return [snap.by_id[cid] for cid in page], next_cursor
+
+course_catalog = CourseCatalog()
@@ -0,0 +1,74 @@
+"""
+강의 코드 ↔ id 조회 캐시.
+
+게시판 / 모집 / 알림 테이블은 강의를 코드 문자열(course_id)로 들고 있고, 정수 course_pk 를 함께 저장한다.
+글 작성·참여 처리마다 하던 Course.query.filter_by(code=...) 대신 여기서 (id, code, title) 요약을 꺼내 쓴다.
+
+강의 코드는 만든 뒤 바뀌지 않으므로 코드 ↔ id 는 사실상 고정이다. 워커마다 TTL 캐시에 두고,
+강의를 삭제한 워커는 바로 지우며 다른 워커는 TTL 안에 반영된다 (삭제된 강의의 글은 어차피 새로 생기지 않는다).
+"""
+from collections import namedtuple
+
+from services.ttl_cache import TTLCache
+
+COURSE_CACHE_SIZE = 4096
+COURSE_CACHE_TTL = 300  # 초
+
+CourseRef = namedtuple("CourseRef", ["id", "code", "title", "professor_id"])
+
+_by_code = TTLCache(COURSE_CACHE_SIZE, COURSE_CACHE_TTL, name="course_by_code")
+_by_id = TTLCache(COURSE_CACHE_SIZE, COURSE_CACHE_TTL, name="course_by_id")
+
+
+def _load(attr, value, connection=None):
+    from sqlalchemy import select
+
+    from extensions import db
+    from models import Course
+
+    stmt = select(Course.id, Course.code, Course.title, Course.professor_id).where(getattr(Course, attr) == value)
+    row = (connection or db.session).execute(stmt).first()
+    if row is None:
+        return None
+    ref = CourseRef(*row)
+    _by_code.set(ref.code, ref)
+    _by_id.set(ref.id, ref)
+    return ref
+
+
+def get_course_by_code(code, connection=None):
+    """
+    CourseRef 또는 None (없는 코드는 캐시하지 않는다).
+    flush 이벤트 안에서처럼 세션을 쓰면 안 되는 곳에서는 connection 을 넘긴다.
+    """
+    if not code:
+        return None
+    return _by_code.get(code) or _load("code", code, connection)
+
+
+def get_course_by_id(course_id, connection=None):
+    if course_id is None:
+        return None
+    return _by_id.get(int(course_id)) or _load("id", int(course_id), connection)
+
+
+def course_pk_for(code, connection=None):
+    ref = get_course_by_code(code, connection)
+    return ref.id if ref else None
+
+
+def course_title_for(code):
+    """알림 문구용 강의명 (강의가 없으면 코드 그대로)"""
+    ref = get_course_by_code(code)
+    return ref.title if ref else code
+
+
+def forget_course(course_id=None, code=None):
+    """강의 삭제 시 이 워커의 캐시에서 제거"""
+    ref = _by_id.get(int(course_id)) if course_id is not None else None
+    if ref is not None:
+        code = code or ref.code
+    if course_id is not None:
+        _by_id.discard(int(course_id))
+    if code:
+        _by_code.discard(code)
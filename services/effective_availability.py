@@ -0,0 +1,99 @@
+"""
+개인 일정(Schedule)을 반영한 '실제 가능한 시간(effective availability)' 계산.
+
+주간 반복 AvailableTime 에서, 특정 주(week)에 잡혀 있는 시간 지정 일정을 빼서
+그 주에 실제로 만날 수 있는 시간을 구한다.
+  effective = weekly_availability & ~busy(user, week)
+
+busy 마스크는 (user_id, 주 시작일, 일정 버전) 을 키로 워커 메모리에 캐시한다. 일정 버전(schedules:<user_id>)은
+일정을 추가/수정/삭제하는 트랜잭션에서 올라가므로, 어느 워커에서 바뀌었든 다음 조회부터는 키가 달라져
+바뀐 사용자-주만 다시 계산된다 (TTL 을 기다리지 않으므로 옛 마스크가 새 팀 버전의 공유 캐시에 들어가지 않는다).
+"""
+from datetime import date, timedelta
+
+from services.availability import interval_mask, time_to_minutes
+from services.resource_versions import get_versions, schedule_key
+from services.ttl_cache import TTLCache
+
+BUSY_CACHE_SIZE = 4096
+# 키에 일정 버전이 들어 있어 TTL 은 지난 주 항목을 비우는 용도
+BUSY_CACHE_TTL = 3600  # 초
+
+
+def week_start(day=None):
+    """해당 날짜가 속한 주의 월요일"""
+    day = day or date.today()
+    return day - timedelta(days=day.weekday())
+
+
+def parse_week(value):
+    """'YYYY-MM-DD' 문자열을 받아 그 주의 월요일로 변환 (잘못된 값이면 None)"""
+    if not value:
+        return None
+    try:
+        return week_start(date.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+_busy_cache = TTLCache(BUSY_CACHE_SIZE, BUSY_CACHE_TTL, name="busy_mask")
+
+
+def _schedule_mask(schedule, monday):
+    if schedule.start_time is None or schedule.end_time is None:
+        return 0
+    try:
+        event_day = date(schedule.year, schedule.month, schedule.date)
+    except ValueError:
+        return 0
+    offset = (event_day - monday).days
+    if not 0 <= offset < 7:
+        return 0
+    return interval_mask(
+        offset,
+        time_to_minutes(schedule.start_time),
+        time_to_minutes(schedule.end_time),
+    )
+
+
+def _load_busy_masks(user_ids, monday):
+    from extensions import db
+    from models import Schedule
+
+    days = [monday + timedelta(days=i) for i in range(7)]
+    months = {(d.year, d.month) for d in days}
+
+    masks = {uid: 0 for uid in user_ids}
+    schedules = Schedule.query.filter(
+        Schedule.user_id.in_(user_ids),
+        Schedule.start_time.isnot(None),
+        db.or_(*[db.and_(Schedule.year == y, Schedule.month == m) for y, m in months]),
+    ).all()
+    for schedule in schedules:
+        masks[schedule.user_id] |= _schedule_mask(schedule, monday)
+    return masks
+
+
+def busy_masks(user_ids, monday):
+    """여러 사용자의 해당 주 일정 마스크 (일정 버전 조회 한 번 + 캐시에 없는 사용자만 한 번의 쿼리로 로드)"""
+    user_ids = list(dict.fromkeys(user_ids))
+    # 버전을 먼저 읽는다: 그 사이 일정이 바뀌면 옛 버전 키에 새 마스크가 들어갈 뿐이라 안전하다
+    versions = get_versions([schedule_key(uid) for uid in user_ids])
+    cache_keys = {uid: (uid, monday, versions[schedule_key(uid)]) for uid in user_ids}
+
+    result = {}
+    missing = []
+    for uid in user_ids:
+        cached = _busy_cache.get(cache_keys[uid])
+        if cached is None:
+            missing.append(uid)
+        else:
+            result[uid] = cached
+
+    if missing:
+        loaded = _load_busy_masks(missing, monday)
+        for uid, mask in loaded.items():
+            _busy_cache.set(cache_keys[uid], mask)
+        result.update(loaded)
+
+    return result
@@ -0,0 +1,75 @@
+"""
+요청 단위 현재 사용자 로더와 사용자 요약 캐시.
+
+- jwt.user_lookup_loader 로 요청당 한 번만 User 를 조회하고,
+  핸들러에서는 flask_jwt_extended 의 current_user 로 꺼내 쓴다.
+- 투표자 목록/알림 문구처럼 이름·프로필 정도만 필요한 곳은
+  get_user_summaries() 로 워커 내부 TTL LRU 캐시에서 가져온다.
+  캐시 키에 USERS 리소스 버전을 넣으므로, 프로필 수정/탈퇴가 bump_versions(USERS_KEY)
+  로 버전을 올리면 어느 워커에서든 다음 조회부터 예전 요약을 쓰지 않는다.
+"""
+from flask import jsonify
+
+from extensions import db
+from services.resource_versions import USERS_KEY, current_versions
+from services.ttl_cache import TTLCache
+
+SUMMARY_CACHE_SIZE = 2048
+SUMMARY_CACHE_TTL = 30  # 초
+
+_summary_cache = TTLCache(SUMMARY_CACHE_SIZE, SUMMARY_CACHE_TTL, name="user_summary")
+
+
+def register_user_loader(jwt_manager):
+    @jwt_manager.user_lookup_loader
+    def load_current_user(_jwt_header, jwt_data):
+        from models import User
+
+        try:
+            user_id = int(jwt_data["sub"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return db.session.get(User, user_id)
+
+    @jwt_manager.user_lookup_error_loader
+    def current_user_not_found(_jwt_header, _jwt_data):
+        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
+
+
+def summarize_user(user):
+    """사용자 요약 (교수/봇은 학번 숨김)"""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "user_type": user.user_type,
+        "student_id": user.student_id if user.user_type == "student" else None,
+        "profile_image": user.profile_image,
+    }
+
+
+def get_user_summaries(user_ids):
+    """{user_id: 요약} — 캐시에 없는 사용자만 한 번의 쿼리로 조회"""
+    from models import User
+
+    version = current_versions([USERS_KEY])[USERS_KEY]
+    result = {}
+    missing = []
+    for uid in set(user_ids):
+        cached = _summary_cache.get((version, uid))
+        if cached is None:
+            missing.append(uid)
+        else:
+            result[uid] = cached
+
+    if missing:
+        for user in User.query.filter(User.id.in_(missing)).all():
+            summary = summarize_user(user)
+            _summary_cache.set((version, user.id), summary)
+            result[user.id] = summary
+
+    return result
+
+
+def get_user_summary(user_id):
+    return get_user_summaries([user_id]).get(user_id)
+
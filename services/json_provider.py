@@ -0,0 +1,74 @@
+"""
+JSON 직렬화 provider.
+
+orjson 이 설치되어 있으면 jsonify / request.get_json 을 orjson 으로 처리한다.
+출력 내용은 Flask 기본 provider 와 같게 맞춘다.
+  - datetime / date 는 기본 provider 와 같이 HTTP 날짜 문자열 (OPT_PASSTHROUGH_DATETIME + 같은 default)
+  - 정수 키 허용, sort_keys / compact(디버그 모드 들여쓰기) 설정 그대로
+다만 한글은 \\uXXXX 이스케이프 없이 UTF-8 로 나간다 (같은 JSON 값, 바이트 수는 더 작다).
+orjson 이 처리하지 못하는 값(64비트를 넘는 정수 등)은 기본 provider 로 다시 직렬화한다.
+
+  JSON_PROVIDER   auto (기본, orjson 있으면 사용) | orjson | std
+"""
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj, indent=False):
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options(indent))
+        except (orjson.JSONEncodeError, TypeError):
+            kwargs = {"indent": 2} if indent else {"separators": (",", ":")}
+            return super().dumps(obj, **kwargs).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # json.dumps 전용 인자(cls, separators 등)를 넘긴 호출은 기본 구현으로
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # 기본 json 모듈만 받아들이는 입력(NaN 등)
+            return super().loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
+
+
+def select_provider(name=None):
+    """JSON_PROVIDER 설정에 맞는 provider 클래스"""
+    name = (name or os.getenv("JSON_PROVIDER", "auto")).lower()
+    if name == "std":
+        return DefaultJSONProvider
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson 이지만 orjson 이 설치되어 있지 않습니다.")
+    return OrjsonProvider if orjson is not None else DefaultJSONProvider
+
+
+def configure_json(app):
+    app.config.setdefault("JSON_PROVIDER", os.getenv("JSON_PROVIDER", "auto"))
+    provider_class = select_provider(app.config["JSON_PROVIDER"])
+    app.json_provider_class = provider_class
+    app.json = provider_class(app)
@@ -0,0 +1,339 @@
+"""
+Prometheus 텍스트 형식 메트릭 (gunicorn 멀티 워커 집계).
+
+각 워커는 자기 메트릭을 메모리에 누적하고, 워커별 백그라운드 스레드가 METRICS_FLUSH_INTERVAL 초마다
+(값이 바뀌었을 때만) METRICS_DIR/metrics-<pid>.json 으로 통째로 덮어쓴다 (임시 파일 → os.replace).
+/metrics 를 읽으면 디렉터리의 모든 파일을 합산해서 내려준다.
+카운터/히스토그램은 누적값이라 종료된 워커의 값도 계속 합산해야 한다. 같은 pid 를 새 워커가 다시 받으면
+그 파일을 덮어써 버리므로, 워커는 종료 직전(worker_exit)에 마지막으로 flush 하고
+gunicorn master 가 워커 종료 시(child_exit) mark_process_dead(pid) 로
+그 워커의 파일을 metrics-dead.json 에 더해 두고 지운다 (prometheus_client 의 mark_process_dead 와 같은 방식).
+디렉터리는 gunicorn master 가 시작할 때(on_starting) 비운다.
+
+  metrics.inc(name, value=1, **labels)      카운터
+  metrics.observe(name, value, **labels)    히스토그램
+  metrics.register_collector(fn)            flush 시점에 다른 모듈 통계를 가져오는 콜백
+                                            fn() -> [(이름, {라벨}, 값)] (카운터로 합산)
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# 종료된 워커들의 누적값 (mark_process_dead)
+DEAD_FILE = "metrics-dead.json"
+
+# 이름: (종류, 설명, 버킷)
+METRIC_DEFINITIONS = {
+    "http_requests_total": ("counter", "처리한 HTTP 요청 수", None),
+    "http_request_duration_seconds": ("histogram", "HTTP 요청 처리 시간", LATENCY_BUCKETS),
+    "db_queries_per_request": ("histogram", "요청당 SQL 문장 수", QUERY_COUNT_BUCKETS),
+    "db_time_per_request_seconds": ("histogram", "요청당 DB 시간", LATENCY_BUCKETS),
+    "upload_bytes_total": ("counter", "업로드된 파일 바이트 수", None),
+    "uploads_total": ("counter", "업로드된 파일 수", None),
+    "notification_fanout_size": ("histogram", "한 번에 생성한 알림 수", SIZE_BUCKETS),
+    "password_hash_seconds": ("histogram", "bcrypt 작업 시간 (op=hash|verify, phase=queue_wait|hash_time)", LATENCY_BUCKETS),
+    "password_hash_rejected_total": ("counter", "대기열이 가득 차 거절한 bcrypt 작업 수", None),
+    "password_rehashed_total": ("counter", "로그인 시 cost 변경으로 재해시한 수", None),
+    "cache_hits_total": ("counter", "캐시 적중 수", None),
+    "cache_misses_total": ("counter", "캐시 미스 수", None),
+    "cache_errors_total": ("counter", "공유 캐시 저장소 오류 수", None),
+    "log_records_dropped_total": ("counter", "로그 큐가 가득 차 버린 기록 수", None),
+    "single_flight_calls_total": ("counter", "동일 요청 병합: 직접 계산(leader) / 결과를 받아 간(shared) 호출 수", None),
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _merge(counters, histograms, data):
+    """파일 하나({"counters", "histograms"})의 값을 누적 dict 에 더한다"""
+    for metric, labels, value in data["counters"]:
+        key = (metric, tuple(map(tuple, labels)))
+        counters[key] = counters.get(key, 0) + value
+    for metric, labels, entry in data["histograms"]:
+        key = (metric, tuple(map(tuple, labels)))
+        total = histograms.setdefault(key, {"buckets": [0] * len(entry["buckets"]), "sum": 0.0, "count": 0})
+        total["buckets"] = [a + b for a, b in zip(total["buckets"], entry["buckets"])]
+        total["sum"] += entry["sum"]
+        total["count"] += entry["count"]
+
+
+class Metrics:
+    def __init__(self, app=None):
+        self.enabled = False
+        self.directory = None
+        self.flush_interval = 1.0
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("METRICS_ENABLED", os.getenv("METRICS_ENABLED", "1") != "0")
+        app.config.setdefault(
+            "METRICS_DIR", os.getenv("METRICS_DIR", os.path.join(app.instance_path, "metrics"))
+        )
+        app.config.setdefault("METRICS_FLUSH_INTERVAL", float(os.getenv("METRICS_FLUSH_INTERVAL", 1)))
+        # /metrics 에 Authorization: Bearer <token> 필요. 설정하지 않으면 디버그 모드에서만 토큰 없이 열린다
+        app.config.setdefault("METRICS_TOKEN", os.getenv("METRICS_TOKEN"))
+
+        self.enabled = app.config["METRICS_ENABLED"]
+        self.directory = app.config["METRICS_DIR"]
+        self.flush_interval = app.config["METRICS_FLUSH_INTERVAL"]
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._counters = {}
+        self._histograms = {}
+        self._dirty = False
+        self._flusher = None
+
+    def _check_pid(self):
+        # fork 된 워커는 master 의 값을 물려받지 않고, 스레드도 새로 띄운다
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._flush_lock = threading.Lock()
+            self._reset()
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_loop, name="metrics-flusher", daemon=True
+                    )
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def register_collector(self, collector):
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    # -------------------------------
+    # 기록
+    # -------------------------------
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        self._check_pid()
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._dirty = True
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        self._check_pid()
+        buckets = METRIC_DEFINITIONS[name][2]
+        key = (name, _label_key(labels))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry["buckets"][i] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+            self._dirty = True
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        started = g.pop("metrics_started", None)
+        if started is None or request.endpoint == "metrics.get_metrics":
+            return response
+
+        endpoint = request.endpoint or "unmatched"
+        blueprint = request.blueprint or ""
+        self.inc(
+            "http_requests_total",
+            blueprint=blueprint,
+            endpoint=endpoint,
+            method=request.method,
+            status=response.status_code,
+        )
+        self.observe(
+            "http_request_duration_seconds",
+            time.perf_counter() - started,
+            blueprint=blueprint,
+            endpoint=endpoint,
+        )
+
+        stats = g.get("query_stats")
+        if stats is not None:
+            self.observe("db_queries_per_request", stats.count, endpoint=endpoint)
+            self.observe("db_time_per_request_seconds", stats.db_time, endpoint=endpoint)
+        return response
+
+    # -------------------------------
+    # 워커별 파일 저장 / 합산
+    # -------------------------------
+    def _snapshot(self):
+        with self._lock:
+            self._dirty = False
+            counters = [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [
+                [name, list(labels), dict(entry, buckets=list(entry["buckets"]))]
+                for (name, labels), entry in self._histograms.items()
+            ]
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    counters.append([name, list(_label_key(labels)), value])
+            except Exception:
+                logger.exception("메트릭 수집 콜백 오류: %r", collector)
+        return {"counters": counters, "histograms": histograms}
+
+    def flush(self):
+        if not self.enabled or self._pid != os.getpid():
+            return
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with self._flush_lock:
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._snapshot(), f)
+                os.replace(tmp_path, path)
+            except OSError:
+                logger.exception("메트릭 파일 저장 실패: %s", path)
+
+    def clear_directory(self, directory=None):
+        """gunicorn master 시작 시 이전 실행의 워커 파일 삭제"""
+        directory = directory or self.directory
+        if not directory or not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.startswith("metrics-"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def _read(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _aggregate(self):
+        counters = {}
+        histograms = {}
+        for name in os.listdir(self.directory):
+            if not (name.startswith("metrics-") and name.endswith(".json")):
+                continue
+            data = self._read(os.path.join(self.directory, name))
+            if data is not None:
+                _merge(counters, histograms, data)
+        return counters, histograms
+
+    def mark_process_dead(self, pid, directory=None):
+        """종료된 워커의 파일을 metrics-dead.json 에 합치고 삭제 (gunicorn master 의 child_exit 에서 호출)"""
+        directory = directory or self.directory
+        path = os.path.join(directory, f"metrics-{pid}.json")
+        data = self._read(path)
+        if data is None:
+            return
+        dead_path = os.path.join(directory, DEAD_FILE)
+        counters, histograms = {}, {}
+        dead = self._read(dead_path)
+        if dead is not None:
+            _merge(counters, histograms, dead)
+        _merge(counters, histograms, data)
+        tmp_path = f"{dead_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+                        "histograms": [[name, list(labels), entry] for (name, labels), entry in histograms.items()],
+                    },
+                    f,
+                )
+            os.replace(tmp_path, dead_path)
+            os.remove(path)
+        except OSError:
+            logger.exception("종료된 워커 메트릭 합산 실패: %s", path)
+
+    def render(self):
+        """모든 워커의 값을 합산한 Prometheus 텍스트"""
+        self.flush()
+        counters, histograms = self._aggregate()
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRIC_DEFINITIONS.items():
+            if kind == "counter":
+                series = sorted((k, v) for k, v in counters.items() if k[0] == name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (_, labels), value in series:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            else:
+                series = sorted((k, v) for k, v in histograms.items() if k[0] == name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (_, labels), entry in series:
+                    for bound, count in zip(buckets, entry["buckets"]):
+                        le = labels + (("le", repr(float(bound))),)
+                        lines.append(f"{name}_bucket{_format_labels(le)} {count}")
+                    inf = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf)} {entry['count']}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {entry['sum']}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {entry['count']}")
+
+        # 캐시 적중률 (합산한 hits / (hits + misses))
+        hit_ratios = []
+        for (name, labels), hits in sorted(counters.items()):
+            if name != "cache_hits_total":
+                continue
+            misses = counters.get(("cache_misses_total", labels), 0)
+            if hits + misses:
+                hit_ratios.append(f"cache_hit_ratio{_format_labels(labels)} {hits / (hits + misses):.4f}")
+        if hit_ratios:
+            lines.append("# HELP cache_hit_ratio 캐시 적중률")
+            lines.append("# TYPE cache_hit_ratio gauge")
+            lines.extend(hit_ratios)
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,60 @@
+"""
+목록 API 페이지네이션 (id 기준 keyset).
+
+기존 클라이언트가 배열 응답을 그대로 쓰도록 본문 형식은 바꾸지 않고,
+  ?limit=N          한 페이지 크기 (없으면 전체, 최대 MAX_LIMIT)
+  ?before=<id>      이 id 보다 작은(더 오래된) 항목부터
+  ?after=<id>       오래된 순 목록(댓글 등)에서 이 id 보다 큰 항목부터
+다음 페이지가 있으면 응답 헤더 X-Next-Cursor 에 다음 before 값을 넣는다.
+OFFSET 을 쓰지 않으므로 뒤쪽 페이지도 인덱스 범위 조회로 끝난다.
+"""
+from flask import jsonify, request
+
+MAX_LIMIT = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageArgs:
+    __slots__ = ("limit", "before", "after")
+
+    def __init__(self, limit=None, before=None, after=None):
+        self.limit = limit
+        self.before = before
+        self.after = after
+
+
+def parse_page_args(default_limit=None, max_limit=MAX_LIMIT):
+    """요청 쿼리스트링에서 limit / before / after 를 읽는다. 잘못된 값이면 ValueError"""
+    limit = request.args.get("limit", default_limit)
+    before = request.args.get("before")
+    after = request.args.get("after")
+    if limit is not None:
+        limit = int(limit)
+        if limit < 1:
+            raise ValueError("limit은 1 이상이어야 합니다.")
+        limit = min(limit, max_limit)
+    if before is not None:
+        before = int(before)
+    if after is not None:
+        after = int(after)
+    return PageArgs(limit, before, after)
+
+
+def keyset_page(query, id_column, page):
+    """id 내림차순 목록 query 에 페이지 조건을 적용해 (rows, next_cursor) 반환"""
+    if page.before is not None:
+        query = query.filter(id_column < page.before)
+    if page.limit is None:
+        return query.all(), None
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[: page.limit]
+    return rows, rows[-1].id
+
+
+def paginated_response(items, next_cursor):
+    response = jsonify(items)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    return response
@@ -0,0 +1,225 @@
+"""
+비밀번호 해시 서비스.
+
+bcrypt 는 의도적으로 느린 CPU 작업이라, 요청 워커에서 직접 실행하면
+학기 초 로그인 폭주 때 모든 워커가 해시 계산에 묶여 버린다.
+이 모듈은 크기가 제한된 프로세스 풀에서 해시/검증을 실행하고,
+  - BCRYPT_LOG_ROUNDS 로 cost 를 설정
+  - 로그인 성공 시 저장된 해시의 cost 가 설정과 다르면 자동으로 재해시
+  - 큐 대기 시간 / 해시 시간 히스토그램 수집 (/metrics 의 password_hash_seconds)
+을 담당한다. PASSWORD_HASH_WORKERS=0 이면 프로세스 풀 없이 현재 스레드에서 실행한다.
+
+요청 스레드는 풀의 결과를 기다리는 동안 막혀 있다. 그래서 기본 sync 워커(GUNICORN_THREADS=1)에서는
+CPU 작업이 다른 프로세스로 옮겨갈 뿐, 워커가 동시에 처리하는 요청 수는 늘지 않는다.
+해시를 기다리는 동안 같은 워커가 다른 요청을 받으려면 GUNICORN_THREADS 를 2 이상(gthread 워커)으로 실행한다.
+이때 워커당 동시에 도는 bcrypt 수는 PASSWORD_HASH_WORKERS 로, 대기 수는 PASSWORD_HASH_MAX_PENDING 으로 제한된다.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import bcrypt as _bcrypt
+
+from services.metrics import metrics
+
+# bcrypt 는 72바이트까지만 사용 (예전 bcrypt 버전의 암묵적 잘라내기와 동일하게 동작)
+BCRYPT_MAX_BYTES = 72
+
+
+class PasswordHashBusy(Exception):
+    """해시 대기열이 가득 차서 요청을 처리할 수 없는 경우"""
+
+
+def _to_bytes(value):
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return value[:BCRYPT_MAX_BYTES]
+
+
+def _hash_job(password, rounds, submitted_at):
+    started_at = time.time()
+    hashed = _bcrypt.hashpw(password, _bcrypt.gensalt(rounds))
+    return hashed.decode("utf-8"), started_at - submitted_at, time.time() - started_at
+
+
+def _check_job(pw_hash, password, submitted_at):
+    started_at = time.time()
+    try:
+        ok = _bcrypt.checkpw(password, pw_hash)
+    except ValueError:
+        # 잘못된 형식의 해시
+        ok = False
+    return ok, started_at - submitted_at, time.time() - started_at
+
+
+def hash_rounds(pw_hash):
+    """'$2b$12$...' 형식의 해시에서 cost 추출"""
+    try:
+        return int(pw_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class _Stat:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+        }
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.workers = 0
+        self.max_pending = 0
+        self.timeout = 30.0
+        self._pool = None
+        self._pool_pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._rejected = 0
+        self._rehashed = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("BCRYPT_LOG_ROUNDS", int(os.getenv("BCRYPT_LOG_ROUNDS", 12)))
+        app.config.setdefault("PASSWORD_HASH_WORKERS", int(os.getenv("PASSWORD_HASH_WORKERS", 2)))
+        app.config.setdefault("PASSWORD_HASH_MAX_PENDING", int(os.getenv("PASSWORD_HASH_MAX_PENDING", 16)))
+        app.config.setdefault("PASSWORD_HASH_TIMEOUT", float(os.getenv("PASSWORD_HASH_TIMEOUT", 30)))
+
+        self.rounds = app.config["BCRYPT_LOG_ROUNDS"]
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.max_pending = max(1, app.config["PASSWORD_HASH_MAX_PENDING"])
+        self.timeout = app.config["PASSWORD_HASH_TIMEOUT"]
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+        @app.errorhandler(PasswordHashBusy)
+        def _handle_busy(error):
+            return (
+                {"message": "요청이 많아 잠시 후 다시 시도해주세요."},
+                503,
+                {"Retry-After": "1"},
+            )
+
+    # -------------------------------
+    # 프로세스 풀 관리
+    # -------------------------------
+    def _get_pool(self):
+        # gunicorn 워커가 fork 된 뒤에는 부모의 풀을 쓸 수 없으므로 프로세스마다 새로 만든다
+        pid = os.getpid()
+        if self._pool is None or self._pool_pid != pid:
+            with self._lock:
+                if self._pool is None or self._pool_pid != pid:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                    self._pool_pid = pid
+        return self._pool
+
+    def reset(self):
+        """fork 이후 호출: 부모 프로세스의 풀 참조를 버린다"""
+        self._pool = None
+        self._pool_pid = None
+        if self.max_pending:
+            self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def shutdown(self):
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._pool_pid = None
+
+    def _run(self, op, job, *args):
+        submitted_at = time.time()
+
+        if self.workers <= 0:
+            result, queue_wait, elapsed = job(*args, submitted_at)
+        else:
+            if not self._slots.acquire(timeout=self.timeout):
+                self._rejected += 1
+                raise PasswordHashBusy()
+            try:
+                future = self._get_pool().submit(job, *args, submitted_at)
+                try:
+                    result, queue_wait, elapsed = future.result(timeout=self.timeout)
+                except FutureTimeoutError:
+                    future.cancel()
+                    self._rejected += 1
+                    raise PasswordHashBusy()
+            finally:
+                self._slots.release()
+
+        queue_wait = max(0.0, queue_wait)
+        with self._lock:
+            stats = self._stats.setdefault(op, {"queue_wait": _Stat(), "hash_time": _Stat()})
+            stats["queue_wait"].observe(queue_wait)
+            stats["hash_time"].observe(elapsed)
+        metrics.observe("password_hash_seconds", queue_wait, op=op, phase="queue_wait")
+        metrics.observe("password_hash_seconds", elapsed, op=op, phase="hash_time")
+        return result
+
+    # -------------------------------
+    # 공개 API
+    # -------------------------------
+    def hash_password(self, password):
+        return self._run("hash", _hash_job, _to_bytes(password), self.rounds)
+
+    def check_password(self, pw_hash, password):
+        if not pw_hash or password is None:
+            return False
+        return self._run("verify", _check_job, _to_bytes(pw_hash), _to_bytes(password))
+
+    def needs_rehash(self, pw_hash):
+        return hash_rounds(pw_hash) != self.rounds
+
+    def verify_and_upgrade(self, user, password):
+        """
+        비밀번호 검증 후, 저장된 해시의 cost 가 현재 설정과 다르면 재해시해서 user 에 반영.
+        반환: (검증 성공 여부, 재해시 여부) — 재해시된 경우 커밋은 호출자가 한다.
+        """
+        if not self.check_password(user.password_hash, password):
+            return False, False
+        if self.needs_rehash(user.password_hash):
+            user.password_hash = self.hash_password(password)
+            self._rehashed += 1
+            return True, True
+        return True, False
+
+    def metric_samples(self):
+        """/metrics 용 누적값 [(이름, 라벨, 값)] — 시간 분포는 _run 에서 히스토그램으로 직접 기록한다"""
+        with self._lock:
+            return [
+                ("password_hash_rejected_total", {}, self._rejected),
+                ("password_rehashed_total", {}, self._rehashed),
+            ]
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+                "ops": {
+                    op: {name: stat.to_dict() for name, stat in stats.items()}
+                    for op, stats in self._stats.items()
+                },
+            }
@@ -0,0 +1,140 @@
+"""
+요청 단위 SQL 쿼리 계측 (N+1 탐지).
+
+SQLAlchemy before/after_cursor_execute 이벤트로 요청마다
+  - 실행한 문장 수와 DB 시간
+  - 같은 모양(shape)의 문장이 몇 번 반복되었는지
+를 모은다. 모양은 바인드 값이 이미 ? 로 빠진 SQL 에서 공백과 IN (?, ?, ...) 길이만 정규화한 것이라,
+to_dict 안에서 행마다 같은 쿼리를 다시 보내는 N+1 패턴이 하나의 모양으로 크게 잡힌다.
+
+- 개발(QUERY_STATS_HEADERS): 응답에 X-DB-Queries / X-DB-Time / Server-Timing 헤더
+- 운영: 문장 수 / DB 시간 / 반복 횟수가 임계값을 넘은 요청만 경고 로그
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def statement_shape(statement):
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("(?...)", shape)
+
+
+class RequestQueryStats:
+    __slots__ = ("started", "count", "db_time", "shapes")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.db_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold):
+        """[(모양, 횟수)] — threshold 번 이상 반복된 문장 (많은 순)"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if has_request_context():
+        stats = g.get("query_stats")
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+
+def current_stats():
+    """현재 요청의 RequestQueryStats (계측 중이 아니면 None)"""
+    return g.get("query_stats") if has_request_context() else None
+
+
+class QueryInspector:
+    def __init__(self, app=None):
+        self.enabled = True
+        self.headers = False
+        self.log_threshold = 30
+        self.repeat_threshold = 5
+        self.slow_ms = 200.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("QUERY_STATS_ENABLED", os.getenv("QUERY_STATS_ENABLED", "1") != "0")
+        app.config.setdefault(
+            "QUERY_STATS_HEADERS",
+            os.getenv("QUERY_STATS_HEADERS", "1" if os.getenv("FLASK_ENV") == "development" else "0") == "1",
+        )
+        # 요청당 문장 수가 이 값을 넘거나, 같은 모양이 QUERY_REPEAT_THRESHOLD 번 이상 반복되거나,
+        # DB 시간이 QUERY_SLOW_MS 를 넘으면 경고 로그
+        app.config.setdefault("QUERY_LOG_THRESHOLD", int(os.getenv("QUERY_LOG_THRESHOLD", 30)))
+        app.config.setdefault("QUERY_REPEAT_THRESHOLD", int(os.getenv("QUERY_REPEAT_THRESHOLD", 5)))
+        app.config.setdefault("QUERY_SLOW_MS", float(os.getenv("QUERY_SLOW_MS", 200)))
+
+        self.enabled = app.config["QUERY_STATS_ENABLED"]
+        self.headers = app.config["QUERY_STATS_HEADERS"] or app.debug
+        self.log_threshold = app.config["QUERY_LOG_THRESHOLD"]
+        self.repeat_threshold = app.config["QUERY_REPEAT_THRESHOLD"]
+        self.slow_ms = app.config["QUERY_SLOW_MS"]
+
+        if not self.enabled:
+            return
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def _start(self):
+        g.query_stats = RequestQueryStats()
+
+    def _finish(self, response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        db_ms = stats.db_time * 1000
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        repeated = stats.repeated(self.repeat_threshold)
+
+        if self.headers:
+            response.headers["X-DB-Queries"] = str(stats.count)
+            response.headers["X-DB-Time"] = f"{db_ms:.1f}"
+            response.headers["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+            )
+            if repeated:
+                response.headers["X-DB-Repeated"] = str(repeated[0][1])
+
+        if stats.count > self.log_threshold or repeated or db_ms > self.slow_ms:
+            logger.warning(
+                "쿼리 과다: %s %s (endpoint=%s) 문장 %d개, DB %.1f ms / 전체 %.1f ms, 반복 %s",
+                request.method,
+                request.path,
+                request.endpoint,
+                stats.count,
+                db_ms,
+                total_ms,
+                [(n, shape[:120]) for shape, n in repeated[:3]],
+            )
+        return response
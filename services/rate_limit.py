@@ -0,0 +1,231 @@
+"""
+토큰 버킷 기반 요청 제한 (로그인 / 아이디 찾기 / 비밀번호 찾기).
+
+IP 와 계정 식별자(이메일, 아이디 등) 각각에 버킷을 두고, 둘 중 하나라도 비어 있으면
+429 와 Retry-After 헤더를 반환한다.
+
+버킷 저장소
+  - sqlite (기본): instance/ratelimit.db 파일을 모든 gunicorn 워커가 함께 사용
+  - memory: 워커 프로세스 메모리 (개발/테스트용)
+
+규칙은 엔드포인트별로 "횟수/초" 형식이며 환경 변수로 바꿀 수 있다.
+  예) RATELIMIT_LOGIN_IP=20/60, RATELIMIT_LOGIN_ACCOUNT=5/60
+"""
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+DEFAULT_RULES = {
+    "login": {"ip": "20/60", "account": "5/60"},
+    "find_id": {"ip": "10/60", "account": "5/300"},
+    "reset_password": {"ip": "5/60", "account": "3/300"},
+}
+
+# 오래 사용되지 않은 버킷 정리 (요청마다 1% 확률로 실행)
+STALE_BUCKET_SECONDS = 24 * 60 * 60
+CLEANUP_PROBABILITY = 0.01
+
+
+def parse_rule(rule):
+    """'10/60' → (capacity=10, refill_per_second=10/60)"""
+    count, seconds = rule.split("/")
+    capacity = float(count)
+    return capacity, capacity / float(seconds)
+
+
+def _refill(tokens, updated_at, now, capacity, rate):
+    if tokens is None:
+        return capacity
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+
+class MemoryBucketStore:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def consume_many(self, buckets, now):
+        """
+        buckets: [(키, capacity, rate)]. 모든 버킷에 토큰이 있을 때만 하나씩 뺀다 (하나라도 비면 아무것도 빼지 않음).
+        반환: (허용 여부, [버킷별 남은 토큰])
+        """
+        with self._lock:
+            levels = [
+                _refill(*self._buckets.get(key, (None, now)), now, capacity, rate)
+                for key, capacity, rate in buckets
+            ]
+            allowed = all(tokens >= 1 for tokens in levels)
+            if allowed:
+                levels = [tokens - 1 for tokens in levels]
+                for (key, _, _), tokens in zip(buckets, levels):
+                    self._buckets[key] = (tokens, now)
+        return allowed, levels
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_buckets_updated_at ON rate_buckets (updated_at)")
+
+    def _connect(self):
+        # 스레드/프로세스(fork)마다 별도 연결 사용
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def consume_many(self, buckets, now):
+        """MemoryBucketStore.consume_many 와 같다. 읽기와 쓰기를 한 트랜잭션(BEGIN IMMEDIATE)에서 한다"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            levels = []
+            for key, capacity, rate in buckets:
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                levels.append(_refill(row[0] if row else None, row[1] if row else now, now, capacity, rate))
+            allowed = all(tokens >= 1 for tokens in levels)
+            if allowed:
+                levels = [tokens - 1 for tokens in levels]
+                conn.executemany(
+                    "INSERT INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    [(key, tokens, now) for (key, _, _), tokens in zip(buckets, levels)],
+                )
+            if random.random() < CLEANUP_PROBABILITY:
+                conn.execute(
+                    "DELETE FROM rate_buckets WHERE updated_at < ?", (now - STALE_BUCKET_SECONDS,)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, levels
+
+    def reset(self):
+        self._connect().execute("DELETE FROM rate_buckets")
+
+
+class RateLimiter:
+    def __init__(self, app=None):
+        self.store = None
+        self.rules = {}
+        self.enabled = True
+        self.proxy_hops = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RATELIMIT_ENABLED", os.getenv("RATELIMIT_ENABLED", "1") != "0")
+        app.config.setdefault("RATELIMIT_STORAGE", os.getenv("RATELIMIT_STORAGE", "sqlite"))
+        app.config.setdefault(
+            "RATELIMIT_DB_PATH",
+            os.getenv("RATELIMIT_DB_PATH", os.path.join(app.instance_path, "ratelimit.db")),
+        )
+        # 앞에 둔 신뢰하는 프록시(로드밸런서) 수 — X-Forwarded-For 의 뒤에서 이 번째 주소를 클라이언트로 본다.
+        # 0(기본)이면 헤더를 무시하고 접속 주소(remote_addr)를 쓴다. 프록시 없이 헤더를 믿으면 위조로 우회된다.
+        app.config.setdefault("RATELIMIT_PROXY_HOPS", int(os.getenv("RATELIMIT_PROXY_HOPS", 0)))
+
+        rules = {}
+        for endpoint, scopes in DEFAULT_RULES.items():
+            rules[endpoint] = {
+                scope: parse_rule(os.getenv(f"RATELIMIT_{endpoint.upper()}_{scope.upper()}", rule))
+                for scope, rule in scopes.items()
+            }
+        # 설정으로 넘긴 규칙 {"login": {"ip": "10/60"}} 은 범위(scope)별로 기본값을 덮어쓴다
+        for endpoint, scopes in app.config.get("RATELIMIT_RULES", {}).items():
+            rules.setdefault(endpoint, {}).update(
+                {scope: parse_rule(rule) if isinstance(rule, str) else tuple(rule) for scope, rule in scopes.items()}
+            )
+        app.config["RATELIMIT_RULES"] = rules
+
+        self.rules = rules
+        self.enabled = app.config["RATELIMIT_ENABLED"]
+        self.proxy_hops = app.config["RATELIMIT_PROXY_HOPS"]
+        if app.config["RATELIMIT_STORAGE"] == "memory":
+            self.store = MemoryBucketStore()
+        else:
+            self.store = SQLiteBucketStore(app.config["RATELIMIT_DB_PATH"])
+
+    def client_ip(self):
+        forwarded = request.headers.get("X-Forwarded-For", "")
+        if forwarded and self.proxy_hops > 0:
+            addresses = [a.strip() for a in forwarded.split(",") if a.strip()]
+            if len(addresses) >= self.proxy_hops:
+                return addresses[-self.proxy_hops]
+        return request.remote_addr or "unknown"
+
+    def hit(self, endpoint, account=None):
+        """IP / 계정 버킷에서 토큰 1개씩 사용. 반환: (허용 여부, Retry-After 초)"""
+        rule = self.rules.get(endpoint)
+        if not self.enabled or not rule:
+            return True, 0
+
+        keys = [("ip", f"{endpoint}:ip:{self.client_ip()}")]
+        if account:
+            keys.append(("account", f"{endpoint}:account:{account.strip().lower()}"))
+
+        buckets = [(key, *rule[scope]) for scope, key in keys if scope in rule]
+        if not buckets:
+            return True, 0
+        # 두 버킷을 함께 확인하고 둘 다 남아 있을 때만 뺀다 — IP 에서 막힌 요청이 계정 버킷을 비우지 않도록
+        allowed, levels = self.store.consume_many(buckets, time.time())
+        if allowed:
+            return True, 0
+        retry_after = max(
+            math.ceil((1 - tokens) / rate) for (_, _, rate), tokens in zip(buckets, levels) if tokens < 1
+        )
+        return False, retry_after
+
+    def limit(self, endpoint, account_field=None):
+        """뷰 데코레이터: account_field 는 JSON 본문에서 계정 식별자로 쓸 필드명"""
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                account = None
+                if account_field:
+                    data = request.get_json(silent=True) or {}
+                    value = data.get(account_field)
+                    account = value if isinstance(value, str) else None
+
+                allowed, retry_after = self.hit(endpoint, account)
+                if not allowed:
+                    current_app.logger.warning(
+                        "rate limited: endpoint=%s ip=%s retry_after=%s",
+                        endpoint, self.client_ip(), retry_after,
+                    )
+                    response = jsonify({
+                        "message": f"요청이 너무 많습니다. {retry_after}초 후 다시 시도해주세요."
+                    })
+                    response.status_code = 429
+                    response.headers["Retry-After"] = str(retry_after)
+                    return response
+                return view(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
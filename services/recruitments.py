@@ -0,0 +1,205 @@
+"""
+팀 모집글 직렬화와 참여 인원 수 관리.
+
+목록 응답은 serialize_recruitments() 로 한 번에 만든다:
+  - 페이지의 모든 참여자와 사용자 정보를 조인 쿼리 한 번으로 읽고
+  - is_joined 는 그 결과에서 현재 사용자가 들어 있는 모집글 id 집합으로 계산한다
+  (작성자는 목록 쿼리에서 joinedload 로 함께 읽어 둔다)
+
+team_recruitments.member_count 는 참여자 수를 컬럼으로 유지한 값이다.
+'빈 자리 있는 모집글만' 필터(member_count < max_members)에 쓰며,
+참여자를 추가/삭제하는 트랜잭션 안에서 sync_member_counts() 로 함께 갱신한다.
+
+참여 / 취소(join_recruitment, leave_recruitment)는 '확인 후 실행' 대신 조건부 UPDATE 한 문장으로
+자리를 잡는다. 정원 검사와 증가가 같은 문장이라 동시에 몰려도 정원을 넘지 않고,
+같은 사용자의 중복 요청은 (recruitment_id, user_id) 유니크 인덱스가 막는다.
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+
+ANONYMOUS_MEMBER = {
+    "user_id": None,
+    "name": "익명",
+    "student_id": None,
+    "is_professor": False,
+    "profile_image": None,
+}
+
+
+def sync_member_counts(*recruitment_ids):
+    """참여자 테이블 기준으로 member_count 재계산 (커밋은 호출한 쪽에서)"""
+    from models import TeamRecruitment, TeamRecruitmentMember
+
+    ids = {int(rid) for rid in recruitment_ids if rid is not None}
+    if not ids:
+        return
+    counted = (
+        select(func.count(TeamRecruitmentMember.id))
+        .where(TeamRecruitmentMember.recruitment_id == TeamRecruitment.id)
+        .scalar_subquery()
+    )
+    TeamRecruitment.query.filter(TeamRecruitment.id.in_(ids)).update(
+        {TeamRecruitment.member_count: counted}, synchronize_session=False
+    )
+    # 같은 세션에 올라와 있는 객체는 다음 접근 때 새 값을 읽도록 만료
+    for obj in db.session.identity_map.values():
+        if isinstance(obj, TeamRecruitment) and obj.id in ids:
+            db.session.expire(obj, ["member_count"])
+
+
+def _member_entry(user):
+    if user is None:
+        return dict(ANONYMOUS_MEMBER)
+    return {
+        "user_id": user.id,
+        "name": user.name,
+        # 교수인 경우에는 학번(student_id) 숨기기
+        "student_id": user.student_id if user.user_type == "student" else None,
+        "is_professor": user.user_type == "professor",
+        "profile_image": user.profile_image,
+    }
+
+
+def load_members(recruitment_ids):
+    """{모집글 id: [(user_id, User 또는 None)]} — 참여 순서대로, 쿼리 한 번"""
+    from models import TeamRecruitmentMember, User
+
+    members = {rid: [] for rid in recruitment_ids}
+    if not members:
+        return members
+    rows = (
+        db.session.query(TeamRecruitmentMember.recruitment_id, TeamRecruitmentMember.user_id, User)
+        .outerjoin(User, User.id == TeamRecruitmentMember.user_id)
+        .filter(TeamRecruitmentMember.recruitment_id.in_(list(members)))
+        .order_by(TeamRecruitmentMember.recruitment_id, TeamRecruitmentMember.id)
+    )
+    for recruitment_id, user_id, user in rows:
+        members[recruitment_id].append((user_id, user))
+    return members
+
+
+def serialize_recruitments(recruitments, user_id=None):
+    """모집글 목록을 응답 dict 로 (TeamRecruitment.to_dict 와 같은 형식)"""
+    members_by_id = load_members([r.id for r in recruitments])
+    user_id = int(user_id) if user_id is not None else None
+
+    result = []
+    for r in recruitments:
+        members = members_by_id[r.id]
+        author = r.author
+        author_type = author.user_type if author else None
+        result.append(
+            {
+                "id": r.id,
+                "course_id": r.course_id,
+                "author_id": r.author_id,
+                "author": author.name if author else "익명",
+                # 교수/봇 아이디(학번)는 숨기고, 학생인 경우에만 student_id 노출
+                "author_student_id": author.student_id if author_type == "student" else None,
+                "is_professor": author_type == "professor",
+                "author_profile_image": author.profile_image if author else None,
+                "title": r.title,
+                "description": r.description,
+                "team_board_name": r.team_board_name,
+                "max_members": r.max_members,
+                "current_members": sum(1 for _, user in members if user is not None),
+                "members_list": [user.name for _, user in members if user is not None],
+                "members": [_member_entry(user) for _, user in members],
+                "is_joined": user_id is not None and any(uid == user_id for uid, _ in members),
+                "is_board_activated": r.is_board_activated,
+                "created_at": r.created_at.strftime("%Y-%m-%d %H:%M"),
+            }
+        )
+    return result
+
+
+# =====================================================
+# 원자적 참여 / 취소 (커밋은 호출한 쪽에서, 실패하면 여기서 롤백)
+# =====================================================
+JOINED = "joined"
+ALREADY_JOINED = "already_joined"
+FULL = "full"
+LEFT = "left"
+NOT_MEMBER = "not_member"
+BOARD_ACTIVATED = "board_activated"
+
+
+def join_recruitment(recruitment_id, user_id):
+    """
+    빈 자리가 있으면 member_count 를 올리고 참여자를 추가한다.
+    반환: JOINED / FULL(정원 초과·없는 모집글) / ALREADY_JOINED(동시 중복 요청)
+    """
+    from models import TeamRecruitment, TeamRecruitmentMember
+
+    reserved = db.session.execute(
+        update(TeamRecruitment)
+        .where(TeamRecruitment.id == recruitment_id, TeamRecruitment.member_count < TeamRecruitment.max_members)
+        .values(member_count=TeamRecruitment.member_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if reserved.rowcount != 1:
+        db.session.rollback()
+        return FULL
+
+    db.session.add(TeamRecruitmentMember(recruitment_id=recruitment_id, user_id=user_id))
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # 유니크 인덱스 — 같은 사용자의 다른 요청이 먼저 참여했다 (올린 자리도 함께 롤백)
+        db.session.rollback()
+        return ALREADY_JOINED
+    return JOINED
+
+
+def leave_recruitment(recruitment_id, user_id):
+    """
+    팀 게시판이 활성화되지 않았으면 참여자를 빼고 member_count 를 내린다.
+    반환: LEFT / BOARD_ACTIVATED(그 사이 활성화됨) / NOT_MEMBER(참여 중이 아님·동시 취소 요청) — 실패하면 롤백
+    """
+    from models import TeamRecruitment, TeamRecruitmentMember
+
+    # 참여와 같은 순서(모집글 → 참여자)로 잠근다
+    is_member = (
+        select(TeamRecruitmentMember.id)
+        .where(TeamRecruitmentMember.recruitment_id == recruitment_id, TeamRecruitmentMember.user_id == user_id)
+        .exists()
+    )
+    released = db.session.execute(
+        update(TeamRecruitment)
+        .where(TeamRecruitment.id == recruitment_id, TeamRecruitment.is_board_activated.is_not(True), is_member)
+        .values(member_count=TeamRecruitment.member_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+    if released.rowcount != 1:
+        db.session.rollback()
+        activated = (
+            db.session.query(TeamRecruitment.is_board_activated).filter(TeamRecruitment.id == recruitment_id).scalar()
+        )
+        return BOARD_ACTIVATED if activated else NOT_MEMBER
+
+    removed = TeamRecruitmentMember.query.filter_by(recruitment_id=recruitment_id, user_id=user_id).delete(
+        synchronize_session=False
+    )
+    if removed != 1:
+        db.session.rollback()
+        return NOT_MEMBER
+    return LEFT
+
+
+def activate_if_full(recruitment_id):
+    """정원이 찼고 아직 비활성이면 활성화. 이 호출이 활성화했으면 True (알림은 한 번만 보내도록)"""
+    from models import TeamRecruitment
+
+    activated = db.session.execute(
+        update(TeamRecruitment)
+        .where(
+            TeamRecruitment.id == recruitment_id,
+            TeamRecruitment.member_count >= TeamRecruitment.max_members,
+            TeamRecruitment.is_board_activated.is_not(True),
+        )
+        .values(is_board_activated=True)
+        .execution_options(synchronize_session=False)
+    )
+    return activated.rowcount == 1
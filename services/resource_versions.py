@@ -0,0 +1,170 @@
+"""
+리소스 버전 카운터와 조건부 GET (ETag / 304).
+
+resource_versions 테이블에 리소스 이름별 정수 버전을 두고, 쓰기 경로에서 커밋 전에 bump_versions 로 올린다
+(같은 트랜잭션이라 데이터와 버전이 함께 반영되고, 모든 워커가 같은 값을 본다).
+조회 엔드포인트는 @conditional_get 으로 감싸면 버전들로 ETag 를 만들고,
+If-None-Match 가 일치하면 목록 쿼리를 실행하지 않고 304 를 돌려준다.
+
+같은 이름을 공유 캐시(services.cache) 태그로도 쓴다. 커밋이 끝나면 올린 버전 이름의 태그를 무효화하고,
+캐시 키에는 versioned_key() 로 버전을 넣어서 무효화 전후의 경합에도 옛 값을 돌려주지 않는다
+(사용자 id 는 넣지 않으므로 per_user 응답도 공통 부분은 사용자끼리 공유할 수 있다).
+
+리소스 이름
+  board:<강의 코드>     게시판 목록 (글 / 댓글 수 / 좋아요 / 투표 / 고정)
+  recruit:<강의 코드>   모집글 목록 (모집글 / 참여자)
+  courses               전체 강의 목록
+  team:<팀 id>          팀 공통 시간 (팀원 구성 / 팀원의 가능한 시간 / 개인 일정)
+  schedules:<사용자 id> 사용자의 개인 일정 — 워커별 일정 마스크 캐시 키에 들어간다
+  users                 이름·프로필 이미지 등 사용자 정보 — 모든 ETag 에 포함된다
+  revoked_tokens        폐기 토큰 정리(purge) 세대 — 워커가 블룸 필터를 다시 채울 때를 알려준다
+"""
+import hashlib
+import os
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+from flask_jwt_extended import current_user
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from extensions import db
+
+USERS_KEY = "users"
+COURSES_KEY = "courses"
+REVOKED_TOKENS_KEY = "revoked_tokens"
+
+# 응답 형식이 바뀌는 배포에서 이전 ETag 를 무효화하려면 값을 바꾼다
+ETAG_SALT = os.getenv("ETAG_SALT", "")
+
+_BUMP_SQL = text(
+    "INSERT INTO resource_versions (name, version) VALUES (:name, 1) "
+    "ON CONFLICT (name) DO UPDATE SET version = resource_versions.version + 1"
+)
+
+
+def board_key(course_code):
+    return f"board:{course_code}"
+
+
+def recruit_key(course_code):
+    return f"recruit:{course_code}"
+
+
+def team_key(team_id):
+    return f"team:{int(team_id)}"
+
+
+def schedule_key(user_id):
+    return f"schedules:{int(user_id)}"
+
+
+def bump_versions(*keys):
+    """현재 세션 트랜잭션에서 버전 증가 (커밋은 호출한 쪽에서)"""
+    for key in sorted(set(keys)):
+        db.session.execute(_BUMP_SQL, {"name": key})
+    db.session.info.setdefault("bumped_versions", set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cache_tags(session):
+    bumped = session.info.pop("bumped_versions", None)
+    if bumped:
+        from services.cache import shared_cache
+
+        shared_cache.invalidate_tags(*bumped)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_bumped_versions(session):
+    session.info.pop("bumped_versions", None)
+
+
+def bump_user_teams(user_id):
+    """사용자의 가능한 시간 / 일정이 바뀌었을 때 그 사용자가 속한 모든 팀의 버전 증가"""
+    from models import TeamRecruitmentMember
+
+    team_ids = [
+        team_id
+        for (team_id,) in TeamRecruitmentMember.query.filter_by(user_id=user_id).with_entities(
+            TeamRecruitmentMember.recruitment_id
+        )
+    ]
+    bump_versions(*(team_key(team_id) for team_id in team_ids))
+
+
+def get_versions(keys):
+    """{이름: 버전} — 한 번도 올리지 않은 리소스는 0"""
+    from models import ResourceVersion
+
+    keys = list(keys)
+    rows = ResourceVersion.query.filter(ResourceVersion.name.in_(keys)).with_entities(
+        ResourceVersion.name, ResourceVersion.version
+    )
+    versions = dict.fromkeys(keys, 0)
+    versions.update(dict(rows))
+    return versions
+
+
+def _digest(basis):
+    return hashlib.blake2b(basis.encode(), digest_size=12).hexdigest()
+
+
+def current_versions(keys):
+    """이 요청에서 @conditional_get 이 이미 읽은 버전이 있으면 재사용, 없으면 조회"""
+    known = g.get("resource_versions") or {}
+    if all(key in known for key in keys):
+        return {key: known[key] for key in keys}
+    return get_versions(keys)
+
+
+def compute_version_tag(keys, vary=None):
+    """경로와 리소스 버전(과 vary 값)만으로 만든 태그 — 사용자와 무관한 캐시 키에 쓴다"""
+    versions = get_versions(keys)
+    g.resource_versions = versions
+    basis = "|".join(
+        [ETAG_SALT, request.full_path, vary or ""] + [f"{k}={versions[k]}" for k in sorted(versions)]
+    )
+    return _digest(basis)
+
+
+def compute_etag(version_tag, user_id=None):
+    return _digest(f"{version_tag}|{user_id or ''}")
+
+
+def versioned_key(prefix):
+    """@conditional_get 안에서 현재 경로·리소스 버전을 붙인 캐시 키 (사용자 무관)"""
+    return f"{prefix}:{g.resource_version_tag}"
+
+
+def conditional_get(*key_funcs, per_user=False, vary=None):
+    """
+    뷰 인자로 리소스 이름을 만드는 함수(또는 고정 이름)들을 받아 ETag 를 붙이는 데코레이터.
+    per_user=True 이면 사용자별 필드(좋아요 여부 등)가 있는 응답이라 사용자 id 도 ETag 에 넣는다.
+    vary 는 경로·버전 말고도 응답을 바꾸는 값(예: 오늘 날짜로 정해지는 이번 주)을 문자열로 돌려주는 함수.
+    @jwt_required() 아래에 둔다.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            keys = [func(**kwargs) if callable(func) else func for func in key_funcs]
+            keys.append(USERS_KEY)
+            # 버전을 먼저 읽는다: 그 사이 쓰기가 끼어들면 응답이 ETag 보다 새로울 뿐이라 안전하다
+            g.resource_version_tag = compute_version_tag(keys, vary() if vary else None)
+            etag = compute_etag(g.resource_version_tag, current_user.id if per_user else None)
+            g.resource_etag = etag
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,65 @@
+"""
+기존 데이터베이스에 인덱스 추가.
+
+db.create_all() 은 이미 있는 테이블에는 새 인덱스를 만들지 않으므로, 마이그레이션이 넘겨준
+인덱스 목록 중 빠진 것을 여기서 만든다. 목록은 각 마이그레이션에 그 시점 기준으로 고정해 두고,
+현재 모델(db.metadata)은 읽지 않는다 — 나중에 모델에 인덱스나 컬럼이 추가돼도 예전 마이그레이션이 하는 일은 바뀌지 않는다.
+유니크 인덱스는 만들기 전에 중복 행(같은 키에서 id 가 가장 작은 행만 남김)을 정리하고,
+지운 행은 하나씩 경고 로그로 남긴다. 중복 행을 세는 비정규화 컬럼(예: member_count)은
+호출한 마이그레이션이 다시 계산해야 한다.
+"""
+import logging
+from collections import namedtuple
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+IndexSpec = namedtuple("IndexSpec", ["name", "table", "columns", "unique"])
+
+
+def index(name, table, *columns, unique=False):
+    return IndexSpec(name, table, tuple(columns), unique)
+
+
+def _deduplicate(connection, spec):
+    columns = ", ".join(spec.columns)
+    rows = connection.execute(
+        text(
+            f"SELECT id, {columns} FROM {spec.table} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {spec.table} GROUP BY {columns}) ORDER BY id"
+        )
+    ).all()
+    for row in rows:
+        key = ", ".join(f"{name}={value!r}" for name, value in zip(spec.columns, row[1:]))
+        logger.warning("%s 중복 행 삭제 (%s): id=%s, %s", spec.table, spec.name, row[0], key)
+    ids = [row[0] for row in rows]
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        connection.execute(
+            text(f"DELETE FROM {spec.table} WHERE id IN ({', '.join(str(int(i)) for i in chunk)})")
+        )
+    return len(ids)
+
+
+def ensure_indexes(connection, specs):
+    """specs 중 빠진 인덱스를 만들고 [(인덱스 이름, 정리한 중복 행 수)] 반환 (없는 테이블은 건너뜀)"""
+    created = []
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    existing = {}
+    for spec in specs:
+        if spec.table not in existing_tables:
+            continue
+        if spec.table not in existing:
+            existing[spec.table] = {ix["name"] for ix in inspector.get_indexes(spec.table)}
+        if spec.name in existing[spec.table]:
+            continue
+        removed = _deduplicate(connection, spec) if spec.unique else 0
+        unique = "UNIQUE " if spec.unique else ""
+        connection.execute(
+            text(f"CREATE {unique}INDEX {spec.name} ON {spec.table} ({', '.join(spec.columns)})")
+        )
+        existing[spec.table].add(spec.name)
+        created.append((spec.name, removed))
+    return created
@@ -0,0 +1,296 @@
+"""
+벤치마크 / 부하 테스트용 합성 데이터 생성.
+
+같은 seed 와 규모(SeedConfig)로 실행하면 항상 같은 데이터가 만들어진다.
+모델을 통해 직접 넣으므로 API 를 거치지 않고, 비밀번호 해시도 한 번만 계산해서 모든 계정이 공유한다.
+생성되는 계정은 username 이 'seed_' 로 시작하고 비밀번호는 SEED_PASSWORD 이다.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from extensions import db, password_hasher
+from services.availability import DAY_ORDER
+
+SEED_PREFIX = "seed_"
+SEED_PASSWORD = "seed-password"
+
+CATEGORIES = ["free", "question", "notice", "team"]
+NOTIFICATION_TYPES = ["comment", "reply", "like", "notice", "team_post"]
+
+
+@dataclass
+class SeedConfig:
+    students: int = 300
+    professors: int = 10
+    courses: int = 20
+    courses_per_student: int = 4
+    posts_per_course: int = 40
+    poll_ratio: float = 0.2
+    comments_per_post: int = 5
+    likes_per_post: int = 8
+    teams_per_course: int = 6
+    team_size: int = 4
+    intervals_per_user: int = 5
+    notifications_per_user: int = 20
+    seed: int = 42
+
+
+class SeedError(Exception):
+    pass
+
+
+def seed_database(config=None):
+    """합성 데이터 생성. 테이블별 생성 행 수 반환 (커밋까지 수행)"""
+    from models import (
+        AvailableTime,
+        Course,
+        CourseBoardComment,
+        CourseBoardLike,
+        CourseBoardPost,
+        Enrollment,
+        Notification,
+        Poll,
+        PollOption,
+        PollVote,
+        TeamRecruitment,
+        TeamRecruitmentMember,
+        User,
+    )
+
+    config = config or SeedConfig()
+    if User.query.filter(User.username.like(f"{SEED_PREFIX}%")).first():
+        raise SeedError("이미 seed 데이터가 있습니다. 새 데이터베이스에서 실행하세요.")
+
+    rng = random.Random(config.seed)
+    now = datetime.now().replace(microsecond=0)
+    counts = {}
+
+    def some_time_ago(days=60):
+        return now - timedelta(minutes=rng.randrange(days * 24 * 60))
+
+    # -------------------------------
+    # 사용자
+    # -------------------------------
+    password_hash = password_hasher.hash_password(SEED_PASSWORD)
+    professors = [
+        User(
+            student_id=f"P{i:05d}",
+            name=f"교수{i}",
+            email=f"{SEED_PREFIX}prof{i}@example.com",
+            username=f"{SEED_PREFIX}prof{i}",
+            password_hash=password_hash,
+            user_type="professor",
+        )
+        for i in range(config.professors)
+    ]
+    students = [
+        User(
+            student_id=f"2024{i:05d}",
+            name=f"학생{i}",
+            email=f"{SEED_PREFIX}student{i}@example.com",
+            username=f"{SEED_PREFIX}student{i}",
+            password_hash=password_hash,
+            user_type="student",
+        )
+        for i in range(config.students)
+    ]
+    db.session.add_all(professors + students)
+    db.session.flush()
+    counts["user"] = len(professors) + len(students)
+
+    # -------------------------------
+    # 강의 / 수강
+    # -------------------------------
+    courses = [
+        Course(
+            title=f"합성 강의 {i}",
+            code=f"SEED{i:04d}",
+            professor_id=professors[i % len(professors)].id,
+            created_at=some_time_ago(),
+        )
+        for i in range(config.courses)
+    ]
+    db.session.add_all(courses)
+    db.session.flush()
+    counts["courses"] = len(courses)
+
+    course_students = {course.id: [] for course in courses}
+    enrollments = []
+    for student in students:
+        for course in rng.sample(courses, min(config.courses_per_student, len(courses))):
+            course_students[course.id].append(student)
+            enrollments.append(Enrollment(student_id=student.id, course_id=course.id))
+    db.session.add_all(enrollments)
+    counts["enrollments"] = len(enrollments)
+
+    # -------------------------------
+    # 팀 모집 / 팀원
+    # -------------------------------
+    teams = []
+    members = []
+    for course in courses:
+        pool = list(course_students[course.id])
+        rng.shuffle(pool)
+        for t in range(config.teams_per_course):
+            team_members = pool[t * config.team_size:(t + 1) * config.team_size]
+            if not team_members:
+                break
+            team = TeamRecruitment(
+                course_id=course.code,
+                author_id=team_members[0].id,
+                title=f"{course.title} {t + 1}팀 모집",
+                description="합성 데이터",
+                team_board_name=f"{t + 1}팀",
+                max_members=config.team_size,
+                member_count=len(team_members),
+                is_board_activated=len(team_members) >= config.team_size,
+                created_at=some_time_ago(),
+            )
+            teams.append((team, team_members))
+    db.session.add_all([team for team, _ in teams])
+    db.session.flush()
+    for team, team_members in teams:
+        members.extend(TeamRecruitmentMember(recruitment_id=team.id, user_id=u.id) for u in team_members)
+    db.session.add_all(members)
+    counts["team_recruitments"] = len(teams)
+    counts["team_recruitment_members"] = len(members)
+
+    # -------------------------------
+    # 게시글 / 투표 / 댓글 / 좋아요
+    # -------------------------------
+    posts = []
+    for course in courses:
+        writers = course_students[course.id] or students
+        course_teams = [team for team, _ in teams if team.course_id == course.code]
+        for p in range(config.posts_per_course):
+            category = rng.choice(CATEGORIES)
+            team_board_name = None
+            if category == "team":
+                if not course_teams:
+                    category = "free"
+                else:
+                    team_board_name = rng.choice(course_teams).team_board_name
+            posts.append(
+                CourseBoardPost(
+                    course_id=course.code,
+                    author_id=rng.choice(writers).id,
+                    title=f"{course.title} 게시글 {p}",
+                    content="합성 데이터 본문 " * rng.randint(1, 20),
+                    category=category,
+                    team_board_name=team_board_name,
+                    is_pinned=p == 0,
+                    created_at=some_time_ago(),
+                )
+            )
+    db.session.add_all(posts)
+    db.session.flush()
+    counts["course_board_posts"] = len(posts)
+
+    course_by_code = {course.code: course for course in courses}
+    polls = []
+    for post in posts:
+        if rng.random() < config.poll_ratio:
+            polls.append(Poll(post_id=post.id, question=f"{post.title} 투표", created_at=post.created_at))
+    db.session.add_all(polls)
+    db.session.flush()
+
+    options = []
+    for poll in polls:
+        options.extend(PollOption(poll_id=poll.id, text=f"선택지 {o + 1}") for o in range(rng.randint(2, 5)))
+    db.session.add_all(options)
+    db.session.flush()
+
+    options_by_poll = {}
+    for option in options:
+        options_by_poll.setdefault(option.poll_id, []).append(option)
+    post_by_id = {post.id: post for post in posts}
+    votes = []
+    for poll in polls:
+        voters = course_students[course_by_code[post_by_id[poll.post_id].course_id].id]
+        for voter in rng.sample(voters, rng.randint(0, len(voters) // 2) if voters else 0):
+            votes.append(PollVote(poll_id=poll.id, option_id=rng.choice(options_by_poll[poll.id]).id, user_id=voter.id))
+    db.session.add_all(votes)
+    counts["polls"] = len(polls)
+    counts["poll_options"] = len(options)
+    counts["poll_votes"] = len(votes)
+
+    comments = []
+    likes = []
+    for post in posts:
+        readers = course_students[course_by_code[post.course_id].id] or students
+        for _ in range(rng.randint(0, config.comments_per_post * 2)):
+            comments.append(
+                CourseBoardComment(
+                    post_id=post.id,
+                    author_id=rng.choice(readers).id,
+                    content="합성 댓글",
+                    created_at=post.created_at + timedelta(minutes=rng.randrange(600)),
+                )
+            )
+        for liker in rng.sample(readers, min(len(readers), rng.randint(0, config.likes_per_post * 2))):
+            likes.append(CourseBoardLike(post_id=post.id, user_id=liker.id))
+    db.session.add_all(comments)
+    db.session.add_all(likes)
+    db.session.flush()
+
+    # 답글: 댓글의 약 1/4 에 답글 하나
+    replies = [
+        CourseBoardComment(
+            post_id=comment.post_id,
+            author_id=rng.choice(students).id,
+            parent_comment_id=comment.id,
+            content="합성 답글",
+            created_at=comment.created_at + timedelta(minutes=5),
+        )
+        for comment in comments
+        if rng.random() < 0.25
+    ]
+    db.session.add_all(replies)
+    counts["course_board_comments"] = len(comments) + len(replies)
+    counts["course_board_likes"] = len(likes)
+
+    # -------------------------------
+    # 가능한 시간 (대시보드용, 요일마다 구간 최대 1개)
+    # -------------------------------
+    times = []
+    for user in students:
+        for day in rng.sample(DAY_ORDER, min(config.intervals_per_user, len(DAY_ORDER))):
+            start_slot = rng.randrange(16, 40)  # 08:00 ~ 19:30 시작
+            length = rng.randint(2, 8)  # 1 ~ 4시간
+            end_slot = min(start_slot + length, 47)
+            times.append(
+                AvailableTime(
+                    user_id=user.id,
+                    day_of_week=day,
+                    start_time=time(start_slot // 2, (start_slot % 2) * 30),
+                    end_time=time(end_slot // 2, (end_slot % 2) * 30),
+                )
+            )
+    db.session.add_all(times)
+    counts["available_times"] = len(times)
+
+    # -------------------------------
+    # 알림
+    # -------------------------------
+    notifications = []
+    for user in students:
+        for _ in range(config.notifications_per_user):
+            post = rng.choice(posts)
+            notifications.append(
+                Notification(
+                    user_id=user.id,
+                    type=rng.choice(NOTIFICATION_TYPES),
+                    content=f"{post.title} 관련 알림",
+                    related_id=post.id,
+                    course_id=post.course_id,
+                    is_read=rng.random() < 0.6,
+                    created_at=some_time_ago(),
+                )
+            )
+    db.session.add_all(notifications)
+    counts["notifications"] = len(notifications)
+
+    db.session.commit()
+    return counts
+
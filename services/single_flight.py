@@ -0,0 +1,84 @@
+"""
+동일 요청 병합 (single-flight).
+
+팀 게시판을 열면 팀원 모두의 클라이언트가 같은 순간에 같은 팀 공통 시간 / 게시판 목록을 요청한다.
+같은 키로 동시에 들어온 계산은 하나만 실행하고 나머지는 그 결과를 받아 간다.
+
+  - 워커 내부: 먼저 온 스레드가 계산하고, 뒤에 온 스레드는 완료 이벤트를 기다렸다가 같은 객체를 받는다
+  - 워커 간  : coalesce() 는 계산을 공유 캐시 get_or_set 으로 감싸므로,
+              다른 워커는 저장소의 재계산 잠금('lock:<키>')을 보고 기다렸다가 저장된 결과를 읽는다
+
+키에는 엔드포인트, 파라미터, 리소스 버전(resource_versions.versioned_key)을 넣는다.
+"""
+import logging
+import threading
+
+from services.cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, wait_timeout=30.0):
+        self.wait_timeout = wait_timeout
+        self.leaders = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """key 로 진행 중인 계산이 있으면 그 결과를, 없으면 fn() 을 실행한 결과를 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            if not call.event.wait(self.wait_timeout):
+                logger.warning("single-flight 대기 시간 초과, 직접 계산: %s", key)
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result
+
+    def metric_samples(self):
+        """/metrics 용 누적값 [(이름, 라벨, 값)]"""
+        return [
+            ("single_flight_calls_total", {"role": "leader"}, self.leaders),
+            ("single_flight_calls_total", {"role": "shared"}, self.shared),
+        ]
+
+
+single_flight = SingleFlight()
+
+
+def coalesce(key, producer, ttl=None, tags=()):
+    """워커 내부 single-flight + 워커 간 공유 캐시(재계산 잠금 포함)로 producer 결과를 공유"""
+    return single_flight.do(key, lambda: shared_cache.get_or_set(key, producer, ttl=ttl, tags=tags))
@@ -0,0 +1,187 @@
+"""
+가능한 시간 기반 자동 팀 편성 엔진.
+
+강의 수강생들의 AvailableTime 을 주간 비트셋으로 바꾼 뒤,
+  1) 탐욕(greedy) 배치: 가장 시간이 부족한 학생부터 팀의 씨앗으로 삼고,
+     팀 공통 시간을 가장 많이 남기는 학생을 차례로 추가
+  2) 지역 탐색(local search): 서로 다른 팀의 두 학생을 맞바꿔서
+     전체 점수가 오르면 교환, 더 이상 개선이 없거나 시간 예산을 넘으면 종료
+하는 방식으로 팀 구성을 제안한다.
+
+수백 명 규모에서도 비트 AND / bit_count 연산만 사용하므로 수 초 안에 끝난다.
+"""
+import math
+import time
+from collections import defaultdict
+
+from models import AvailableTime, Enrollment, TeamRecruitment, TeamRecruitmentMember, User
+from services.availability import build_slot_mask
+
+# 팀 점수 상한 (슬롯 수). 주 4시간 이상의 공통 시간은 더 늘어나도 가치가 크지 않으므로,
+# 이미 충분한 팀의 점수를 더 올리기보다 공통 시간이 부족한 팀을 끌어올리도록 만든다.
+SATURATION_SLOTS = 8
+
+DEFAULT_TIME_BUDGET = 2.0
+
+
+def team_common_mask(masks):
+    if not masks:
+        return 0
+    common = masks[0]
+    for mask in masks[1:]:
+        common &= mask
+    return common
+
+
+def _team_value(common_mask):
+    return min(common_mask.bit_count(), SATURATION_SLOTS)
+
+
+def _team_sizes(student_count, team_size):
+    """
+    학생 수를 팀 크기에 맞게 분배.
+    ceil(n / team_size) 팀으로 고르게 나눠서 어느 팀도 team_size 를 넘지 않게 한다 (팀 크기 차이는 최대 1).
+    그렇게 나누면 혼자인 팀이 생기는 경우(team_size=2, 홀수 명)만 팀을 하나 줄여 한 팀을 team_size + 1 명으로 한다.
+    """
+    if student_count <= 0:
+        return []
+    team_count = math.ceil(student_count / team_size)
+    if team_count > 1 and student_count // team_count < 2:
+        team_count -= 1
+    base, extra = divmod(student_count, team_count)
+    return [base + 1 if i < extra else base for i in range(team_count)]
+
+
+def _greedy_partition(masks, team_size):
+    remaining = sorted(masks.keys(), key=lambda uid: (masks[uid].bit_count(), uid))
+    teams = []
+
+    for size in _team_sizes(len(remaining), team_size):
+        seed = remaining.pop(0)
+        team = [seed]
+        common = masks[seed]
+
+        while len(team) < size and remaining:
+            best_index = 0
+            best_key = None
+            for index, uid in enumerate(remaining):
+                # 공통 시간을 가장 많이 남기는 학생 우선, 같으면 시간이 적은(배치가 어려운) 학생 우선
+                key = ((common & masks[uid]).bit_count(), -masks[uid].bit_count())
+                if best_key is None or key > best_key:
+                    best_key = key
+                    best_index = index
+            uid = remaining.pop(best_index)
+            team.append(uid)
+            common &= masks[uid]
+
+        teams.append(team)
+
+    return teams
+
+
+def _without_each(team, masks):
+    """팀에서 멤버 한 명씩을 뺐을 때의 공통 마스크 목록 (prefix/suffix AND)"""
+    size = len(team)
+    prefix = [-1] * (size + 1)
+    suffix = [-1] * (size + 1)
+    for i in range(size):
+        prefix[i + 1] = prefix[i] & masks[team[i]]
+    for i in range(size - 1, -1, -1):
+        suffix[i] = suffix[i + 1] & masks[team[i]]
+    return [prefix[i] & suffix[i + 1] for i in range(size)]
+
+
+def _local_search(teams, masks, deadline):
+    values = [_team_value(team_common_mask([masks[uid] for uid in team])) for team in teams]
+    improved = True
+
+    while improved and time.monotonic() < deadline:
+        improved = False
+        for a in range(len(teams)):
+            without_a = _without_each(teams[a], masks)
+            for b in range(a + 1, len(teams)):
+                if time.monotonic() >= deadline:
+                    return teams
+                without_b = _without_each(teams[b], masks)
+                current = values[a] + values[b]
+
+                best = None
+                for i, uid_a in enumerate(teams[a]):
+                    for j, uid_b in enumerate(teams[b]):
+                        new_a = _team_value(without_a[i] & masks[uid_b])
+                        new_b = _team_value(without_b[j] & masks[uid_a])
+                        gain = new_a + new_b - current
+                        if gain > 0 and (best is None or gain > best[0]):
+                            best = (gain, i, j, new_a, new_b)
+
+                if best:
+                    _, i, j, new_a, new_b = best
+                    teams[a][i], teams[b][j] = teams[b][j], teams[a][i]
+                    values[a], values[b] = new_a, new_b
+                    without_a = _without_each(teams[a], masks)
+                    improved = True
+
+    return teams
+
+
+def propose_teams(masks, team_size, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    masks: {user_id: 주간 비트 마스크}
+    반환: [[user_id, ...], ...] 팀 목록 (공통 시간이 많은 팀부터)
+    """
+    if not masks:
+        return []
+
+    deadline = time.monotonic() + time_budget
+    teams = _greedy_partition(masks, team_size)
+    teams = _local_search(teams, masks, deadline)
+
+    teams.sort(
+        key=lambda team: team_common_mask([masks[uid] for uid in team]).bit_count(),
+        reverse=True,
+    )
+    return teams
+
+
+def load_course_masks(course, exclude_joined=True):
+    """
+    강의 수강생들의 대시보드 가능한 시간을 비트 마스크로 로드.
+    exclude_joined=True 이면 이미 이 강의의 모집글에 참여 중인 학생은 제외한다.
+    """
+    student_ids = [
+        row.student_id
+        for row in Enrollment.query.filter_by(course_id=course.id)
+        .with_entities(Enrollment.student_id)
+        .all()
+    ]
+    if not student_ids:
+        return {}, {}
+
+    if exclude_joined:
+        joined = {
+            row.user_id
+            for row in TeamRecruitmentMember.query.join(
+                TeamRecruitment,
+                TeamRecruitment.id == TeamRecruitmentMember.recruitment_id,
+            )
+            .filter(TeamRecruitment.course_id == course.code)
+            .with_entities(TeamRecruitmentMember.user_id)
+            .all()
+        }
+        student_ids = [sid for sid in student_ids if sid not in joined]
+
+    users = {
+        u.id: u
+        for u in User.query.filter(User.id.in_(student_ids), User.user_type == "student").all()
+    }
+
+    times_by_user = defaultdict(list)
+    dashboard_times = AvailableTime.query.filter(
+        AvailableTime.user_id.in_(list(users.keys())),
+        AvailableTime.team_id.is_(None),  # 팀 편성에는 대시보드용 시간만 사용
+    ).all()
+    for t in dashboard_times:
+        times_by_user[t.user_id].append(t)
+
+    masks = {uid: build_slot_mask(times_by_user.get(uid, [])) for uid in users}
+    return masks, users
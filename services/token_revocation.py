@@ -0,0 +1,163 @@
+"""
+JWT 폐기 목록 (refresh token 회전 / 로그아웃).
+
+폐기된 jti 는 revoked_tokens 테이블(jti 인덱스)에 저장하고,
+각 워커는 그 앞에 메모리 블룸 필터를 둔다.
+  - access token: 블룸 필터에 없으면 바로 통과 (대부분의 요청은 DB 조회 없음),
+    있으면(오탐 가능) DB 로 확인
+  - refresh token: 회전에 쓰이므로 항상 DB 로 확인
+다른 워커에서 폐기된 토큰은 REVOCATION_SYNC_INTERVAL 초마다 id 증분으로 가져와 필터에 반영한다.
+id 는 재사용되지 않는다(AUTOINCREMENT). 만료 기록 정리(purge_expired)는 resource_versions 의
+revoked_tokens 세대를 올리고, 세대가 바뀐 것을 본 워커는 필터를 처음부터 다시 채운다.
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+from extensions import db
+from services.resource_versions import REVOKED_TOKENS_KEY, bump_versions, get_versions
+
+BLOOM_CAPACITY = 100_000
+BLOOM_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class TokenRevocationStore:
+    def __init__(self):
+        self.sync_interval = 5.0
+        self._bloom = BloomFilter()
+        self._last_id = 0
+        self._last_sync = 0.0
+        self._generation = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app, jwt_manager):
+        app.config.setdefault(
+            "REVOCATION_SYNC_INTERVAL", float(os.getenv("REVOCATION_SYNC_INTERVAL", 5))
+        )
+        self.sync_interval = app.config["REVOCATION_SYNC_INTERVAL"]
+
+        @jwt_manager.token_in_blocklist_loader
+        def check_if_token_revoked(_jwt_header, jwt_payload):
+            return self.is_revoked(jwt_payload)
+
+    def reset(self):
+        """필터를 처음부터 다시 채운다 (이 워커에서 정리(purge)한 직후)"""
+        with self._lock:
+            self._bloom = BloomFilter()
+            self._last_id = 0
+            self._last_sync = 0.0
+            self._generation = None
+
+    def _sync(self, force=False):
+        from models import RevokedToken
+
+        now = time.monotonic()
+        if os.getpid() != self._pid:
+            # fork 된 워커: master 에서 채운 필터는 그대로 쓰고 잠금만 새로 만든다
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+        if not force and now - self._last_sync < self.sync_interval:
+            return
+
+        with self._lock:
+            generation = get_versions([REVOKED_TOKENS_KEY])[REVOKED_TOKENS_KEY]
+            if generation != self._generation:
+                # 다른 워커가 정리(purge)했다 — 지워진 jti 를 버리고 처음부터 다시 채운다
+                self._bloom = BloomFilter()
+                self._last_id = 0
+                self._generation = generation
+            rows = (
+                RevokedToken.query.filter(
+                    RevokedToken.id > self._last_id,
+                    RevokedToken.expires_at > datetime.utcnow(),
+                )
+                .with_entities(RevokedToken.id, RevokedToken.jti)
+                .order_by(RevokedToken.id)
+                .all()
+            )
+            for row in rows:
+                self._bloom.add(row.jti)
+                self._last_id = row.id
+            self._last_sync = now
+
+    def warm(self):
+        """gunicorn master 에서 미리 필터를 채워 둔다 (워커는 fork 로 물려받음)"""
+        self._sync(force=True)
+
+    def _exists(self, jti):
+        from models import RevokedToken
+
+        return (
+            RevokedToken.query.filter_by(jti=jti).with_entities(RevokedToken.id).first()
+            is not None
+        )
+
+    def is_revoked(self, jwt_payload):
+        jti = jwt_payload.get("jti")
+        if not jti:
+            return True
+
+        if jwt_payload.get("type") == "refresh":
+            return self._exists(jti)
+
+        self._sync()
+        if jti not in self._bloom:
+            return False
+        return self._exists(jti)
+
+    def revoke(self, jwt_payload):
+        """토큰 폐기 (커밋은 호출자가)"""
+        from models import RevokedToken
+
+        jti = jwt_payload["jti"]
+        if self._exists(jti):
+            return
+        db.session.add(
+            RevokedToken(
+                jti=jti,
+                token_type=jwt_payload.get("type", "access"),
+                user_id=int(jwt_payload["sub"]) if jwt_payload.get("sub") else None,
+                expires_at=datetime.utcfromtimestamp(jwt_payload["exp"]),
+            )
+        )
+        with self._lock:
+            self._bloom.add(jti)
+
+    def purge_expired(self):
+        """원래 만료 시각이 지난 폐기 기록 삭제. 삭제된 행 수 반환"""
+        from models import RevokedToken
+
+        deleted = RevokedToken.query.filter(
+            RevokedToken.expires_at <= datetime.utcnow()
+        ).delete()
+        bump_versions(REVOKED_TOKENS_KEY)
+        db.session.commit()
+        self.reset()
+        return deleted
+
+
+revocation_store = TokenRevocationStore()
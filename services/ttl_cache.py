@@ -0,0 +1,69 @@
+"""
+워커 프로세스 내부용 작은 TTL + LRU 캐시.
+
+gunicorn 워커마다 따로 존재하므로, 다른 워커에서 발생한 변경은 TTL 이 지나야 반영된다.
+짧은 TTL 로 자주 조회되는 작은 값(사용자 요약, 일정 마스크 등)을 담는 용도로만 사용한다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+# 이름 있는 캐시 목록 (/metrics 적중률 집계용)
+_named_caches = []
+
+
+class TTLCache:
+    def __init__(self, maxsize, ttl, name=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        if name:
+            _named_caches.append(self)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def cache_metric_samples():
+    """/metrics 용 [(이름, 라벨, 값)] — 캐시별 hits / misses"""
+    samples = []
+    for cache in _named_caches:
+        samples.append(("cache_hits_total", {"cache": cache.name}, cache.hits))
+        samples.append(("cache_misses_total", {"cache": cache.name}, cache.misses))
+    return samples
@@ -0,0 +1,42 @@
+"""
+gunicorn --preload 용 시작 훅.
+
+preload 를 켜면 master 가 앱을 한 번만 만들고(create_app), 워커는 fork 로 그 메모리를 그대로 물려받는다.
+  - warm_caches      : master 에서 1회. 매퍼 설정, 폐기 토큰 블룸 필터처럼 모든 워커가 같은 값을 쓰는 것을 미리 채운다
+  - reset_after_fork : 각 워커에서 fork 직후. 부모의 DB 커넥션/프로세스 풀처럼 공유하면 안 되는 자원만 버리고
+                       로그 리스너 스레드를 다시 시작한다
+gunicorn.conf.py 의 when_ready / post_fork 에서 호출한다.
+"""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def warm_caches(app):
+    from sqlalchemy.orm import configure_mappers
+
+    from extensions import db
+    from services.token_revocation import revocation_store
+
+    started = time.perf_counter()
+    with app.app_context():
+        configure_mappers()
+        revocation_store.warm()
+        # master 가 쓴 커넥션은 워커로 넘기지 않는다
+        db.engine.dispose()
+    logger.info("캐시 예열 완료 (%.1f ms)", (time.perf_counter() - started) * 1000)
+
+
+def reset_after_fork(app):
+    from extensions import db, password_hasher
+    from logging_config import restart_after_fork
+
+    # 부모의 로그 리스너 스레드는 fork 로 따라오지 않는다
+    restart_after_fork()
+    started = time.perf_counter()
+    with app.app_context():
+        # 부모의 커넥션은 닫지 않고(부모가 계속 사용 중일 수 있음) 참조만 버린다
+        db.engine.dispose(close=False)
+    password_hasher.reset()
+    logger.info("워커 초기화 완료 (%.1f ms)", (time.perf_counter() - started) * 1000)
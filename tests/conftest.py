@@ -0,0 +1,77 @@
+"""
+테스트 공통 픽스처.
+
+테스트마다 임시 디렉터리의 파일 SQLite DB 에 마이그레이션을 적용한 새 앱을 만든다
+(스레드마다 따로 연결해 동시에 쓰는 테스트가 있어서 메모리 DB 는 쓰지 않는다).
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 레이트 리밋 / 메트릭 끄기, 공유 캐시는 워커 메모리, bcrypt 는 최소 비용
+for _name, _value in {
+    "RATELIMIT_ENABLED": "0",
+    "METRICS_ENABLED": "0",
+    "CACHE_BACKEND": "local",
+    "BCRYPT_LOG_ROUNDS": "4",
+    "LOG_LEVEL": "ERROR",
+    "JWT_SECRET_KEY": "test-secret-key-with-at-least-32-bytes",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+
+    from app import create_app
+    from extensions import db
+    from migrations import upgrade
+    from services.ttl_cache import _named_caches
+
+    application = create_app()
+    application.config["TESTING"] = True
+    with application.app_context():
+        upgrade(db.engine)
+
+    yield application
+
+    with application.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    # 워커 메모리 캐시(강의 코드 ↔ id, 사용자 요약 등)는 DB 마다 다르므로 비운다
+    for cache in _named_caches:
+        cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """register(username, user_type="student") -> Authorization 헤더"""
+
+    def _register(username, user_type="student"):
+        client.post(
+            "/auth/register",
+            json={
+                "studentId": username,
+                "name": username,
+                "email": f"{username}@example.com",
+                "username": username,
+                "password": "password",
+                "userType": user_type,
+            },
+        )
+        response = client.post("/auth/login", json={"email": f"{username}@example.com", "password": "password"})
+        assert response.status_code == 200, response.get_json()
+        return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+    return _register
@@ -0,0 +1,85 @@
+from datetime import time
+from types import SimpleNamespace
+
+from services.availability import (
+    build_slot_mask,
+    end_time_to_minutes,
+    format_end_time,
+    mask_to_slot_keys,
+    minutes_to_time,
+    time_to_minutes,
+)
+
+
+def _row(day, start, end):
+    return SimpleNamespace(day_of_week=day, start_time=start, end_time=end)
+
+
+def test_end_of_day_round_trips():
+    assert minutes_to_time(24 * 60) == time(0, 0)
+    assert end_time_to_minutes(minutes_to_time(24 * 60)) == 24 * 60
+    assert format_end_time(minutes_to_time(24 * 60)) == "24:00"
+    for minutes in range(30, 24 * 60 + 1, 30):
+        assert end_time_to_minutes(minutes_to_time(minutes)) == minutes
+    # 시작 시간은 그대로 0 분
+    assert time_to_minutes(minutes_to_time(0)) == 0
+
+
+def test_slot_mask_includes_last_slot_of_day():
+    slots = mask_to_slot_keys(build_slot_mask([_row("월요일", time(23, 0), time(0, 0))]))
+    assert slots == {"0-23-0", "0-23-30"}
+
+
+def test_unaligned_interval_uses_the_same_slots_everywhere():
+    from routes.available import build_time_slots
+
+    row = _row("월요일", time(9, 10), time(10, 10))
+    assert build_time_slots([row]) == mask_to_slot_keys(build_slot_mask([row])) == {"0-9-0", "0-9-30", "0-10-0"}
+
+
+def test_merge_up_to_midnight_is_lossless(app):
+    from extensions import db
+    from models import AvailableTime, User
+    from services.availability import save_available_interval
+
+    with app.app_context():
+        user = User(student_id="1", name="a", email="a@x", username="a", password_hash="x", user_type="student")
+        db.session.add(user)
+        db.session.commit()
+
+        save_available_interval(user.id, None, "금요일", time(23, 0), time(0, 0))
+        db.session.commit()
+        save_available_interval(user.id, None, "금요일", time(22, 0), time(23, 0))
+        db.session.commit()
+
+        rows = AvailableTime.query.filter_by(user_id=user.id).all()
+        assert [(r.start_time, end_time_to_minutes(r.end_time)) for r in rows] == [(time(22, 0), 24 * 60)]
+        assert rows[0].to_dict()["end_time"] == "24:00"
+        assert save_available_interval(user.id, None, "금요일", time(23, 30), time(0, 0)) == "exists"
+
+
+def test_team_board_submission_is_stored_as_dashboard_time(app, client, register):
+    from models import AvailableTime
+
+    professor = register("prof", "professor")
+    student = register("alice")
+    course = client.post("/course/", json={"title": "알고리즘", "code": "CS101"}, headers=professor).get_json()["course"]
+    assert client.post(f"/course/enroll/{course['id']}", headers=student).status_code == 201
+    recruitment = client.post(
+        "/recruit/",
+        json={"course_id": "CS101", "title": "t", "description": "d", "team_board_name": "A", "max_members": 3},
+        headers=student,
+    ).get_json()["recruitment"]
+
+    response = client.post(
+        "/available/",
+        json={"day_of_week": "화요일", "start_time": "10:00", "end_time": "24:00", "team_id": recruitment["id"]},
+        headers=student,
+    )
+    assert response.status_code == 201
+
+    with app.app_context():
+        assert [row.team_id for row in AvailableTime.query.all()] == [None]
+
+    times = client.get("/available/", headers=student).get_json()
+    assert [(t["start_time"], t["end_time"]) for t in times] == [("10:00", "24:00")]
@@ -0,0 +1,26 @@
+import pytest
+
+from services.board_search import build_match_query
+
+
+def test_build_match_query_rejects_unknown_category():
+    assert build_match_query("시험", 3, "notice") == 'scope : "c3" AND scope : "knotice" AND {title content} : ("시험"*)'
+    with pytest.raises(ValueError):
+        build_match_query("시험", 3, "공지")
+
+
+def test_search_category_must_be_known(client, register):
+    professor = register("prof", "professor")
+    client.post("/course/", json={"title": "알고리즘", "code": "CS101"}, headers=professor)
+    client.post(
+        "/board/",
+        json={"course_id": "CS101", "title": "시험 범위", "content": "3장까지", "category": "notice"},
+        headers=professor,
+    )
+
+    found = client.get("/board/course/CS101/search?q=시험&category=notice", headers=professor)
+    assert found.status_code == 200
+    assert [r["title"] for r in found.get_json()] == ["<mark>시험</mark> 범위"]
+
+    rejected = client.get("/board/course/CS101/search?q=시험&category=공지", headers=professor)
+    assert rejected.status_code == 400
@@ -0,0 +1,65 @@
+from services import comment_tree
+
+
+def _comments(app):
+    """게시글 두 개에 댓글 트리 → (첫 게시글 id, {이름: 댓글 id})
+
+    p1: r1 ─ a ─ b        p2: x ─ y
+            └ c
+        r2 ─ d
+        r3
+    """
+    from extensions import db
+    from models import CourseBoardComment, CourseBoardPost, User
+
+    with app.app_context():
+        user = User(student_id="1", name="a", email="a@x", username="a", password_hash="x", user_type="student")
+        db.session.add(user)
+        db.session.flush()
+        posts = [CourseBoardPost(course_id="CS101", author_id=user.id, title="t", content="c", category="free") for _ in range(2)]
+        db.session.add_all(posts)
+        db.session.flush()
+
+        ids = {}
+        for name, post, parent in [
+            ("r1", posts[0], None), ("x", posts[1], None), ("a", posts[0], "r1"), ("r2", posts[0], None),
+            ("b", posts[0], "a"), ("y", posts[1], "x"), ("c", posts[0], "r1"), ("d", posts[0], "r2"),
+            ("r3", posts[0], None),
+        ]:
+            comment = CourseBoardComment(post_id=post.id, author_id=user.id, content=name, parent_comment_id=ids.get(parent))
+            db.session.add(comment)
+            db.session.flush()
+            ids[name] = comment.id
+        db.session.commit()
+        return posts[0].id, ids
+
+
+def _shape(nodes):
+    return [(n["content"], _shape(n["replies"])) for n in nodes]
+
+
+def test_comment_tree_pages_roots_and_previews_threads(app):
+    post_id, ids = _comments(app)
+    with app.app_context():
+        nodes, cursor = comment_tree.comment_tree(post_id, limit=2, reply_limit=2)
+        assert _shape(nodes) == [("r1", [("a", [("b", [])])]), ("r2", [("d", [])])]
+        assert [(n["reply_count"], n["replies_next_cursor"]) for n in nodes] == [(3, ids["b"]), (1, None)]
+        assert cursor == ids["r2"]
+
+        nodes, cursor = comment_tree.comment_tree(post_id, limit=2, after=cursor)
+        assert _shape(nodes) == [("r3", [])]
+        assert (nodes[0]["reply_count"], cursor) == (0, None)
+
+
+def test_replies_page_walks_only_the_subtree(app):
+    post_id, ids = _comments(app)
+    with app.app_context():
+        from models import CourseBoardComment
+        from extensions import db
+
+        r1 = db.session.get(CourseBoardComment, ids["r1"])
+        nodes, cursor = comment_tree.replies_page(r1, limit=2)
+        assert (_shape(nodes), cursor) == ([("a", [("b", [])])], ids["b"])
+
+        nodes, cursor = comment_tree.replies_page(r1, limit=2, after=cursor)
+        assert (_shape(nodes), cursor) == ([("c", [])], None)
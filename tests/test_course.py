@@ -0,0 +1,25 @@
+def test_deleting_course_clears_course_pk(app, client, register):
+    from models import CourseBoardPost, TeamRecruitment
+
+    professor = register("prof", "professor")
+    alice = register("alice")
+    course = client.post("/course/", json={"title": "알고리즘", "code": "CS101"}, headers=professor).get_json()["course"]
+    assert client.post(f"/course/enroll/{course['id']}", headers=alice).status_code == 201
+    post = client.post(
+        "/board/",
+        json={"course_id": "CS101", "title": "공지", "content": "내용", "category": "notice"},
+        headers=professor,
+    )
+    assert post.status_code == 201, post.get_json()
+    recruitment = client.post(
+        "/recruit/",
+        json={"course_id": "CS101", "title": "t", "description": "d", "team_board_name": "A", "max_members": 3},
+        headers=alice,
+    )
+    assert recruitment.status_code == 201, recruitment.get_json()
+
+    assert client.delete(f"/course/{course['id']}", headers=professor).status_code == 200
+
+    with app.app_context():
+        assert [p.course_pk for p in CourseBoardPost.query.all()] == [None]
+        assert [r.course_pk for r in TeamRecruitment.query.all()] == [None]
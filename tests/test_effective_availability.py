@@ -0,0 +1,88 @@
+from datetime import time
+
+from services.effective_availability import busy_masks, week_start
+
+
+def _team(client, register):
+    """교수 1명, 학생 2명이 참여한 팀 → (팀 id, 학생1 헤더, 학생2 헤더)"""
+    professor = register("prof", "professor")
+    alice, bob = register("alice"), register("bob")
+    course = client.post("/course/", json={"title": "알고리즘", "code": "CS101"}, headers=professor).get_json()["course"]
+    for headers in (alice, bob):
+        assert client.post(f"/course/enroll/{course['id']}", headers=headers).status_code == 201
+    recruitment = client.post(
+        "/recruit/",
+        json={"course_id": "CS101", "title": "t", "description": "d", "team_board_name": "A", "max_members": 3},
+        headers=alice,
+    ).get_json()["recruitment"]
+    assert client.post(f"/recruit/{recruitment['id']}/join", headers=bob).status_code == 200
+    for headers in (alice, bob):
+        client.post("/available/", json={"day_of_week": "월요일", "start_time": "09:00", "end_time": "12:00"}, headers=headers)
+    return recruitment["id"], alice, bob
+
+
+def _schedule(monday, start, end):
+    return {
+        "title": "약속",
+        "year": monday.year,
+        "month": monday.month,
+        "date": monday.day,
+        "start_time": start,
+        "end_time": end,
+    }
+
+
+def test_team_common_times_subtract_this_weeks_schedules_by_default(client, register):
+    team_id, alice, _ = _team(client, register)
+    monday = week_start()
+
+    before = client.get(f"/available/team/{team_id}", headers=alice)
+    assert before.get_json()["optimal_slots"] == ["0-10-0", "0-10-30", "0-11-0", "0-11-30", "0-9-0", "0-9-30"]
+
+    assert client.post("/schedule/", json=_schedule(monday, "10:00", "11:00"), headers=alice).status_code == 201
+
+    after = client.get(
+        f"/available/team/{team_id}", headers={**alice, "If-None-Match": before.headers["ETag"]}
+    )
+    assert after.status_code == 200
+    payload = after.get_json()
+    assert payload["week"] == monday.isoformat()
+    assert payload["optimal_slots"] == ["0-11-0", "0-11-30", "0-9-0", "0-9-30"]
+
+
+def test_busy_mask_cache_follows_schedule_version(app):
+    from extensions import db
+    from models import Schedule, User
+    from services.resource_versions import bump_versions, schedule_key
+
+    monday = week_start()
+    with app.app_context():
+        user = User(student_id="1", name="a", email="a@x", username="a", password_hash="x", user_type="student")
+        db.session.add(user)
+        db.session.commit()
+        assert busy_masks([user.id], monday) == {user.id: 0}
+
+        # 다른 워커가 일정을 추가한 것처럼: 이 워커의 캐시는 건드리지 않고 DB 와 버전만 바꾼다
+        db.session.add(
+            Schedule(
+                user_id=user.id, title="x", year=monday.year, month=monday.month, date=monday.day,
+                start_time=time(9, 0), end_time=time(10, 0), color="#fff",
+            )
+        )
+        bump_versions(schedule_key(user.id))
+        db.session.commit()
+
+        mask = busy_masks([user.id], monday)[user.id]
+        assert mask.bit_count() == 2
+        # 버전이 그대로면 캐시에서 같은 값
+        assert busy_masks([user.id], monday) == {user.id: mask}
+
+
+def test_update_schedule_rejects_malformed_time(client, register):
+    alice = register("alice")
+    created = client.post("/schedule/", json=_schedule(week_start(), "10:00", "11:00"), headers=alice).get_json()
+
+    response = client.put(f"/schedule/{created['id']}", json={"start_time": "25:99"}, headers=alice)
+    assert response.status_code == 400
+    response = client.put(f"/schedule/{created['id']}", json={"start_time": "11:00", "end_time": "10:00"}, headers=alice)
+    assert response.status_code == 400
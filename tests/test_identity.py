@@ -0,0 +1,19 @@
+from services.identity import get_user_summary
+
+
+def test_user_summary_cache_follows_users_version(app):
+    from extensions import db
+    from models import User
+    from services.resource_versions import USERS_KEY, bump_versions
+
+    with app.app_context():
+        user = User(student_id="1", name="before", email="a@x", username="a", password_hash="x", user_type="student")
+        db.session.add(user)
+        db.session.commit()
+        assert get_user_summary(user.id)["name"] == "before"
+
+        # 다른 워커가 이름을 바꾼 상황 — 이 워커의 캐시는 직접 비우지 않는다
+        user.name = "after"
+        bump_versions(USERS_KEY)
+        db.session.commit()
+        assert get_user_summary(user.id)["name"] == "after"
@@ -0,0 +1,35 @@
+import json
+
+from services.metrics import Metrics
+
+
+def _write(directory, pid, requests, latency):
+    data = {
+        "counters": [["http_requests_total", [["endpoint", "x"]], requests]],
+        "histograms": [
+            ["http_request_duration_seconds", [["endpoint", "x"]], {"buckets": [1] * 11, "sum": latency, "count": 1}]
+        ],
+    }
+    (directory / f"metrics-{pid}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_dead_worker_totals_survive_pid_reuse(tmp_path):
+    metrics = Metrics()
+    metrics.directory = str(tmp_path)
+
+    _write(tmp_path, 111, 3, 0.5)
+    metrics.mark_process_dead(111)
+    # 같은 pid 를 받은 새 워커가 자기 파일을 쓴다
+    _write(tmp_path, 111, 2, 0.25)
+    _write(tmp_path, 222, 1, 0.125)
+
+    counters, histograms = metrics._aggregate()
+    key = (("endpoint", "x"),)
+    assert counters[("http_requests_total", key)] == 6
+    assert histograms[("http_request_duration_seconds", key)]["count"] == 3
+    assert histograms[("http_request_duration_seconds", key)]["sum"] == 0.875
+
+    metrics.mark_process_dead(111)
+    metrics.mark_process_dead(222)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["metrics-dead.json"]
+    assert metrics._aggregate()[0][("http_requests_total", key)] == 6
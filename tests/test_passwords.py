@@ -0,0 +1,22 @@
+from services.metrics import metrics
+from services.passwords import PasswordHasher
+
+
+def test_hash_times_are_exported_as_histogram(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", True)
+    monkeypatch.setattr(metrics, "directory", str(tmp_path))
+    monkeypatch.setattr(metrics, "_counters", {})
+    monkeypatch.setattr(metrics, "_histograms", {})
+
+    hasher = PasswordHasher()
+    hasher.rounds = 4
+    hashed = hasher.hash_password("secret")
+    assert hasher.check_password(hashed, "secret")
+
+    text = metrics.render()
+    assert "# TYPE password_hash_seconds histogram" in text
+    for op in ("hash", "verify"):
+        for phase in ("queue_wait", "hash_time"):
+            labels = f'op="{op}",phase="{phase}"'
+            assert f'password_hash_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+            assert f"password_hash_seconds_count{{{labels}}} 1" in text
@@ -0,0 +1,113 @@
+import threading
+from collections import Counter
+
+from services.recruitments import (
+    BOARD_ACTIVATED,
+    JOINED,
+    LEFT,
+    NOT_MEMBER,
+    join_recruitment,
+    leave_recruitment,
+    serialize_recruitments,
+)
+
+
+def _recruitment(client, register, max_members=3):
+    """교수 1명, 학생 alice(작성자) / bob → (모집글 id, alice 헤더, bob 헤더)"""
+    professor = register("prof", "professor")
+    alice, bob = register("alice"), register("bob")
+    course = client.post("/course/", json={"title": "알고리즘", "code": "CS101"}, headers=professor).get_json()["course"]
+    for headers in (alice, bob):
+        assert client.post(f"/course/enroll/{course['id']}", headers=headers).status_code == 201
+    recruitment = client.post(
+        "/recruit/",
+        json={"course_id": "CS101", "title": "t", "description": "d", "team_board_name": "A", "max_members": max_members},
+        headers=alice,
+    ).get_json()["recruitment"]
+    return recruitment["id"], alice, bob
+
+
+def _user_id(app, username):
+    from models import User
+
+    with app.app_context():
+        return User.query.filter_by(username=username).one().id
+
+
+def test_leave_reports_why_it_failed(app, client, register):
+    from extensions import db
+    from models import TeamRecruitment
+
+    recruitment_id, _, bob = _recruitment(client, register)
+    bob_id = _user_id(app, "bob")
+    assert client.post(f"/recruit/{recruitment_id}/join", headers=bob).status_code == 200
+
+    with app.app_context():
+        assert leave_recruitment(recruitment_id, bob_id) == LEFT
+        db.session.commit()
+        assert leave_recruitment(recruitment_id, bob_id) == NOT_MEMBER
+
+    assert client.post(f"/recruit/{recruitment_id}/join", headers=bob).status_code == 200
+    with app.app_context():
+        db.session.get(TeamRecruitment, recruitment_id).is_board_activated = True
+        db.session.commit()
+        assert leave_recruitment(recruitment_id, bob_id) == BOARD_ACTIVATED
+
+    response = client.post(f"/recruit/{recruitment_id}/join", headers=bob)
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "팀 게시판이 활성화되어 참여 취소할 수 없습니다."
+
+
+def test_concurrent_joins_never_exceed_capacity(app):
+    """스레드마다 따로 연결(세션)을 잡고 파일 DB 에 동시에 참여 — 같은 학생의 중복 요청도 섞는다"""
+    from extensions import db
+    from models import Course, TeamRecruitment, TeamRecruitmentMember, User
+
+    max_members, students = 4, 12
+    with app.app_context():
+        users = [
+            User(student_id=str(i), name=f"s{i}", email=f"s{i}@x", username=f"s{i}", password_hash="x", user_type="student")
+            for i in range(students + 1)
+        ]
+        db.session.add_all(users)
+        db.session.flush()
+        db.session.add(Course(title="알고리즘", code="CS101", professor_id=users[0].id))
+        recruitment = TeamRecruitment(
+            course_id="CS101", author_id=users[0].id, title="t", description="d", max_members=max_members
+        )
+        db.session.add(recruitment)
+        db.session.commit()
+        recruitment_id = recruitment.id
+        joiners = [u.id for u in users[1:]]
+
+    callers = joiners + joiners[:4]
+    barrier = threading.Barrier(len(callers))
+    results = []
+
+    def attempt(user_id):
+        with app.app_context():
+            barrier.wait()
+            status = join_recruitment(recruitment_id, user_id)
+            db.session.commit()
+            results.append((user_id, status))
+
+    threads = [threading.Thread(target=attempt, args=(uid,)) for uid in callers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == len(callers)
+    assert Counter(status for _, status in results)[JOINED] == max_members
+    with app.app_context():
+        member_ids = [
+            uid
+            for (uid,) in TeamRecruitmentMember.query.filter_by(recruitment_id=recruitment_id).with_entities(
+                TeamRecruitmentMember.user_id
+            )
+        ]
+        recruitment = db.session.get(TeamRecruitment, recruitment_id)
+        assert len(member_ids) == len(set(member_ids)) == max_members
+        assert sorted(member_ids) == sorted(uid for uid, status in results if status == JOINED)
+        assert recruitment.member_count == max_members
+        assert serialize_recruitments([recruitment])[0]["current_members"] == max_members
@@ -0,0 +1,30 @@
+import logging
+
+from sqlalchemy import create_engine, inspect, text
+
+from services.schema_indexes import ensure_indexes, index
+
+
+def test_unique_index_logs_each_removed_duplicate(caplog):
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE likes (id INTEGER PRIMARY KEY, post_id INTEGER, user_id INTEGER)"))
+        connection.execute(text("INSERT INTO likes (id, post_id, user_id) VALUES (1, 1, 7), (2, 1, 7), (3, 1, 8), (4, 1, 7)"))
+        with caplog.at_level(logging.WARNING, logger="services.schema_indexes"):
+            created = ensure_indexes(connection, [index("uq_likes", "likes", "post_id", "user_id", unique=True)])
+        remaining = connection.execute(text("SELECT id FROM likes ORDER BY id")).scalars().all()
+
+    assert created == [("uq_likes", 2)]
+    assert remaining == [1, 3]
+    assert [r.getMessage() for r in caplog.records] == [
+        "likes 중복 행 삭제 (uq_likes): id=2, post_id=1, user_id=7",
+        "likes 중복 행 삭제 (uq_likes): id=4, post_id=1, user_id=7",
+    ]
+
+
+def test_poll_vote_index_not_duplicated_on_fresh_database(app):
+    from extensions import db
+
+    with app.app_context():
+        names = {ix["name"] for ix in inspect(db.engine).get_indexes("poll_votes")}
+    assert "uq_poll_votes_poll_user" not in names
@@ -0,0 +1,54 @@
+from services.team_formation import _team_sizes, propose_teams
+
+
+def test_team_sizes_divisible():
+    assert _team_sizes(6, 3) == [3, 3]
+    assert _team_sizes(8, 4) == [4, 4]
+
+
+def test_team_sizes_spread_shortfall_instead_of_one_oversized_team():
+    assert _team_sizes(5, 3) == [3, 2]
+    assert _team_sizes(7, 4) == [4, 3]
+    assert _team_sizes(10, 4) == [4, 3, 3]
+    assert _team_sizes(13, 5) == [5, 4, 4]
+
+
+def test_team_sizes_never_leave_someone_alone():
+    # team_size=2 에서 홀수 명이면 한 팀만 3명
+    assert _team_sizes(3, 2) == [3]
+    assert _team_sizes(5, 2) == [3, 2]
+    assert _team_sizes(7, 2) == [3, 2, 2]
+
+
+def test_team_sizes_fewer_students_than_team_size():
+    assert _team_sizes(2, 5) == [2]
+    assert _team_sizes(0, 3) == []
+
+
+def test_team_sizes_bounds():
+    for team_size in range(2, 8):
+        for count in range(2, 60):
+            sizes = _team_sizes(count, team_size)
+            assert sum(sizes) == count
+            assert max(sizes) - min(sizes) <= 1
+            assert min(sizes) >= 2
+            # team_size 를 넘는 건 team_size=2 에서 홀수 명일 때의 3명 팀 하나뿐
+            oversized = [size for size in sizes if size > team_size]
+            assert oversized == [] or (team_size == 2 and oversized == [3])
+
+
+def test_propose_teams_uses_every_student_once():
+    masks = {uid: (0b1111 << (uid % 5)) for uid in range(1, 8)}
+    teams = propose_teams(masks, 3, time_budget=0.5)
+    assert sorted(len(team) for team in teams) == [2, 2, 3]
+    assert sorted(uid for team in teams for uid in team) == list(range(1, 8))
+
+
+def test_auto_form_rejects_non_bool_flags(client, register):
+    professor = register("prof", "professor")
+    response = client.post("/course/", json={"title": "알고리즘", "code": "CS101"}, headers=professor)
+    assert response.status_code == 201
+
+    for body in ({"exclude_joined": "false"}, {"create": "true"}, {"exclude_joined": 0}):
+        response = client.post("/recruit/CS101/auto-form", json=body, headers=professor)
+        assert response.status_code == 400, body